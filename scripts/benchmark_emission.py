@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Socket.IO Emission Load Benchmark
+
+Purpose: Verify that game_update traffic is routed per session, so the
+bytes/sec each client receives stays flat as the number of concurrent
+sessions grows (instead of growing O(N) per client with a global broadcast).
+Each session gets a unique player_name, which the server echoes in every
+state; a client that receives an update carrying another session's name
+(or no updates at all) is counted as a leak.
+
+Usage:
+    python scripts/benchmark_emission.py --sessions 1 2 4 8 16 --duration 3
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# web_app 모듈 경로 추가 (app.py는 web_app 기준 import 사용)
+WEB_APP_DIR = Path(__file__).parent.parent / "web_app"
+sys.path.insert(0, str(WEB_APP_DIR))
+
+
+def payload_bytes(packet) -> int:
+    """Approximate wire size of a received Socket.IO event (JSON text)."""
+    return len(json.dumps([packet['name']] + list(packet['args']), separators=(',', ':')))
+
+
+def run_load(server, num_sessions: int, duration: float, mode: str, ai_level: int) -> dict:
+    """Start num_sessions games and measure game_update bytes received per client."""
+    clients = [server.socketio.test_client(server.app) for _ in range(num_sessions)]
+
+    identities = []
+    for i, client in enumerate(clients):
+        client.get_received()  # 'connected' 이벤트 비우기
+        client.emit('start_game', {'mode': mode, 'ai_level': ai_level, 'player_name': f'bench-{i}'})
+        # 세션 식별자: 서버가 확정한 player_name (AI 모드는 'AI-<레벨>-<sid>'로 바뀜)
+        started = [p for p in client.get_received() if p['name'] == 'game_started']
+        identities.append(started[0]['args'][0]['state']['player_name'])
+
+    if len(set(identities)) != len(identities):
+        raise RuntimeError(f"Session identities are not unique: {identities}")
+
+    time.sleep(duration)
+
+    per_client = []
+    foreign_updates = 0
+    for client, identity in zip(clients, identities):
+        received = [p for p in client.get_received() if p['name'] == 'game_update']
+        per_client.append(sum(payload_bytes(p) for p in received) / duration)
+        # 자기 게임이 아닌 업데이트가 하나라도 섞이면 라우팅 실패
+        if not received or any(p['args'][0]['state']['player_name'] != identity for p in received):
+            foreign_updates += 1
+
+    for client in clients:
+        client.disconnect()
+
+    return {
+        'sessions': num_sessions,
+        'mean_client_bytes_per_s': sum(per_client) / len(per_client),
+        'max_client_bytes_per_s': max(per_client),
+        'server_egress_bytes_per_s': sum(per_client),
+        'clients_with_foreign_updates': foreign_updates,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-session emission load benchmark")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--duration', type=float, default=3.0, help="Measurement window (seconds)")
+    parser.add_argument('--mode', default='ai', choices=['ai', 'human'])
+    parser.add_argument('--ai-level', type=int, default=2)
+    parser.add_argument('--output', type=Path, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    import app as server
+
+    print("📡 Socket.IO Emission Load Benchmark")
+    print("=" * 72)
+    print(f"{'sessions':>8} {'client B/s (mean)':>18} {'client B/s (max)':>17} {'server B/s':>12} {'leaks':>6}")
+
+    results = []
+    for num_sessions in args.sessions:
+        result = run_load(server, num_sessions, args.duration, args.mode, args.ai_level)
+        results.append(result)
+        print(f"{result['sessions']:>8} "
+              f"{result['mean_client_bytes_per_s']:>18.0f} "
+              f"{result['max_client_bytes_per_s']:>17.0f} "
+              f"{result['server_egress_bytes_per_s']:>12.0f} "
+              f"{result['clients_with_foreign_updates']:>6}")
+
+    baseline = results[0]['mean_client_bytes_per_s']
+    worst = max(r['mean_client_bytes_per_s'] for r in results)
+    print("=" * 72)
+    print(f"Per-client growth ({args.sessions[0]} → {args.sessions[-1]} sessions): "
+          f"{worst / baseline if baseline else 0:.2f}x (flat ≈ 1.0x)")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"💾 Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Offline Graph Optimization Report
+
+Author: Minsuk Kim (mk4434)
+Purpose: Run ONNXModelOptimizer's offline graph optimization pass on each
+model and report what it bought: node count before/after, which op types
+were fused away, session creation time, and latency of the original model
+(optimizer off / optimized online at load) vs. the optimized file.
+
+Usage:
+    python scripts/benchmark_graph_optimization.py AI_model/best.onnx models/policy.onnx
+    python scripts/benchmark_graph_optimization.py AI_model/best.onnx --ort-format --output graph_opt.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from deployment.onnx_optimizer import ONNXModelOptimizer, OptimizationConfig
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline ONNX graph optimization report")
+    parser.add_argument("models", nargs="+", type=Path, help="ONNX models")
+    parser.add_argument("--level", default="ORT_ENABLE_EXTENDED",
+                        choices=["ORT_ENABLE_BASIC", "ORT_ENABLE_EXTENDED", "ORT_ENABLE_ALL"],
+                        help="Offline optimization level")
+    parser.add_argument("--ort-format", action="store_true", help="Also write .ort models")
+    parser.add_argument("--runs", type=int, default=50, help="Latency iterations per variant")
+    parser.add_argument("--threads", type=int, default=4, help="intra_op_num_threads")
+    parser.add_argument("--output", type=Path, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    optimizer = ONNXModelOptimizer(OptimizationConfig(
+        offline_optimization_level=args.level,
+        save_ort_format=args.ort_format,
+        intra_op_num_threads=args.threads,
+    ))
+
+    reports = []
+    for model_path in args.models:
+        _, report = optimizer.optimize_onnx_model(model_path, num_runs=args.runs)
+        reports.append(report)
+
+    print(f"\n🛠️ Offline graph optimization ({args.level})")
+    print(f"{'model':>24} {'nodes':>11} {'load ms':>13} {'unopt ms':>9} {'online ms':>10} {'offline ms':>11}")
+    for report in reports:
+        latency = report["latency_ms"]
+        print(f"{Path(report['model']).name:>24} "
+              f"{report['nodes_before']:>5}→{report['nodes_after']:<5} "
+              f"{report['load_ms_online']:>6.1f}→{report['load_ms_offline']:<6.1f} "
+              f"{latency['unoptimized']:>9.3f} {latency['online']:>10.3f} {latency['offline']:>11.3f}")
+        changes = ", ".join(f"{op} {delta:+d}" for op, delta in list(report["op_changes"].items())[:8])
+        print(f"{'':>24} ops: {changes or 'unchanged'}")
+
+    if args.output:
+        args.output.write_text(json.dumps(reports, indent=2))
+        print(f"\n💾 Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
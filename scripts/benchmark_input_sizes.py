@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Detector Input Size Benchmark
+
+Author: Minsuk Kim (mk4434)
+Purpose: The detector was trained at 640x640, but game frames are 960x720
+(4:3), so a square input spends a quarter of every inference on letterbox
+padding. This measures accuracy vs. latency of rectangular and reduced
+input sizes (e.g. 640x480, 480x352, 320x256) on game_dataset val and picks
+the fastest variant that still finds stars (~30 px in the frame, so ~10 px
+at 320x256).
+
+Variants are either fixed-size exports (one ONNX file per size, see
+ONNXModelOptimizer.export_yolo_variants) or one dynamic-shape export
+evaluated at every --sizes entry. Frames are letterboxed exactly as in
+serving (FramePreprocessor).
+
+Usage:
+    python scripts/benchmark_input_sizes.py --models models/best_640x640.onnx models/best_640x480.onnx \\
+        models/best_480x352.onnx models/best_320x256.onnx
+    python scripts/benchmark_input_sizes.py --models models/best_dynamic.onnx \\
+        --sizes 640x640 640x480 480x352 320x256 --output input_sizes.json
+    python scripts/benchmark_input_sizes.py --export runs/detect/train2/weights/best.pt \\
+        --sizes 640x480 480x352 320x256
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import onnx
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from deployment.onnx_optimizer import ONNXModelOptimizer, OptimizationConfig
+from deployment.evaluation import GAME_DATASET_DIR
+from deployment.preprocessing import letterbox_geometry
+
+GAME_FRAME_SHAPE = (720, 960)  # (H, W)
+STAR_SIZE_PX = 30
+
+
+def parse_size(text: str):
+    """'WxH' → (H, W)"""
+    width, height = (int(v) for v in text.lower().split("x"))
+    return height, width
+
+
+def is_dynamic(model_path: Path) -> bool:
+    """True if the model's spatial input dims are symbolic."""
+    dims = onnx.load(str(model_path), load_external_data=False).graph.input[0].type.tensor_type.shape.dim
+    return any(d.dim_value <= 0 for d in dims[2:4])
+
+
+def recommend(results, star_class: int, min_ratio: float):
+    """Fastest variant whose star AP50 and recall are within min_ratio of the best."""
+    best_ap = max(r["ap50_per_class"].get(star_class, 0.0) for r in results)
+    best_recall = max(r["recall_per_class"].get(star_class, 0.0) for r in results)
+    if best_ap == 0.0 and best_recall == 0.0:
+        return None
+    eligible = [r for r in results
+                if r["ap50_per_class"].get(star_class, 0.0) >= min_ratio * best_ap
+                and r["recall_per_class"].get(star_class, 0.0) >= min_ratio * best_recall]
+    return min(eligible, key=lambda r: r["p95_latency_ms"]) if eligible else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detector accuracy vs. latency per input size")
+    parser.add_argument("--models", type=Path, nargs="+", default=[], help="ONNX detector variants")
+    parser.add_argument("--sizes", nargs="+", default=None,
+                        help="WxH sizes for dynamic models (or for --export)")
+    parser.add_argument("--export", type=Path, default=None,
+                        help="Ultralytics .pt weights: export one fixed-size ONNX per --sizes entry first")
+    parser.add_argument("--dataset", type=Path, default=GAME_DATASET_DIR)
+    parser.add_argument("--eval-images", type=int, default=0, help="Max val frames (0 = all)")
+    parser.add_argument("--runs", type=int, default=100, help="Latency iterations per variant")
+    parser.add_argument("--threads", type=int, default=4, help="intra_op_num_threads")
+    parser.add_argument("--star-class", type=int, default=2, help="Class id of the smallest object (star)")
+    parser.add_argument("--min-recall-ratio", type=float, default=0.95,
+                        help="Required fraction of the best star AP50 / recall")
+    parser.add_argument("--output", type=Path, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    if not args.models and not args.export:
+        parser.error("at least one of --models / --export is required")
+
+    sizes = [parse_size(s) for s in args.sizes] if args.sizes else []
+    optimizer = ONNXModelOptimizer(OptimizationConfig(intra_op_num_threads=args.threads))
+
+    variants = []
+    if args.export:
+        if not sizes:
+            parser.error("--export needs --sizes")
+        print(f"\n📦 Exporting {args.export.name} at {', '.join(args.sizes)}")
+        variants += [(path, None) for path in optimizer.export_yolo_variants(args.export, sizes)]
+
+    for model_path in args.models:
+        if sizes and is_dynamic(model_path):
+            variants += [(model_path, size) for size in sizes]
+        else:
+            variants.append((model_path, None))
+
+    print(f"\n🔍 Evaluating {len(variants)} variants on {args.dataset / 'images' / 'val'}")
+    results = optimizer.compare_input_sizes(variants, args.dataset, num_images=args.eval_images,
+                                            num_runs=args.runs)
+
+    star = args.star_class
+    print(f"\n{'model':>22} {'input':>9} {'mAP50':>6} {'mAP50-95':>8} {'star AP50':>9} {'star rec':>8} "
+          f"{'star px':>7} {'p50 ms':>7} {'p95 ms':>7}")
+    for r in results:
+        ratio = letterbox_geometry(GAME_FRAME_SHAPE, (r["input_height"], r["input_width"]))[0]
+        r["star_size_px"] = STAR_SIZE_PX * ratio
+        print(f"{Path(r['model']).name[:22]:>22} {r['input_width']:>4}x{r['input_height']:<4} "
+              f"{r['map50']:>6.3f} {r['map50_95']:>8.3f} {r['ap50_per_class'].get(star, 0.0):>9.3f} "
+              f"{r['recall_per_class'].get(star, 0.0):>8.3f} {r['star_size_px']:>7.1f} "
+              f"{r['p50_latency_ms']:>7.2f} {r['p95_latency_ms']:>7.2f}")
+
+    choice = recommend(results, star, args.min_recall_ratio)
+    if choice:
+        print(f"\n🏆 Fastest with ≥{args.min_recall_ratio:.0%} of the best star AP50/recall: "
+              f"{Path(choice['model']).name} @ {choice['input_width']}x{choice['input_height']} "
+              f"(p95 {choice['p95_latency_ms']:.2f}ms)")
+    else:
+        print(f"\n⚠️ No variant detects star class {star} on the evaluation set")
+
+    if args.output:
+        args.output.write_text(json.dumps({"results": results, "recommended": choice}, indent=2))
+        print(f"\n💾 Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+NumPy vs. PyTorch vs. ONNX Runtime Policy MLP Benchmark
+
+Purpose: The slim web image runs PolicyNetwork without torch through
+modules/numpy_mlp.NumpyMLP. This checks that its outputs match torch and
+ONNX Runtime within tolerance and compares forward latency at batch 1 (one
+game) and 256 (a full batched tick).
+
+- numpy: NumpyMLP on the state_dict weights
+- torch: nn.Sequential with the same weights (skipped if torch is not installed)
+- onnx: Gemm/Relu/Softmax graph built from the same weights, ORT_ENABLE_ALL
+
+Usage:
+    python scripts/benchmark_numpy_mlp.py
+    python scripts/benchmark_numpy_mlp.py --weights web_app/models/rl/ppo_agent.pt --batch-sizes 1 16 256 \\
+        --threads 1 --output numpy_mlp.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import onnxruntime as ort
+from onnx import TensorProto, helper, numpy_helper
+
+# web_app 모듈 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "web_app"))
+
+from modules.numpy_mlp import NumpyMLP, load_state_dict
+
+
+def random_policy_state_dict(state_dim: int, hidden_dim: int, action_dim: int):
+    """PolicyNetwork 모양의 무작위 state_dict (nn.Linear 기본 초기화 범위)"""
+    rng = np.random.default_rng(0)
+    dims = [state_dim, hidden_dim, hidden_dim, action_dim]
+    state_dict = {}
+    for i, (fan_in, fan_out) in enumerate(zip(dims, dims[1:])):
+        bound = 1.0 / np.sqrt(fan_in)
+        state_dict[f"network.{2 * i}.weight"] = rng.uniform(-bound, bound, (fan_out, fan_in)).astype(np.float32)
+        state_dict[f"network.{2 * i}.bias"] = rng.uniform(-bound, bound, fan_out).astype(np.float32)
+    return state_dict
+
+
+def onnx_session(mlp: NumpyMLP, threads: int) -> ort.InferenceSession:
+    """NumpyMLP 가중치로 Gemm → Relu ... → Softmax ONNX 그래프 생성 (동적 배치)"""
+    nodes, initializers, x = [], [], "state_vector"
+    for i, (weight, bias) in enumerate(zip(mlp.weights, mlp.biases)):
+        initializers += [numpy_helper.from_array(weight, f"w{i}"), numpy_helper.from_array(bias, f"b{i}")]
+        nodes.append(helper.make_node("Gemm", [x, f"w{i}", f"b{i}"], [f"gemm{i}"]))
+        x = f"gemm{i}"
+        if i < len(mlp.weights) - 1:
+            nodes.append(helper.make_node("Relu", [x], [f"relu{i}"]))
+            x = f"relu{i}"
+    nodes.append(helper.make_node("Softmax", [x], ["action_probs"], axis=-1))
+    graph = helper.make_graph(
+        nodes, "policy",
+        [helper.make_tensor_value_info("state_vector", TensorProto.FLOAT, ["batch", mlp.state_dim])],
+        [helper.make_tensor_value_info("action_probs", TensorProto.FLOAT, ["batch", mlp.output_dim])],
+        initializers)
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)], ir_version=8)
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = threads
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return ort.InferenceSession(model.SerializeToString(), options, providers=["CPUExecutionProvider"])
+
+
+def torch_forward(state_dict, threads: int):
+    """같은 가중치의 nn.Sequential forward (torch 없으면 None)"""
+    try:
+        import torch
+        import torch.nn as nn
+    except ImportError:
+        return None
+    torch.set_num_threads(threads)
+    mlp = NumpyMLP.from_state_dict(state_dict)
+    layers = []
+    for i, (weight, bias) in enumerate(zip(mlp.weights, mlp.biases)):
+        linear = nn.Linear(*weight.shape)
+        linear.weight.data = torch.from_numpy(np.ascontiguousarray(weight.T))
+        linear.bias.data = torch.from_numpy(bias.copy())
+        layers += [linear, nn.ReLU()] if i < len(mlp.weights) - 1 else [linear, nn.Softmax(dim=-1)]
+    model = nn.Sequential(*layers).eval()
+
+    def run(states):
+        with torch.no_grad():
+            return model(torch.from_numpy(states)).numpy()
+
+    return run
+
+
+def measure(fn, states, runs: int):
+    for _ in range(10):
+        fn(states)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(states)
+        times.append((time.perf_counter() - start) * 1e6)
+    return {
+        "mean_us": float(np.mean(times)),
+        "p50_us": float(np.percentile(times, 50)),
+        "p95_us": float(np.percentile(times, 95)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy vs. torch vs. ONNX policy MLP")
+    parser.add_argument("--weights", type=Path, default=None,
+                        help="PolicyNetwork state_dict (.pt / .npz); default: random weights")
+    parser.add_argument("--prefix", default=None, help="Sequential key prefix (e.g. 'network.')")
+    parser.add_argument("--state-dim", type=int, default=10)
+    parser.add_argument("--hidden-dim", type=int, default=128)
+    parser.add_argument("--action-dim", type=int, default=4)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 256])
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=1, help="torch / ORT intra-op threads")
+    parser.add_argument("--tolerance", type=float, default=1e-5)
+    parser.add_argument("--output", type=Path, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    if args.weights:
+        state_dict = load_state_dict(args.weights)
+        if args.prefix:
+            state_dict = {k: v for k, v in state_dict.items() if k.startswith(args.prefix)}
+    else:
+        state_dict = random_policy_state_dict(args.state_dim, args.hidden_dim, args.action_dim)
+
+    mlp = NumpyMLP.from_state_dict(state_dict, prefix=args.prefix)
+    session = onnx_session(mlp, args.threads)
+    backends = {
+        "numpy": mlp,
+        "onnx": lambda states: session.run(None, {"state_vector": states})[0],
+    }
+    torch_fn = torch_forward(state_dict, args.threads)
+    if torch_fn is not None:
+        backends["torch"] = torch_fn
+    else:
+        print("⚠️ torch not installed - skipping the torch backend")
+
+    dims = [mlp.state_dim] + [w.shape[1] for w in mlp.weights]
+    print(f"\n🧠 Policy MLP {'-'.join(map(str, dims))}, {args.threads} thread(s), {args.runs} runs")
+    print(f"{'batch':>5} {'backend':>7} {'mean µs':>9} {'p50 µs':>9} {'p95 µs':>9} {'max |Δ| vs numpy':>17}")
+
+    rng = np.random.default_rng(1)
+    results = []
+    for batch_size in args.batch_sizes:
+        states = rng.random((batch_size, mlp.state_dim), dtype=np.float32)
+        reference = mlp(states)
+        for name, fn in backends.items():
+            diff = float(np.abs(fn(states) - reference).max())
+            result = {"batch_size": batch_size, "backend": name, "max_abs_diff": diff,
+                      **measure(fn, states, args.runs)}
+            results.append(result)
+            flag = "" if diff <= args.tolerance else "  ⚠️ above tolerance"
+            print(f"{batch_size:>5} {name:>7} {result['mean_us']:>9.1f} {result['p50_us']:>9.1f} "
+                  f"{result['p95_us']:>9.1f} {diff:>17.2e}{flag}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\n💾 Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
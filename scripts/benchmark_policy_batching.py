@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Batched Policy Inference Benchmark
+
+Purpose: Level 3/4 AI games each need one policy forward per tick on a
+small state vector, where per-call overhead dominates. This compares, per
+tick with N concurrent AI games:
+
+- per-game: N separate batch-1 forward passes (the old one-game-at-a-time path)
+- batched: one PolicyServer.decide_many() call → a single (N, D) forward,
+  both through the batcher thread (multi-shard servers) and inline (one shard)
+
+and reports tick latency (p50/p95), the per-game cost and how often the
+deadline was missed.
+
+Backends: --onnx, --torch, or the default NumPy engine (NumpyMLP, what
+create_policy_server uses for a .pt state_dict without torch) - a
+random-init PolicyNetwork-shaped MLP, or --numpy PATH for a saved
+state_dict. The default needs neither torch nor a model file.
+
+Usage:
+    python scripts/benchmark_policy_batching.py
+    python scripts/benchmark_policy_batching.py --numpy web_app/models/rl/ppo_agent.pt
+    python scripts/benchmark_policy_batching.py --onnx web_app/models/rl/policy.onnx
+    python scripts/benchmark_policy_batching.py --torch --state-dim 10 --games 1 8 32 128 --deadline-ms 5 \\
+        --output policy_batching.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# web_app 모듈 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "web_app"))
+
+from modules.numpy_mlp import NumpyMLP, load_policy_network
+from modules.policy_server import PolicyServer, onnx_policy_fn, torch_policy_fn
+
+
+def random_numpy_policy(state_dim: int, hidden_dim: int = 128, action_dim: int = 4, seed: int = 0) -> NumpyMLP:
+    """PolicyNetwork와 같은 구조 (Linear-ReLU-Linear-ReLU-Linear-Softmax)의 무작위 NumpyMLP"""
+    rng = np.random.default_rng(seed)
+    sizes = [state_dim, hidden_dim, hidden_dim, action_dim]
+    layers = [(rng.normal(0, 1 / np.sqrt(n_in), (n_out, n_in)).astype(np.float32), np.zeros(n_out, dtype=np.float32))
+              for n_in, n_out in zip(sizes, sizes[1:])]
+    return NumpyMLP(layers, output='softmax')
+
+
+def percentiles(samples_ms):
+    return float(np.percentile(samples_ms, 50)), float(np.percentile(samples_ms, 95))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-game vs. batched policy inference")
+    parser.add_argument("--onnx", type=Path, default=None, help="ONNX policy model (dynamic batch)")
+    parser.add_argument("--torch", action="store_true", help="Random-init PolicyNetwork (needs torch)")
+    parser.add_argument("--numpy", type=Path, default=None,
+                        help="state_dict (.pt / .npz) for the NumPy engine (default: random-init NumpyMLP)")
+    parser.add_argument("--state-dim", type=int, default=10, help="State dim for --torch / random NumPy policy")
+    parser.add_argument("--games", type=int, nargs="+", default=[1, 4, 16, 64], help="Concurrent AI games")
+    parser.add_argument("--ticks", type=int, default=300, help="Ticks per setting")
+    parser.add_argument("--deadline-ms", type=float, default=5.0)
+    parser.add_argument("--output", type=Path, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    if args.onnx:
+        policy_fn = onnx_policy_fn(str(args.onnx))
+        state_dim = policy_fn.state_dim or args.state_dim
+        backend = f"onnx ({args.onnx.name})"
+    elif args.torch:
+        from modules.ai_module import PolicyNetwork
+        policy_fn = torch_policy_fn(PolicyNetwork(state_dim=args.state_dim))
+        state_dim = args.state_dim
+        backend = "torch"
+    elif args.numpy:
+        policy_fn = load_policy_network(str(args.numpy))
+        state_dim = policy_fn.state_dim
+        backend = f"numpy ({args.numpy.name})"
+    else:
+        policy_fn = random_numpy_policy(args.state_dim)
+        state_dim = args.state_dim
+        backend = "numpy (random init)"
+
+    servers = {
+        'threaded': PolicyServer(policy_fn, max_batch_size=max(args.games), max_wait_ms=0,
+                                 deadline_ms=args.deadline_ms),
+        'inline': PolicyServer(policy_fn, deadline_ms=args.deadline_ms, inline=True),
+    }
+    rng = np.random.default_rng(0)
+    results = []
+
+    print(f"\n🧠 Policy backend: {backend}, state dim {state_dim}, {args.ticks} ticks per setting")
+    print(f"{'games':>5} {'per-game p50':>12} {'p95':>7} {'server':>8} {'batched p50':>11} {'p95':>7} "
+          f"{'µs/game':>8} {'speedup':>7} {'misses':>6}")
+
+    for num_games in args.games:
+        rows = list(rng.random((num_games, state_dim), dtype=np.float32))
+
+        for row in rows[:2]:  # 워밍업
+            policy_fn(row[None])
+        per_game = []
+        for _ in range(args.ticks):
+            start = time.perf_counter()
+            per_game_out = [policy_fn(row[None])[0] for row in rows]
+            per_game.append((time.perf_counter() - start) * 1000)
+        pg50, pg95 = percentiles(per_game)
+
+        for mode, server in servers.items():
+            server.decide_many(rows, deadline_ms=1000)
+            batched = []
+            misses_before = server.deadline_misses
+            for _ in range(args.ticks):
+                start = time.perf_counter()
+                batched_out = server.decide_many(rows)
+                batched.append((time.perf_counter() - start) * 1000)
+
+            agree = all(o is None or np.argmax(o) == np.argmax(p) for o, p in zip(batched_out, per_game_out))
+            b50, b95 = percentiles(batched)
+            result = {
+                'games': num_games,
+                'server': mode,
+                'per_game_p50_ms': pg50,
+                'per_game_p95_ms': pg95,
+                'batched_p50_ms': b50,
+                'batched_p95_ms': b95,
+                'batched_us_per_game': b50 * 1000 / num_games,
+                'speedup_p50': pg50 / b50 if b50 else 0.0,
+                'deadline_misses': server.deadline_misses - misses_before,
+                'actions_match': bool(agree),
+            }
+            results.append(result)
+            print(f"{num_games:>5} {pg50:>12.3f} {pg95:>7.3f} {mode:>8} {b50:>11.3f} {b95:>7.3f} "
+                  f"{result['batched_us_per_game']:>8.1f} {result['speedup_p50']:>6.1f}x "
+                  f"{result['deadline_misses']:>6}" + ("" if agree else "  ⚠️ action mismatch"))
+
+    for server in servers.values():
+        server.close()
+
+    if args.output:
+        args.output.write_text(json.dumps({'backend': backend, 'results': results}, indent=2))
+        print(f"\n💾 Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
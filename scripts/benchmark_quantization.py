@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+INT8 Quantization Benchmark
+
+Author: Minsuk Kim (mk4434)
+Purpose: Quantize the YOLO detector (static, calibrated on recorded game
+frames) and the policy MLP (dynamic) through ONNXModelOptimizer, then
+report the accuracy cost and CPU latency gain of each.
+
+- Detector: mAP50 / mAP50-95 on game_dataset val vs. the FP32 model, plus
+  agreement with the FP32 detections; calibration uses the train split
+- Policy: argmax action agreement and output difference on sampled states
+
+Usage:
+    python scripts/benchmark_quantization.py --yolo AI_model/best.onnx
+    python scripts/benchmark_quantization.py --yolo AI_model/best.onnx --policy models/policy.onnx \\
+        --calibration-images 300 --method Percentile --output quantization.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from deployment.onnx_optimizer import ONNXModelOptimizer, OptimizationConfig
+from deployment.evaluation import GAME_DATASET_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="INT8 quantization benchmark (YOLO static, policy dynamic)")
+    parser.add_argument("--yolo", type=Path, default=None, help="FP32 YOLO ONNX model")
+    parser.add_argument("--policy", type=Path, default=None, help="FP32 policy ONNX model")
+    parser.add_argument("--dataset", type=Path, default=GAME_DATASET_DIR)
+    parser.add_argument("--calibration-images", type=int, default=200)
+    parser.add_argument("--method", default="MinMax", choices=["MinMax", "Entropy", "Percentile"])
+    parser.add_argument("--no-per-channel", action="store_true", help="Per-tensor weight scales")
+    parser.add_argument("--quantize-head", action="store_true", help="Also quantize the YOLOv8 box-decoding tail")
+    parser.add_argument("--eval-images", type=int, default=0, help="Max val frames for mAP (0 = all)")
+    parser.add_argument("--runs", type=int, default=100, help="Latency iterations per model")
+    parser.add_argument("--threads", type=int, default=4, help="intra_op_num_threads")
+    parser.add_argument("--output", type=Path, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    if not args.yolo and not args.policy:
+        parser.error("at least one of --yolo / --policy is required")
+
+    config = OptimizationConfig(
+        calibration_images=args.calibration_images,
+        calibration_method=args.method,
+        quant_per_channel=not args.no_per_channel,
+        quant_exclude_detect_head=not args.quantize_head,
+        intra_op_num_threads=args.threads,
+    )
+    optimizer = ONNXModelOptimizer(config)
+    results = {}
+
+    if args.yolo:
+        print(f"\n🔢 YOLO static INT8 — calibration: {args.calibration_images} train frames ({args.method})")
+        int8_path = optimizer.quantize_yolo_model(args.yolo, calibration_dir=args.dataset / "images" / "train")
+        yolo = optimizer.compare_yolo_quantization(args.yolo, int8_path, args.dataset,
+                                                   num_images=args.eval_images, num_runs=args.runs)
+        yolo["int8_path"] = str(int8_path)
+        results["yolo"] = yolo
+
+        print(f"{'model':>6} {'mAP50':>7} {'mAP50-95':>9} {'mean ms':>8} {'p95 ms':>7}")
+        for name in ("fp32", "int8"):
+            r = yolo[name]
+            print(f"{name:>6} {r['map50']:>7.3f} {r['map50_95']:>9.3f} "
+                  f"{r['mean_latency_ms']:>8.2f} {r['p95_latency_ms']:>7.2f}")
+        print(f"   ΔmAP50 {yolo['map50_delta']:+.3f}, ΔmAP50-95 {yolo['map50_95_delta']:+.3f}, "
+              f"agreement with FP32 mAP50 {yolo['fp32_agreement_map50']:.3f}, "
+              f"speedup {yolo['speedup']:.2f}x ({yolo['eval_images']} val frames)")
+
+    if args.policy:
+        print(f"\n🔢 Policy dynamic INT8")
+        int8_path = optimizer.quantize_policy_model(args.policy)
+        policy = optimizer.compare_policy_quantization(args.policy, int8_path, num_runs=args.runs * 10)
+        policy["int8_path"] = str(int8_path)
+        results["policy"] = policy
+
+        print(f"{'model':>6} {'mean ms':>8} {'p95 ms':>7}")
+        for name in ("fp32", "int8"):
+            print(f"{name:>6} {policy[name]['mean_latency_ms']:>8.3f} {policy[name]['p95_latency_ms']:>7.3f}")
+        print(f"   action agreement {policy['action_agreement']:.1%}, "
+              f"max |Δp| {policy['max_abs_diff']:.4f}, speedup {policy['speedup']:.2f}x")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\n💾 Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Dirty-Region (ROI) Detection Benchmark
+
+Purpose: Measure what ComputerVisionModule's ROI mode (modules/roi_detection.py)
+buys and costs on the recorded game_dataset sessions: detection latency and
+pixels sent to the detector vs. full-frame detection, and accuracy against
+the YOLO labels.
+
+Frames of each session are replayed in order (the dataset keeps every 10th
+game frame).
+
+Detectors:
+- --model PATH : real detector through ComputerVisionModule (ONNX models need
+                 a dynamic input size export for region crops)
+- --oracle     : the labels themselves act as a perfect detector, so the
+                 accuracy numbers isolate the loss caused by region reuse
+
+Usage:
+    python scripts/benchmark_roi_detection.py --oracle
+    python scripts/benchmark_roi_detection.py --model AI_model/best.onnx --output roi.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# web_app 모듈 경로 추가
+WEB_APP_DIR = Path(__file__).parent.parent / "web_app"
+sys.path.insert(0, str(WEB_APP_DIR))
+
+from modules.cv_module import CVDetectionResult, ComputerVisionModule
+from modules.roi_detection import DirtyRegionDetector
+
+
+def load_sessions(dataset_dir: Path, split: str, limit: int = 0):
+    """session id → [(image path, label path)] in frame order."""
+    sessions = defaultdict(list)
+    for image_path in sorted((dataset_dir / "images" / split).glob("*.jpg")):
+        # game_{date}_{session}_{frame}.jpg
+        _, _, session, frame = image_path.stem.split("_")
+        label_path = dataset_dir / "labels" / split / f"{image_path.stem}.txt"
+        sessions[session].append((int(frame), image_path, label_path))
+
+    result = {}
+    for session, items in sessions.items():
+        items.sort()
+        result[session] = [(image, label) for _, image, label in items][:limit or None]
+    return result
+
+
+def load_frame(path: Path) -> np.ndarray:
+    """JPEG → (H, W, 3) BGR uint8 (what the detector expects)."""
+    return np.ascontiguousarray(np.asarray(Image.open(path).convert("RGB"))[..., ::-1])
+
+
+def load_labels(path: Path, width: int, height: int):
+    """YOLO label file → [(class_id, [x1, y1, x2, y2])] in pixels, clipped to the frame."""
+    labels = []
+    if path.exists():
+        for line in path.read_text().split("\n"):
+            if line.strip():
+                cls, cx, cy, w, h = line.split()
+                cx, cy, w, h = float(cx) * width, float(cy) * height, float(w) * width, float(h) * height
+                # Spawning objects hang off the top edge; detectors only see the visible part
+                labels.append((int(cls), [max(0.0, cx - w / 2), max(0.0, cy - h / 2),
+                                          min(width, cx + w / 2), min(height, cy + h / 2)]))
+    return labels
+
+
+def iou(a, b) -> float:
+    iw = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+    ih = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = iw * ih
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def match(detections, truth, threshold: float = 0.5):
+    """Greedy class-aware matching → (true positives, #detections, #truth)."""
+    used = set()
+    tp = 0
+    for det in sorted(detections, key=lambda d: -d.confidence):
+        best, best_iou = None, threshold
+        for i, (cls, box) in enumerate(truth):
+            if i not in used and cls == det.class_id:
+                overlap = iou(det.bbox, box)
+                if overlap >= best_iou:
+                    best, best_iou = i, overlap
+        if best is not None:
+            used.add(best)
+            tp += 1
+    return tp, len(detections), len(truth)
+
+
+class OracleDetector:
+    """Labels as a perfect detector (full frame or per crop, truncated at crop edges)."""
+
+    def __init__(self):
+        self.labels = []
+
+    def full(self, frame):
+        return [CVDetectionResult(list(box), cls, 1.0) for cls, box in self.labels]
+
+    def regions(self, frame, rects):
+        results = []
+        for x1, y1, x2, y2 in rects:
+            found = []
+            for cls, box in self.labels:
+                clipped = [max(box[0], x1), max(box[1], y1), min(box[2], x2), min(box[3], y2)]
+                if clipped[0] < clipped[2] and clipped[1] < clipped[3]:
+                    found.append(CVDetectionResult(clipped, cls, 1.0))
+            results.append(found)
+        return results
+
+
+def run_mode(sessions, mode: str, args):
+    """Replay all sessions in one mode → metrics dict (+ per-frame detections)."""
+    oracle = OracleDetector() if args.oracle else None
+    module = None
+    if not args.oracle:
+        module = ComputerVisionModule(model_path=args.model, batch_size=1, roi_mode=(mode == "roi"))
+        if module.backend == "simulation":
+            raise SystemExit(f"❌ Could not load detector: {args.model}")
+
+    times, per_frame = [], []
+    tp = n_det = n_truth = 0
+    stats = defaultdict(float)
+
+    for items in sessions.values():
+        roi = DirtyRegionDetector(refresh_interval=args.refresh) if mode == "roi" else None
+        if module is not None and module.roi is not None:
+            module.roi = roi
+
+        for image_path, label_path in items:
+            frame = load_frame(image_path)
+            labels = load_labels(label_path, frame.shape[1], frame.shape[0])
+
+            start = time.perf_counter()
+            if oracle is not None:
+                oracle.labels = labels
+                detections = roi.detect(frame, oracle.full, oracle.regions) if roi else oracle.full(frame)
+            else:
+                detections = module.detect_objects(frame)
+            times.append((time.perf_counter() - start) * 1000)
+
+            per_frame.append(detections)
+            t, d, n = match(detections, labels)
+            tp, n_det, n_truth = tp + t, n_det + d, n_truth + n
+
+        if roi is not None:
+            for key, value in roi.get_stats().items():
+                stats[key] += value * (len(items) if key == "pixel_ratio" else 1)
+
+    times = np.array(times)
+    total = sum(len(items) for items in sessions.values())
+    result = {
+        "mode": mode,
+        "frames": total,
+        "mean_ms": float(times.mean()),
+        "p95_ms": float(np.percentile(times, 95)),
+        "precision": tp / n_det if n_det else 0.0,
+        "recall": tp / n_truth if n_truth else 0.0,
+        "pixel_ratio": stats["pixel_ratio"] / total if mode == "roi" else 1.0,
+    }
+    if mode == "roi":
+        result.update({k: int(stats[k]) for k in ("full_frames", "region_frames", "skipped_frames")})
+    if module is not None:
+        module.close()
+    return result, per_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ROI vs full-frame detection benchmark")
+    parser.add_argument("--dataset", type=Path, default=WEB_APP_DIR / "game_dataset")
+    parser.add_argument("--split", default="train")
+    parser.add_argument("--model", default=None, help="YOLO model (.onnx with dynamic input size, or .pt)")
+    parser.add_argument("--oracle", action="store_true", help="Use labels as a perfect detector")
+    parser.add_argument("--refresh", type=int, default=30, help="Full-frame refresh interval (detections)")
+    parser.add_argument("--limit", type=int, default=0, help="Max frames per session (0 = all)")
+    parser.add_argument("--output", type=Path, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    if not args.oracle and not args.model:
+        parser.error("either --model or --oracle is required")
+
+    sessions = load_sessions(args.dataset, args.split, args.limit)
+    print(f"\n🎯 ROI detection — {sum(map(len, sessions.values()))} frames, {len(sessions)} sessions, "
+          f"{'oracle' if args.oracle else args.model}, refresh every {args.refresh}")
+
+    full, full_frames = run_mode(sessions, "full", args)
+    roi, roi_frames = run_mode(sessions, "roi", args)
+
+    # Agreement of ROI output with full-frame output (same detector)
+    tp = n_roi = n_full = 0
+    for roi_dets, full_dets in zip(roi_frames, full_frames):
+        t, d, n = match(roi_dets, [(det.class_id, det.bbox) for det in full_dets])
+        tp, n_roi, n_full = tp + t, n_roi + d, n_full + n
+    roi["agreement_f1"] = 2 * tp / (n_roi + n_full) if n_roi + n_full else 1.0
+
+    print(f"{'mode':>5} {'mean ms':>8} {'p95 ms':>7} {'pixels':>7} {'prec':>6} {'recall':>7}")
+    for result in (full, roi):
+        print(f"{result['mode']:>5} {result['mean_ms']:>8.2f} {result['p95_ms']:>7.2f} "
+              f"{result['pixel_ratio']:>7.1%} {result['precision']:>6.3f} {result['recall']:>7.3f}")
+    print(f"\n   ROI frames: {roi['full_frames']} full / {roi['region_frames']} region / "
+          f"{roi['skipped_frames']} skipped, agreement with full-frame F1 {roi['agreement_f1']:.3f}")
+
+    if args.output:
+        args.output.write_text(json.dumps({"full": full, "roi": roi}, indent=2))
+        print(f"\n💾 Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
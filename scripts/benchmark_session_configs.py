@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+ONNX Runtime Session Configuration Sweep
+
+Author: Minsuk Kim (mk4434)
+Purpose: OptimizationConfig ships fixed thread settings (intra_op=4,
+inter_op=2), but Cloud Run instances get 1, 2, 4 or 8 vCPUs. This sweeps
+the detector and policy sessions over intra/inter-op threads, execution
+mode, memory arena / pattern flags, providers and batch sizes, and picks
+the lowest-p95 config that fits each CPU allotment (intra x inter threads
+<= vCPUs).
+
+Run it on the target machine class (or with the container CPU-limited to
+the allotment); results on a laptop do not transfer.
+
+Usage:
+    python scripts/benchmark_session_configs.py --yolo AI_model/best.onnx --policy models/policy.onnx
+    python scripts/benchmark_session_configs.py --yolo AI_model/best.onnx --batch-sizes 1 4 8 \\
+        --intra 1 2 4 8 --cpus 2 4 --output session_sweep.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from deployment.onnx_optimizer import ONNXModelOptimizer, OptimizationConfig
+
+
+def threads_used(result) -> int:
+    inter = result["inter_op_num_threads"] if result["execution_mode"] == "ORT_PARALLEL" else 1
+    return result["intra_op_num_threads"] * inter
+
+
+def recommend(results, cpus: int):
+    """Lowest-p95 config per (model, batch size) using at most `cpus` threads."""
+    best = {}
+    for result in results:
+        if threads_used(result) > cpus:
+            continue
+        key = (result["model"], result["batch_size"])
+        if key not in best or result["p95_ms"] < best[key]["p95_ms"]:
+            best[key] = result
+    return [best[key] for key in sorted(best)]
+
+
+def print_table(results):
+    print(f"{'model':>20} {'provider':>9} {'mode':>5} {'intra':>5} {'inter':>5} {'arena':>5} {'pattern':>7} "
+          f"{'batch':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'items/s':>9}")
+    for r in results:
+        print(f"{r['model'][:20]:>20} {r['provider'].replace('ExecutionProvider', '')[:9]:>9} "
+              f"{'par' if r['execution_mode'] == 'ORT_PARALLEL' else 'seq':>5} "
+              f"{r['intra_op_num_threads']:>5} {r['inter_op_num_threads']:>5} "
+              f"{'on' if r['enable_cpu_mem_arena'] else 'off':>5} {'on' if r['enable_mem_pattern'] else 'off':>7} "
+              f"{r['batch_size']:>5} {r['p50_ms']:>8.3f} {r['p95_ms']:>8.3f} {r['p99_ms']:>8.3f} "
+              f"{r['items_per_s']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ONNX Runtime session configuration sweep")
+    parser.add_argument("--yolo", type=Path, default=None, help="YOLO ONNX model")
+    parser.add_argument("--policy", type=Path, default=None, help="Policy ONNX model")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1])
+    parser.add_argument("--policy-batch-sizes", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--intra", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--inter", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--modes", nargs="+", default=["ORT_SEQUENTIAL", "ORT_PARALLEL"],
+                        choices=["ORT_SEQUENTIAL", "ORT_PARALLEL"])
+    parser.add_argument("--no-flag-sweep", action="store_true",
+                        help="Keep memory arena / pattern on instead of sweeping them")
+    parser.add_argument("--providers", nargs="+", default=None, help="Default: all available")
+    parser.add_argument("--cpus", type=int, nargs="+", default=[1, 2, 4, 8], help="CPU allotments to recommend for")
+    parser.add_argument("--runs", type=int, default=50, help="Iterations per config")
+    parser.add_argument("--output", type=Path, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    if not args.yolo and not args.policy:
+        parser.error("at least one of --yolo / --policy is required")
+
+    optimizer = ONNXModelOptimizer(OptimizationConfig())
+    flags = [True] if args.no_flag_sweep else [True, False]
+
+    results = []
+    for model_path, batch_sizes in ((args.yolo, args.batch_sizes), (args.policy, args.policy_batch_sizes)):
+        if model_path is None:
+            continue
+        print(f"\n⏱️ Sweeping {model_path.name} ...")
+        results += optimizer.sweep_session_configs(
+            model_path,
+            batch_sizes=batch_sizes,
+            intra_op_threads=args.intra,
+            inter_op_threads=args.inter,
+            execution_modes=args.modes,
+            mem_arena=flags,
+            mem_pattern=flags,
+            providers=args.providers,
+            num_runs=args.runs,
+        )
+
+    print(f"\n📊 All configs ({len(results)})")
+    print_table(results)
+
+    recommendations = {}
+    for cpus in args.cpus:
+        recommendations[cpus] = recommend(results, cpus)
+        print(f"\n🏆 Best p95 with {cpus} vCPU{'s' if cpus > 1 else ''}")
+        print_table(recommendations[cpus])
+
+    if args.output:
+        args.output.write_text(json.dumps({"results": results, "recommendations": recommendations}, indent=2))
+        print(f"\n💾 Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+State Encoder Benchmark
+
+Purpose: The policy state used to be built per game by walking
+game.obstacles in Python with scalar np.sqrt / np.clip calls. This compares
+that loop against vision_agent_shared/state_encoder for N concurrent games
+with M obstacles each, checks that both produce identical vectors, and
+reports the time per tick:
+
+- loop: the old per-obstacle Python loop, once per game
+- per-game: encode_states() on one game's obstacle arrays at a time
+- batched: one encode_states() call for all games (what BatchPhysicsEngine does)
+
+Usage:
+    python scripts/benchmark_state_encoder.py
+    python scripts/benchmark_state_encoder.py --games 1 16 64 256 --obstacles 20 --output state_encoder.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# web_app 모듈 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "web_app"))
+
+from vision_agent_shared.state_encoder import (OBSTACLE_SIZE, PLAYER_SIZE, SCREEN_HEIGHT, SCREEN_WIDTH, TYPE_CODES,
+                                   encode_states)
+
+
+def loop_encode(player_x, player_y, player_vy, obstacles):
+    """이전 app.encode_game_state의 파이썬 루프 (비교 기준)"""
+    state = np.zeros(10, dtype=np.float32)
+    state[0] = player_x / SCREEN_WIDTH
+    state[1] = player_y / SCREEN_HEIGHT
+    state[2] = np.clip(player_vy / 20.0, -1, 1)
+    state[9] = 1.0 if player_y >= SCREEN_HEIGHT - PLAYER_SIZE - 5 else 0.0
+    nearest = {'meteor': (1.0, 3), 'star': (1.0, 6)}
+    for obs in obstacles:
+        dx = (obs['x'] + OBSTACLE_SIZE / 2 - (player_x + PLAYER_SIZE / 2)) / SCREEN_WIDTH
+        dy = (obs['y'] + OBSTACLE_SIZE / 2 - player_y) / SCREEN_HEIGHT
+        dist = np.sqrt(dx ** 2 + dy ** 2)
+        best, column = nearest[obs['type']]
+        if dist < best:
+            nearest[obs['type']] = (dist, column)
+            state[column] = np.clip(dx, -1, 1)
+            state[column + 1] = np.clip(dy, 0, 1)
+            state[column + 2] = dist
+    return state
+
+
+def random_games(rng, num_games: int, num_obstacles: int):
+    players = np.column_stack([rng.uniform(0, SCREEN_WIDTH - PLAYER_SIZE, num_games),
+                               rng.choice([SCREEN_HEIGHT - PLAYER_SIZE, 300.0], num_games),
+                               rng.normal(0, 10, num_games)])
+    total = num_games * num_obstacles
+    owner = np.repeat(np.arange(num_games), num_obstacles)
+    x = rng.uniform(-OBSTACLE_SIZE, SCREEN_WIDTH, total)
+    y = rng.uniform(-OBSTACLE_SIZE, SCREEN_HEIGHT, total)
+    obstacle_type = (rng.random(total) < 0.1).astype(np.int8)  # 10% 별
+    return players, owner, x, y, obstacle_type
+
+
+def measure(fn, runs: int):
+    fn()
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.percentile(times, 50))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Python loop vs. vectorized policy state encoding")
+    parser.add_argument("--games", type=int, nargs="+", default=[1, 16, 64, 256])
+    parser.add_argument("--obstacles", type=int, default=20, help="Obstacles per game")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--output", type=Path, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    type_names = {code: name for name, code in TYPE_CODES.items()}
+    results = []
+
+    print(f"\n🧮 State encoding, {args.obstacles} obstacles per game, p50 of {args.runs} runs")
+    print(f"{'games':>5} {'loop ms':>8} {'per-game ms':>11} {'batched ms':>10} {'speedup':>7} {'max |Δ|':>8}")
+
+    for num_games in args.games:
+        players, owner, x, y, obstacle_type = random_games(rng, num_games, args.obstacles)
+        cx, cy = x + OBSTACLE_SIZE / 2, y + OBSTACLE_SIZE / 2
+        games = [[{'x': x[i], 'y': y[i], 'type': type_names[obstacle_type[i]]} for i in np.flatnonzero(owner == g)]
+                 for g in range(num_games)]
+        rows = [np.flatnonzero(owner == g) for g in range(num_games)]
+
+        def run_loop():
+            return np.stack([loop_encode(*players[g], games[g]) for g in range(num_games)])
+
+        def run_per_game():
+            return np.stack([encode_states(players[g, :1], players[g, 1:2], players[g, 2:],
+                                           cx[r], cy[r], obstacle_type[r])[0] for g, r in enumerate(rows)])
+
+        def run_batched():
+            return encode_states(players[:, 0], players[:, 1], players[:, 2], cx, cy, obstacle_type, owner)
+
+        reference = run_loop()
+        diff = max(float(np.abs(run_per_game() - reference).max()), float(np.abs(run_batched() - reference).max()))
+        loop_ms, per_game_ms, batched_ms = measure(run_loop, args.runs), measure(run_per_game, args.runs), \
+            measure(run_batched, args.runs)
+        result = {
+            'games': num_games,
+            'obstacles_per_game': args.obstacles,
+            'loop_p50_ms': loop_ms,
+            'per_game_p50_ms': per_game_ms,
+            'batched_p50_ms': batched_ms,
+            'speedup_p50': loop_ms / batched_ms if batched_ms else 0.0,
+            'max_abs_diff': diff,
+        }
+        results.append(result)
+        print(f"{num_games:>5} {loop_ms:>8.3f} {per_game_ms:>11.3f} {batched_ms:>10.3f} "
+              f"{result['speedup_p50']:>6.1f}x {diff:>8.1e}" + ("" if diff == 0 else "  ⚠️ mismatch"))
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\n💾 Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
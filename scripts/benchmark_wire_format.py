@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+game_update Wire Format Microbenchmark
+
+Purpose: Compare encode time and payload size of the state encodings the
+server can negotiate at connect time:
+    - json:   dict → JSON text (current fallback path)
+    - delta:  keyframe/delta JSON (modules/state_protocol.StateDeltaEncoder)
+    - binary: struct-packed buffer (modules/state_protocol.encode_binary_state)
+
+States are recorded from a real web_app Game running in AI mode, then padded
+with extra obstacles to show how each format scales with obstacle count.
+
+Usage:
+    python scripts/benchmark_wire_format.py --ticks 600 --obstacles 0 20 100
+"""
+
+import argparse
+import copy
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# web_app 모듈 경로 추가
+WEB_APP_DIR = Path(__file__).parent.parent / "web_app"
+sys.path.insert(0, str(WEB_APP_DIR))
+
+from modules.state_protocol import StateDeltaEncoder, decode_binary_state, encode_binary_state
+
+
+def record_states(server, ticks: int, extra_obstacles: int, seed: int = 0) -> list:
+    """Run an AI game for `ticks` frames and snapshot get_state() each tick."""
+    random.seed(seed)
+    game = server.Game('bench')
+    game.running = True
+    game.mode = 'ai'
+    game.ai_level = 2
+
+    # 추가 장애물: 고정 궤적으로 함께 움직이는 가짜 객체
+    padding = [{
+        'id': 1_000_000 + i, 'type': 'meteor' if i % 10 else 'star',
+        'x': random.randint(0, server.WIDTH), 'y': random.randint(0, server.HEIGHT),
+        'vx': random.randint(-2, 2), 'vy': 5, 'size': 50
+    } for i in range(extra_obstacles)]
+
+    states = []
+    for _ in range(ticks):
+        if game.game_over:
+            game.reset()
+            game.running = True
+            game.mode = 'ai'
+        action = server.ai_decision(game)
+        if action == 'jump':
+            game.jump()
+        elif action == 'left':
+            game.move_left()
+        elif action == 'right':
+            game.move_right()
+        game.update()
+
+        for obs in padding:
+            obs['x'] = (obs['x'] + obs['vx']) % server.WIDTH
+            obs['y'] = (obs['y'] + obs['vy']) % server.HEIGHT
+
+        state = game.get_state()
+        state['obstacles'] = copy.deepcopy(state['obstacles']) + copy.deepcopy(padding)
+        states.append(state)
+
+    return states
+
+
+def bench(name: str, encode, states: list, size_fn) -> dict:
+    """Encode every state once, timing each call and measuring payload bytes."""
+    times, sizes = [], []
+    for state in states:
+        start = time.perf_counter()
+        payload = encode(state)
+        times.append((time.perf_counter() - start) * 1e6)
+        sizes.append(size_fn(payload))
+
+    return {
+        'format': name,
+        'mean_encode_us': float(np.mean(times)),
+        'p95_encode_us': float(np.percentile(times, 95)),
+        'mean_bytes': float(np.mean(sizes)),
+        'bytes_per_s_at_30fps': float(np.mean(sizes)) * 30,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="game_update wire format microbenchmark")
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--obstacles', type=int, nargs='+', default=[0, 20, 100],
+                        help="Extra obstacles added on top of the live game")
+    parser.add_argument('--output', type=Path, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    import app as server
+
+    all_results = []
+    for extra in args.obstacles:
+        states = record_states(server, args.ticks, extra)
+        avg_obstacles = np.mean([len(s['obstacles']) for s in states])
+
+        # 바이너리 왕복 검증 (좌표/ID가 그대로 복원되는지)
+        decoded = decode_binary_state(encode_binary_state(states[-1]))
+        assert [o['id'] for o in decoded['obstacles']] == [o['id'] for o in states[-1]['obstacles']]
+
+        encoder = StateDeltaEncoder(keyframe_interval=server.KEYFRAME_INTERVAL)
+        results = [
+            bench('json', lambda s: json.dumps({'state': s}), states, len),
+            bench('delta', lambda s: json.dumps(encoder.encode(s)), states, len),
+            bench('binary', encode_binary_state, states, len),
+        ]
+
+        print(f"\n📦 Wire formats — {args.ticks} ticks, {avg_obstacles:.1f} obstacles/tick")
+        print(f"{'format':>8} {'encode µs':>10} {'p95 µs':>8} {'bytes':>8} {'B/s @30':>9} {'vs json':>8}")
+        json_bytes = results[0]['mean_bytes']
+        for r in results:
+            r['obstacles'] = float(avg_obstacles)
+            print(f"{r['format']:>8} {r['mean_encode_us']:>10.1f} {r['p95_encode_us']:>8.1f} "
+                  f"{r['mean_bytes']:>8.0f} {r['bytes_per_s_at_30fps']:>9.0f} "
+                  f"{json_bytes / r['mean_bytes']:>7.1f}x")
+        all_results.extend(results)
+
+    if args.output:
+        args.output.write_text(json.dumps(all_results, indent=2))
+        print(f"\n💾 Results saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
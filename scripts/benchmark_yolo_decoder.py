@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+YOLOv8 Output Decoder Microbenchmark
+
+Author: Minsuk Kim (mk4434)
+Purpose: Verify the shared vectorized decoder in
+web_app/vision_agent_shared/yolo_decoder.py (used by the web app's ONNX
+backend and by src/deployment) stays under
+1 ms (median) per frame for a 640x640 YOLOv8 head (8400 anchors), and that
+it matches a straightforward per-box Python reference.
+
+Synthetic outputs mimic a real head: low background scores everywhere,
+plus clusters of overlapping high-score anchors around each object.
+
+Usage:
+    python scripts/benchmark_yolo_decoder.py --anchors 8400 --objects 5 20 40
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# web_app 모듈 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "web_app"))
+
+from vision_agent_shared.yolo_decoder import DecoderConfig, YOLOv8Decoder
+
+
+def make_output(anchors: int, num_classes: int, objects: int, rng: np.random.Generator) -> np.ndarray:
+    """Synthetic (1, 4 + nc, anchors) YOLOv8 output with clustered detections."""
+    output = np.empty((4 + num_classes, anchors), dtype=np.float32)
+    output[0] = rng.uniform(0, 640, anchors)
+    output[1] = rng.uniform(0, 640, anchors)
+    output[2:4] = rng.uniform(8, 64, (2, anchors))
+    output[4:] = rng.uniform(0, 0.05, (num_classes, anchors))  # background
+
+    # ~10 overlapping anchors fire on each object
+    for _ in range(objects):
+        cx, cy = rng.uniform(40, 600, 2)
+        w, h = rng.uniform(20, 80, 2)
+        cls = rng.integers(num_classes)
+        idx = rng.choice(anchors, 10, replace=False)
+        output[0, idx] = cx + rng.normal(0, 2, 10)
+        output[1, idx] = cy + rng.normal(0, 2, 10)
+        output[2, idx] = w + rng.normal(0, 2, 10)
+        output[3, idx] = h + rng.normal(0, 2, 10)
+        output[4 + cls, idx] = rng.uniform(0.3, 0.95, 10)
+
+    return output[None]
+
+
+def reference_decode(output: np.ndarray, config: DecoderConfig):
+    """Per-box Python decode + greedy per-class NMS (the loop the decoder replaces)."""
+    pred = output[0].T
+    candidates = []
+    for row in pred:
+        scores = row[4:]
+        cls = int(np.argmax(scores))
+        if scores[cls] > config.conf_threshold:
+            cx, cy, w, h = row[:4]
+            candidates.append(([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], float(scores[cls]), cls))
+
+    candidates.sort(key=lambda c: -c[1])
+    kept = []
+    for box, score, cls in candidates:
+        suppressed = False
+        for kept_box, _, kept_cls in kept:
+            if kept_cls != cls:
+                continue
+            iw = max(0.0, min(box[2], kept_box[2]) - max(box[0], kept_box[0]))
+            ih = max(0.0, min(box[3], kept_box[3]) - max(box[1], kept_box[1]))
+            inter = iw * ih
+            union = ((box[2] - box[0]) * (box[3] - box[1]) +
+                     (kept_box[2] - kept_box[0]) * (kept_box[3] - kept_box[1]) - inter)
+            if inter / (union + 1e-9) > config.iou_threshold:
+                suppressed = True
+                break
+        if not suppressed:
+            kept.append((box, score, cls))
+        if len(kept) >= config.max_detections:
+            break
+    return kept
+
+
+def time_ms(fn, runs: int) -> np.ndarray:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return np.array(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YOLOv8 decoder microbenchmark")
+    parser.add_argument('--anchors', type=int, default=8400)
+    parser.add_argument('--classes', type=int, default=5)
+    parser.add_argument('--objects', type=int, nargs='+', default=[5, 20, 40])
+    parser.add_argument('--runs', type=int, default=500)
+    parser.add_argument('--budget-ms', type=float, default=1.0)
+    parser.add_argument('--output', type=Path, default=None, help="Optional JSON output path")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    config = DecoderConfig()
+    decoder = YOLOv8Decoder(config)
+
+    print(f"\n🔍 YOLOv8 decoder — {args.anchors} anchors, {args.classes} classes, budget {args.budget_ms} ms")
+    print(f"{'objects':>8} {'kept':>5} {'mean ms':>8} {'p50 ms':>7} {'p99 ms':>7} {'ref ms':>8} {'speedup':>8} {'ok':>4}")
+
+    results = []
+    all_ok = True
+    for objects in args.objects:
+        output = make_output(args.anchors, args.classes, objects, rng)
+
+        # Correctness against the reference loop
+        boxes, scores, class_ids = decoder.decode(output)
+        reference = reference_decode(output, config)
+        assert len(reference) == len(boxes), (len(reference), len(boxes))
+        assert np.allclose(np.array([r[0] for r in reference]).reshape(-1, 4), boxes, atol=1e-4)
+        assert [r[2] for r in reference] == class_ids.tolist()
+
+        for _ in range(20):  # warmup
+            decoder.decode(output)
+        times = time_ms(lambda: decoder.decode(output), args.runs)
+        ref_times = time_ms(lambda: reference_decode(output, config), max(3, args.runs // 100))
+
+        ok = float(np.percentile(times, 50)) < args.budget_ms
+        all_ok &= ok
+        result = {
+            'anchors': args.anchors,
+            'objects': objects,
+            'kept': int(len(boxes)),
+            'mean_ms': float(times.mean()),
+            'p50_ms': float(np.percentile(times, 50)),
+            'p99_ms': float(np.percentile(times, 99)),
+            'reference_mean_ms': float(ref_times.mean()),
+            'within_budget': ok,
+        }
+        results.append(result)
+        print(f"{objects:>8} {result['kept']:>5} {result['mean_ms']:>8.3f} {result['p50_ms']:>7.3f} "
+              f"{result['p99_ms']:>7.3f} {result['reference_mean_ms']:>8.1f} "
+              f"{result['reference_mean_ms'] / result['mean_ms']:>7.0f}x {'✓' if ok else '✗':>4}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\n💾 Results saved: {args.output}")
+
+    sys.exit(0 if all_ok else 1)
+
+
+if __name__ == "__main__":
+    main()
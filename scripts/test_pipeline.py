@@ -164,7 +164,7 @@ def test_onnx_optimization():
         def __init__(self):
             super().__init__()
             self.network = nn.Sequential(
-                nn.Linear(8, 64),
+                nn.Linear(10, 64),
                 nn.ReLU(),
                 nn.Linear(64, 32),
                 nn.ReLU(),
@@ -211,7 +211,7 @@ def test_onnx_optimization():
         
         print(f"   ✓ YOLO benchmark: {yolo_stats['mean_fps']:.1f} FPS ({yolo_stats['mean_latency_ms']:.2f}ms)")
         
-        test_state = np.random.randn(1, 8).astype(np.float32)
+        test_state = np.random.randn(1, 10).astype(np.float32)
         policy_stats = optimizer.benchmark_model(policy_session, test_state, num_runs=20, warmup_runs=5)
         
         print(f"   ✓ Policy benchmark: {policy_stats['mean_fps']:.1f} FPS ({policy_stats['mean_latency_ms']:.2f}ms)")
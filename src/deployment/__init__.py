@@ -6,4 +6,20 @@ This module handles:
 - Real-time inference pipeline optimization
 - Performance profiling and bottleneck analysis
 - Runtime deployment utilities
+
+The YOLOv8 output decoder and the policy state encoder are shared with the
+web app through the NumPy-only `vision_agent_shared` package
+(web_app/vision_agent_shared/), so training-side evaluation and serving
+decode and encode identically. Nothing here imports the web app's
+`modules` package. In a source checkout where `vision_agent_shared` is not
+installed, web_app/ is appended to sys.path so it can be imported by name.
 """
+
+import importlib.util
+import sys
+from pathlib import Path
+
+WEB_APP_DIR = Path(__file__).resolve().parents[2] / "web_app"
+if (importlib.util.find_spec("vision_agent_shared") is None and WEB_APP_DIR.is_dir()
+        and str(WEB_APP_DIR) not in sys.path):
+    sys.path.append(str(WEB_APP_DIR))
@@ -0,0 +1,207 @@
+"""
+Detector Evaluation on the Game Dataset
+
+Author: Minsuk Kim (mk4434)
+Purpose: Score ONNX detector variants (quantized, reduced input size, ...)
+against the YOLO labels in web_app/game_dataset with the same letterboxed
+input the runtime sees.
+
+- letterboxed samples with labels mapped into model input pixels
+- COCO-style mAP50 / mAP50-95 (101-point interpolation), per-class AP50
+- per-class recall at the deployment confidence threshold
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from vision_agent_shared.yolo_decoder import YOLOv8Decoder
+
+from .preprocessing import LETTERBOX_COLOR, letterbox_geometry
+
+# Recorded game frames + YOLO labels (images/{train,val}, labels/{train,val})
+GAME_DATASET_DIR = Path(__file__).resolve().parents[2] / "web_app" / "game_dataset"
+
+
+def letterbox_image(image: np.ndarray,
+                    input_shape: Tuple[int, int],
+                    color: int = LETTERBOX_COLOR) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """
+    Resize keeping the aspect ratio, pad to the model input, HWC BGR → NCHW RGB.
+
+    Args:
+        image: (H, W, 3) BGR uint8
+        input_shape: Model input (H, W)
+        color: Padding value
+
+    Returns:
+        (tensor (1, 3, H, W) float32 in [0, 1], scale ratio, (left, top) padding)
+    """
+    target_h, target_w = input_shape
+    ratio, new_w, new_h, left, top = letterbox_geometry(image.shape[:2], input_shape)
+
+    canvas = np.full((target_h, target_w, 3), color, dtype=np.uint8)
+    canvas[top:top + new_h, left:left + new_w] = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    tensor = canvas[..., ::-1].transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+    return np.ascontiguousarray(tensor), ratio, (left, top)
+
+
+def select_images(image_dir: Path, limit: int) -> List[Path]:
+    """Up to `limit` images spread evenly over the sorted directory (covers every session)."""
+    images = sorted(Path(image_dir).glob("*.jpg")) + sorted(Path(image_dir).glob("*.png"))
+    if limit and len(images) > limit:
+        images = [images[i] for i in np.linspace(0, len(images) - 1, limit).astype(int)]
+    return images
+
+
+def load_detection_samples(image_dir: Path,
+                           label_dir: Path,
+                           input_shape: Tuple[int, int],
+                           limit: int = 0) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Letterboxed frames with their labels in model input pixels.
+
+    Returns:
+        [(tensor (1, 3, H, W), boxes (N, 4) xyxy, class_ids (N,))]
+    """
+    samples = []
+    for path in select_images(image_dir, limit):
+        image = cv2.imread(str(path))
+        tensor, ratio, (left, top) = letterbox_image(image, input_shape)
+        height, width = image.shape[:2]
+
+        boxes, classes = [], []
+        label_path = Path(label_dir) / f"{path.stem}.txt"
+        if label_path.exists():
+            for line in label_path.read_text().split("\n"):
+                if line.strip():
+                    cls, cx, cy, w, h = map(float, line.split())
+                    boxes.append([(cx - w / 2) * width, (cy - h / 2) * height,
+                                  (cx + w / 2) * width, (cy + h / 2) * height])
+                    classes.append(int(cls))
+
+        boxes = np.array(boxes, dtype=np.float32).reshape(-1, 4)
+        # Spawning objects hang off the frame edge; the detector only sees the visible part
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, width) * ratio + left
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, height) * ratio + top
+        samples.append((tensor, boxes, np.array(classes, dtype=np.int64)))
+    return samples
+
+
+def _box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(N, 4) × (M, 4) xyxy IoU matrix."""
+    inter_w = np.clip(np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(a[:, None, 0], b[None, :, 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(a[:, None, 1], b[None, :, 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+def average_precision(recall: np.ndarray, precision: np.ndarray) -> float:
+    """Area under the precision envelope, 101-point interpolation (COCO)."""
+    envelope = np.maximum.accumulate(np.concatenate([[0.0], precision, [0.0]])[::-1])[::-1]
+    recall = np.concatenate([[0.0], recall, [1.0]])
+    points = np.linspace(0, 1, 101)
+    return float(envelope[np.searchsorted(recall, points, side="left").clip(max=len(envelope) - 1)].mean())
+
+
+def detection_map(predictions: Sequence[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                  ground_truth: Sequence[Tuple[np.ndarray, np.ndarray]],
+                  iou_thresholds: Optional[np.ndarray] = None) -> Dict[str, float]:
+    """
+    Mean average precision over classes that appear in the ground truth.
+
+    Args:
+        predictions: Per image (boxes, scores, class_ids)
+        ground_truth: Per image (boxes, class_ids)
+        iou_thresholds: Defaults to 0.50:0.05:0.95
+
+    Returns:
+        {'map50': ..., 'map50_95': ..., 'ap50_per_class': {class_id: AP50}}
+    """
+    if iou_thresholds is None:
+        iou_thresholds = np.linspace(0.5, 0.95, 10)
+
+    # Per detection: class, score, and whether it is a true positive at each threshold
+    det_classes, det_scores, det_tp = [], [], []
+    gt_counts: Dict[int, int] = {}
+    for (boxes, scores, classes), (gt_boxes, gt_classes) in zip(predictions, ground_truth):
+        for cls in gt_classes.tolist():
+            gt_counts[cls] = gt_counts.get(cls, 0) + 1
+
+        order = np.argsort(-scores, kind="stable")
+        boxes, scores, classes = boxes[order], scores[order], classes[order]
+        tp = np.zeros((len(boxes), len(iou_thresholds)), dtype=bool)
+        if len(boxes) and len(gt_boxes):
+            ious = _box_iou(boxes, gt_boxes)
+            ious[classes[:, None] != gt_classes[None, :]] = 0.0
+            for t, threshold in enumerate(iou_thresholds):
+                used = np.zeros(len(gt_boxes), dtype=bool)
+                for d in range(len(boxes)):
+                    candidates = np.where(~used & (ious[d] >= threshold))[0]
+                    if len(candidates):
+                        best = candidates[np.argmax(ious[d, candidates])]
+                        used[best] = True
+                        tp[d, t] = True
+
+        det_classes.append(classes)
+        det_scores.append(scores)
+        det_tp.append(tp)
+
+    det_classes = np.concatenate(det_classes) if det_classes else np.zeros(0, dtype=np.int64)
+    det_scores = np.concatenate(det_scores) if det_scores else np.zeros(0)
+    det_tp = np.concatenate(det_tp) if det_tp else np.zeros((0, len(iou_thresholds)), dtype=bool)
+
+    ap = np.zeros((len(gt_counts), len(iou_thresholds)))
+    for i, (cls, count) in enumerate(sorted(gt_counts.items())):
+        mask = det_classes == cls
+        order = np.argsort(-det_scores[mask], kind="stable")
+        tp_cum = np.cumsum(det_tp[mask][order], axis=0)
+        fp_cum = np.cumsum(~det_tp[mask][order], axis=0)
+        for t in range(len(iou_thresholds)):
+            recall = tp_cum[:, t] / count
+            precision = tp_cum[:, t] / np.maximum(tp_cum[:, t] + fp_cum[:, t], 1)
+            ap[i, t] = average_precision(recall, precision)
+
+    return {
+        "map50": float(ap[:, 0].mean()) if len(ap) else 0.0,
+        "map50_95": float(ap.mean()) if len(ap) else 0.0,
+        "ap50_per_class": {cls: float(ap[i, 0]) for i, cls in enumerate(sorted(gt_counts))},
+    }
+
+
+def run_detector(session, samples, decoder: YOLOv8Decoder) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Decoded (boxes, scores, class_ids) per sample, in model input pixels."""
+    input_name = session.get_inputs()[0].name
+    return [decoder.decode(session.run(None, {input_name: tensor})[0]) for tensor, _, _ in samples]
+
+
+def class_recall(predictions: Sequence[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+                 ground_truth: Sequence[Tuple[np.ndarray, np.ndarray]],
+                 iou_threshold: float = 0.5) -> Dict[int, float]:
+    """
+    Fraction of labelled objects found, per class (greedy, one detection per object).
+
+    Use predictions decoded at the deployment confidence threshold: at the
+    near-zero mAP threshold nearly everything is "found".
+    """
+    found: Dict[int, int] = {}
+    total: Dict[int, int] = {}
+    for (boxes, _, classes), (gt_boxes, gt_classes) in zip(predictions, ground_truth):
+        for cls in gt_classes.tolist():
+            total[cls] = total.get(cls, 0) + 1
+        if not len(boxes) or not len(gt_boxes):
+            continue
+        ious = _box_iou(gt_boxes, boxes)
+        ious[gt_classes[:, None] != classes[None, :]] = 0.0
+        used = np.zeros(len(boxes), dtype=bool)
+        for g in np.argsort(-ious.max(axis=1)):
+            candidates = np.where(~used & (ious[g] >= iou_threshold))[0]
+            if len(candidates):
+                used[candidates[np.argmax(ious[g, candidates])]] = True
+                found[int(gt_classes[g])] = found.get(int(gt_classes[g]), 0) + 1
+    return {cls: found.get(cls, 0) / count for cls, count in sorted(total.items())}
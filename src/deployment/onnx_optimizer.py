@@ -10,20 +10,31 @@ Key optimizations:
 - Inference session configuration for maximum speed
 - Memory management and batch processing
 - Hardware-specific optimizations (CPU/GPU)
+- INT8 quantization (calibrated static for YOLO, dynamic for the policy MLP)
 """
 
 import torch
 import torch.nn as nn
-import onnx
 import onnxruntime as ort
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Union, Any
 from pathlib import Path
 import time
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+import itertools
 import logging
 
+from vision_agent_shared.yolo_decoder import DEFAULT_MAX_DET, DEFAULT_MAX_NMS, DecoderConfig, YOLOv8Decoder
+
+from .evaluation import GAME_DATASET_DIR, class_recall, detection_map, load_detection_samples, run_detector
+from .graph_optimization import (GRAPH_OPTIMIZATION_LEVELS, graph_op_counts, op_count_diff, optimize_graph,
+                                 sample_input, session_load_ms)
+from .preprocessing import FramePreprocessor
+from .quantization import (GameFrameCalibrationReader, model_input_shape, policy_agreement,
+                           quantize_detector_static, quantize_policy_dynamic)
+from .state_encoding import STATE_DIM, detections_to_state
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -39,20 +50,36 @@ class OptimizationConfig:
     
     # ONNX optimization levels
     graph_optimization_level: str = "ORT_ENABLE_ALL"  # ORT_DISABLE_ALL, ORT_ENABLE_BASIC, ORT_ENABLE_EXTENDED, ORT_ENABLE_ALL
+    offline_optimization_level: str = "ORT_ENABLE_EXTENDED"  # serialized by _optimize_onnx_model (ALL is CPU-specific)
+    save_ort_format: bool = False  # also write a .ort model next to the optimized .onnx
     
     # Execution providers (in order of preference)
     execution_providers: List[str] = None
     
     # Session configuration
     intra_op_num_threads: int = 4
-    inter_op_num_threads: int = 2
+    inter_op_num_threads: int = 2  # only used with ORT_PARALLEL
+    execution_mode: str = "ORT_SEQUENTIAL"  # ORT_SEQUENTIAL, ORT_PARALLEL
     enable_cpu_mem_arena: bool = True
     enable_mem_pattern: bool = True
     
     # Model-specific settings
-    input_shape: Tuple[int, int, int, int] = (1, 3, 640, 480)  # NCHW format
+    input_shape: Tuple[int, int, int, int] = (1, 3, 480, 640)  # NCHW format; 4:3 like the 960x720 game frames
     dynamic_axes: Dict[str, Dict[int, str]] = None
     
+    # Detection post-processing (shared decoder: vision_agent_shared.yolo_decoder.DecoderConfig)
+    conf_threshold: float = 0.25
+    iou_threshold: float = 0.7
+    class_conf_thresholds: Dict[int, float] = None
+    pre_nms_topk: int = DEFAULT_MAX_NMS
+    max_detections: int = DEFAULT_MAX_DET
+    
+    # INT8 quantization (see quantization.py)
+    calibration_images: int = 200
+    calibration_method: str = "MinMax"  # MinMax, Entropy, Percentile
+    quant_per_channel: bool = True
+    quant_exclude_detect_head: bool = True  # keep YOLOv8 box decoding in FP32
+    
     def __post_init__(self):
         if self.execution_providers is None:
             # Auto-detect best execution providers
@@ -148,7 +175,7 @@ class ONNXModelOptimizer:
     def export_policy_model(self,
                            model: torch.nn.Module,
                            output_path: Path,
-                           input_size: int = 8) -> Path:
+                           input_size: int = STATE_DIM) -> Path:
         """
         Export MLP policy network to optimized ONNX format.
         
@@ -193,70 +220,128 @@ class ONNXModelOptimizer:
         """
         Apply ONNX graph optimizations to reduce inference time.
         
+        Export-time pass only: writes <model>.optimized.onnx with
+        optimize_graph() and skips the before/after benchmark of
+        optimize_onnx_model().
+        
         Args:
             model_path: Path to original ONNX model
             
         Returns:
             Path to optimized ONNX model
         """
-        # Load model
-        model = onnx.load(str(model_path))
-        
-        # Apply optimizations
-        from onnxruntime.tools import optimizer
-        
+        model_path = Path(model_path)
         optimized_path = model_path.with_suffix('.optimized.onnx')
+        optimize_graph(model_path, optimized_path, level=self.config.offline_optimization_level,
+                       save_ort_format=self.config.save_ort_format,
+                       providers=self.config.execution_providers)
+        return optimized_path
+    
+    def optimize_onnx_model(self,
+                            model_path: Path,
+                            output_path: Path = None,
+                            num_runs: int = 50) -> Tuple[Path, Dict[str, Any]]:
+        """
+        Offline graph optimization pass with a before/after report.
         
-        # Create optimization session
-        opt_session = optimizer.optimize_model(
-            str(model_path),
-            model_type='bert',  # Generic optimization
-            num_heads=0,
-            hidden_size=0,
-            optimization_options=None
-        )
+        Runs shape inference and ONNX Runtime's optimizer (constant folding,
+        Conv+BN / Conv+activation fusion, ...) once and serializes the result
+        (see graph_optimization.py). The report compares node counts, session
+        creation time and latency of the original model (optimizer disabled,
+        and optimized online at load) with the optimized file. Used by
+        scripts/benchmark_graph_optimization.py; the export methods only call
+        _optimize_onnx_model().
         
-        # Save optimized model
-        opt_session.save_model_to_file(str(optimized_path))
+        Args:
+            model_path: Path to original ONNX model
+            output_path: Defaults to <model>.optimized.onnx
+            num_runs: benchmark_model iterations per variant
+            
+        Returns:
+            (optimized model path, report)
+        """
+        model_path = Path(model_path)
+        output_path = Path(output_path) if output_path else model_path.with_suffix('.optimized.onnx')
+        level = self.config.offline_optimization_level
+        
+        start = time.perf_counter()
+        written = optimize_graph(model_path, output_path, level=level,
+                                 save_ort_format=self.config.save_ort_format,
+                                 providers=self.config.execution_providers)
+        optimize_s = time.perf_counter() - start
+        
+        before, after = graph_op_counts(model_path), graph_op_counts(output_path)
+        runtime_level = self.config.graph_optimization_level
+        
+        # Same input for every variant
+        unoptimized = self.create_inference_session(model_path, graph_optimization_level="ORT_DISABLE_ALL")
+        input_data = sample_input(unoptimized, self.config.input_shape)
+        variants = {
+            'unoptimized': unoptimized,
+            'online': self.create_inference_session(model_path),
+            'offline': self.create_inference_session(output_path),
+        }
+        latency = {name: self.benchmark_model(session, input_data, num_runs=num_runs)
+                   for name, session in variants.items()}
+        
+        report = {
+            'model': str(model_path),
+            'optimized_model': [str(path) for path in written],
+            'offline_level': level,
+            'optimize_s': optimize_s,
+            'nodes_before': sum(before.values()),
+            'nodes_after': sum(after.values()),
+            'op_changes': op_count_diff(before, after),
+            'load_ms_online': session_load_ms(model_path, runtime_level, self.config.execution_providers),
+            'load_ms_offline': session_load_ms(output_path, runtime_level, self.config.execution_providers),
+            'latency_ms': {name: stats['mean_latency_ms'] for name, stats in latency.items()},
+            'p95_latency_ms': {name: stats['p95_latency_ms'] for name, stats in latency.items()},
+        }
+        self.benchmark_results[model_path.name] = report
         
-        return optimized_path
+        logger.info(f"Optimized {model_path.name}: {report['nodes_before']} → {report['nodes_after']} nodes, "
+                    f"latency {report['latency_ms']['unoptimized']:.2f} → {report['latency_ms']['offline']:.2f}ms, "
+                    f"session load {report['load_ms_online']:.0f} → {report['load_ms_offline']:.0f}ms")
+        return output_path, report
     
     def create_inference_session(self, 
                                 model_path: Path,
-                                providers: List[str] = None) -> ort.InferenceSession:
+                                providers: List[str] = None,
+                                graph_optimization_level: str = None,
+                                config: OptimizationConfig = None) -> ort.InferenceSession:
         """
         Create optimized ONNX Runtime inference session.
         
         Args:
             model_path: Path to ONNX model
             providers: Execution providers to use
+            graph_optimization_level: Overrides config.graph_optimization_level
+            config: Session settings to use instead of self.config
             
         Returns:
             Configured inference session
         """
+        config = config or self.config
         if providers is None:
-            providers = self.config.execution_providers
+            providers = config.execution_providers
         
         # Session options for optimization
         sess_options = ort.SessionOptions()
         
         # Graph optimization
-        if self.config.graph_optimization_level == "ORT_ENABLE_ALL":
-            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
-        elif self.config.graph_optimization_level == "ORT_ENABLE_EXTENDED":
-            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
-        elif self.config.graph_optimization_level == "ORT_ENABLE_BASIC":
-            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_BASIC
-        else:
-            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        level = graph_optimization_level or config.graph_optimization_level
+        sess_options.graph_optimization_level = GRAPH_OPTIMIZATION_LEVELS.get(
+            level, ort.GraphOptimizationLevel.ORT_DISABLE_ALL)
         
         # Threading configuration
-        sess_options.intra_op_num_threads = self.config.intra_op_num_threads
-        sess_options.inter_op_num_threads = self.config.inter_op_num_threads
+        sess_options.intra_op_num_threads = config.intra_op_num_threads
+        sess_options.inter_op_num_threads = config.inter_op_num_threads
+        sess_options.execution_mode = (ort.ExecutionMode.ORT_PARALLEL if config.execution_mode == "ORT_PARALLEL"
+                                       else ort.ExecutionMode.ORT_SEQUENTIAL)
         
         # Memory optimizations
-        sess_options.enable_cpu_mem_arena = self.config.enable_cpu_mem_arena
-        sess_options.enable_mem_pattern = self.config.enable_mem_pattern
+        sess_options.enable_cpu_mem_arena = config.enable_cpu_mem_arena
+        sess_options.enable_mem_pattern = config.enable_mem_pattern
         
         # Create session
         session = ort.InferenceSession(
@@ -274,7 +359,8 @@ class ONNXModelOptimizer:
                        session: ort.InferenceSession,
                        input_data: np.ndarray,
                        num_runs: int = 100,
-                       warmup_runs: int = 10) -> Dict[str, float]:
+                       warmup_runs: int = 10,
+                       verbose: bool = True) -> Dict[str, float]:
         """
         Benchmark model inference performance.
         
@@ -283,19 +369,22 @@ class ONNXModelOptimizer:
             input_data: Sample input data for benchmarking
             num_runs: Number of benchmark runs
             warmup_runs: Number of warmup runs (not counted)
+            verbose: Log progress and results
             
         Returns:
             Performance statistics
         """
         input_name = session.get_inputs()[0].name
         
+        log = logger.info if verbose else logger.debug
+        
         # Warmup runs
-        logger.info(f"Running {warmup_runs} warmup iterations...")
+        log(f"Running {warmup_runs} warmup iterations...")
         for _ in range(warmup_runs):
             _ = session.run(None, {input_name: input_data})
         
         # Benchmark runs
-        logger.info(f"Running {num_runs} benchmark iterations...")
+        log(f"Running {num_runs} benchmark iterations...")
         times = []
         
         for _ in range(num_runs):
@@ -320,13 +409,335 @@ class ONNXModelOptimizer:
             'meets_target': float(np.mean(times)) <= self.config.target_latency_ms
         }
         
-        logger.info(f"Benchmark Results:")
-        logger.info(f"  Mean latency: {stats['mean_latency_ms']:.2f}ms")
-        logger.info(f"  Mean FPS: {stats['mean_fps']:.1f}")
-        logger.info(f"  Target: {self.config.target_fps} FPS ({self.config.target_latency_ms:.1f}ms)")
-        logger.info(f"  Meets target: {stats['meets_target']}")
+        log(f"Benchmark Results:")
+        log(f"  Mean latency: {stats['mean_latency_ms']:.2f}ms")
+        log(f"  Mean FPS: {stats['mean_fps']:.1f}")
+        log(f"  Target: {self.config.target_fps} FPS ({self.config.target_latency_ms:.1f}ms)")
+        log(f"  Meets target: {stats['meets_target']}")
         
         return stats
+    
+    def export_yolo_variants(self,
+                             weights_path: Path,
+                             input_sizes: List[Tuple[int, int]],
+                             output_dir: Path = None,
+                             dynamic: bool = False) -> Dict[Tuple[int, int], Path]:
+        """
+        Export trained ultralytics YOLOv8 weights at several input sizes.
+        
+        Rectangular sizes (e.g. 352x480 for the 4:3 game canvas) avoid
+        spending compute on letterbox padding; smaller ones trade small-object
+        recall for latency. Frames are letterboxed to the exported size at
+        inference (FramePreprocessor, web_app ONNXYOLODetector).
+        
+        Args:
+            weights_path: ultralytics .pt weights
+            input_sizes: (H, W) pairs, multiples of 32
+            output_dir: Defaults to the weights directory
+            dynamic: Export with dynamic batch / spatial axes
+            
+        Returns:
+            (H, W) → exported model path (<weights>_<W>x<H>.onnx)
+        """
+        try:
+            from ultralytics import YOLO
+        except ImportError as e:
+            raise ImportError("ultralytics is required to export YOLOv8 weights") from e
+        
+        weights_path = Path(weights_path)
+        output_dir = Path(output_dir) if output_dir else weights_path.parent
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        exported = {}
+        for height, width in input_sizes:
+            if height % 32 or width % 32:
+                raise ValueError(f"Input size must be a multiple of 32: {width}x{height}")
+            
+            path = Path(YOLO(str(weights_path)).export(format='onnx', imgsz=(height, width),
+                                                       dynamic=dynamic, simplify=True))
+            target = output_dir / f"{weights_path.stem}_{width}x{height}.onnx"
+            path.replace(target)
+            exported[(height, width)] = target
+            logger.info(f"Exported {weights_path.name} at {width}x{height}: {target}")
+        
+        return exported
+    
+    def compare_input_sizes(self,
+                            variants: List[Tuple[Path, Optional[Tuple[int, int]]]],
+                            dataset_dir: Path = None,
+                            split: str = 'val',
+                            num_images: int = 0,
+                            num_runs: int = 100) -> List[Dict[str, Any]]:
+        """
+        Accuracy vs. latency of detector variants on the labelled game frames.
+        
+        Args:
+            variants: (model path, input (H, W)) pairs; None takes the model's
+                fixed input size. Dynamic-size models can appear several times
+                with different sizes.
+            dataset_dir: YOLO dataset root (default: web_app/game_dataset)
+            split: Evaluation split
+            num_images: Max evaluation frames (0 = all)
+            num_runs: benchmark_model iterations per variant
+            
+        Returns:
+            Per variant: input size, mAP50 / mAP50-95, AP50 and recall (at
+            config.conf_threshold) per class, and latency stats
+        """
+        dataset_dir = Path(dataset_dir) if dataset_dir else GAME_DATASET_DIR
+        map_decoder = YOLOv8Decoder(DecoderConfig(conf_threshold=0.001, iou_threshold=self.config.iou_threshold,
+                                                  max_detections=300))
+        
+        results = []
+        for model_path, input_shape in variants:
+            session = self.create_inference_session(Path(model_path))
+            if input_shape is None:
+                _, input_shape = model_input_shape(model_path)
+            input_shape = tuple(input_shape)
+            
+            samples = load_detection_samples(dataset_dir / 'images' / split, dataset_dir / 'labels' / split,
+                                             input_shape, num_images)
+            ground_truth = [(boxes, classes) for _, boxes, classes in samples]
+            
+            predictions = run_detector(session, samples, map_decoder)
+            result = detection_map(predictions, ground_truth)
+            
+            # Recall at the deployment threshold (same NMS output, low-score boxes dropped)
+            deployed = [(boxes[scores > self.config.conf_threshold], scores[scores > self.config.conf_threshold],
+                         classes[scores > self.config.conf_threshold]) for boxes, scores, classes in predictions]
+            result['recall_per_class'] = class_recall(deployed, ground_truth)
+            
+            stats = self.benchmark_model(session, samples[0][0], num_runs=num_runs, verbose=False)
+            result.update({
+                'model': str(model_path),
+                'input_height': input_shape[0],
+                'input_width': input_shape[1],
+                'mean_latency_ms': stats['mean_latency_ms'],
+                'p50_latency_ms': stats['p50_latency_ms'],
+                'p95_latency_ms': stats['p95_latency_ms'],
+            })
+            results.append(result)
+            
+            logger.info(f"{Path(model_path).name} @ {input_shape[1]}x{input_shape[0]}: "
+                        f"mAP50 {result['map50']:.3f}, {stats['mean_latency_ms']:.2f}ms")
+        
+        return results
+    
+    def sweep_session_configs(self,
+                              model_path: Path,
+                              batch_sizes: List[int] = (1,),
+                              intra_op_threads: List[int] = (1, 2, 4),
+                              inter_op_threads: List[int] = (1, 2),
+                              execution_modes: List[str] = ("ORT_SEQUENTIAL", "ORT_PARALLEL"),
+                              mem_arena: List[bool] = (True, False),
+                              mem_pattern: List[bool] = (True, False),
+                              providers: List[str] = None,
+                              num_runs: int = 50,
+                              warmup_runs: int = 5) -> List[Dict[str, Any]]:
+        """
+        Benchmark one model over a grid of session settings and batch sizes.
+        
+        inter_op_threads only matters in ORT_PARALLEL mode, so sequential
+        configs are measured once with inter_op=1. Each provider is tried on
+        its own (plus CPU fallback). Fixed batch dimensions skip the other
+        batch sizes.
+        
+        Args:
+            model_path: ONNX model
+            batch_sizes: Input batch sizes to try
+            intra_op_threads / inter_op_threads / execution_modes /
+            mem_arena / mem_pattern: Values to sweep
+            providers: Execution providers (default: config.execution_providers)
+            num_runs: benchmark_model iterations per config
+            warmup_runs: Warmup iterations per config
+            
+        Returns:
+            One dict per config: settings, batch size, mean/p50/p95/p99
+            latency, per-item latency and throughput
+        """
+        providers = providers or self.config.execution_providers
+        results = []
+        
+        for provider in providers:
+            provider_list = [provider] if provider == 'CPUExecutionProvider' else [provider, 'CPUExecutionProvider']
+            
+            for mode, intra, inter, arena, pattern in itertools.product(
+                    execution_modes, intra_op_threads, inter_op_threads, mem_arena, mem_pattern):
+                if mode == "ORT_SEQUENTIAL" and inter != min(inter_op_threads):
+                    continue
+                if mode == "ORT_SEQUENTIAL":
+                    inter = 1
+                variant = replace(self.config, execution_providers=provider_list, execution_mode=mode,
+                                  intra_op_num_threads=intra, inter_op_num_threads=inter,
+                                  enable_cpu_mem_arena=arena, enable_mem_pattern=pattern)
+                session = self.create_inference_session(model_path, config=variant)
+                batch_dim = session.get_inputs()[0].shape[0]
+                
+                for batch_size in batch_sizes:
+                    if isinstance(batch_dim, int) and batch_dim > 0 and batch_size != batch_dim:
+                        continue
+                    input_data = np.repeat(sample_input(session, self.config.input_shape)[:1], batch_size, axis=0)
+                    stats = self.benchmark_model(session, input_data, num_runs=num_runs,
+                                                 warmup_runs=warmup_runs, verbose=False)
+                    results.append({
+                        'model': Path(model_path).name,
+                        'provider': provider,
+                        'execution_mode': mode,
+                        'intra_op_num_threads': intra,
+                        'inter_op_num_threads': inter,
+                        'enable_cpu_mem_arena': arena,
+                        'enable_mem_pattern': pattern,
+                        'batch_size': batch_size,
+                        'mean_ms': stats['mean_latency_ms'],
+                        'p50_ms': stats['p50_latency_ms'],
+                        'p95_ms': stats['p95_latency_ms'],
+                        'p99_ms': stats['p99_latency_ms'],
+                        'per_item_ms': stats['mean_latency_ms'] / batch_size,
+                        'items_per_s': 1000.0 * batch_size / stats['mean_latency_ms'],
+                    })
+                
+                del session
+        
+        logger.info(f"Swept {len(results)} session configs for {Path(model_path).name}")
+        return results
+    
+    def quantize_yolo_model(self,
+                            model_path: Path,
+                            output_path: Path = None,
+                            calibration_dir: Path = None) -> Path:
+        """
+        Static INT8 quantization of the YOLO detector, calibrated on game frames.
+        
+        Args:
+            model_path: FP32 YOLO ONNX model
+            output_path: Defaults to <model>.int8.onnx
+            calibration_dir: Calibration frames (default: game_dataset/images/train)
+            
+        Returns:
+            Path to the INT8 model
+        """
+        model_path = Path(model_path)
+        output_path = Path(output_path) if output_path else model_path.with_suffix('.int8.onnx')
+        calibration_dir = Path(calibration_dir) if calibration_dir else GAME_DATASET_DIR / 'images' / 'train'
+        
+        input_name, input_shape = model_input_shape(model_path)
+        reader = GameFrameCalibrationReader(calibration_dir, input_name, input_shape,
+                                            self.config.calibration_images)
+        
+        start = time.perf_counter()
+        quantize_detector_static(model_path, output_path, reader,
+                                 calibration_method=self.config.calibration_method,
+                                 per_channel=self.config.quant_per_channel,
+                                 exclude_detect_head=self.config.quant_exclude_detect_head)
+        
+        logger.info(f"YOLO model quantized to INT8 in {time.perf_counter() - start:.1f}s: {output_path} "
+                    f"({model_path.stat().st_size / 1e6:.1f}MB → {output_path.stat().st_size / 1e6:.1f}MB)")
+        return output_path
+    
+    def quantize_policy_model(self, model_path: Path, output_path: Path = None) -> Path:
+        """
+        Dynamic INT8 quantization of the policy MLP.
+        
+        Args:
+            model_path: FP32 policy ONNX model
+            output_path: Defaults to <model>.int8.onnx
+            
+        Returns:
+            Path to the INT8 model
+        """
+        model_path = Path(model_path)
+        output_path = Path(output_path) if output_path else model_path.with_suffix('.int8.onnx')
+        quantize_policy_dynamic(model_path, output_path)
+        
+        logger.info(f"Policy model quantized to INT8: {output_path}")
+        return output_path
+    
+    def compare_yolo_quantization(self,
+                                  fp32_path: Path,
+                                  int8_path: Path,
+                                  dataset_dir: Path = None,
+                                  split: str = 'val',
+                                  num_images: int = 0,
+                                  num_runs: int = 100) -> Dict[str, Any]:
+        """
+        mAP and latency of the FP32 vs INT8 detector on labelled game frames.
+        
+        Besides mAP against the labels, the INT8 detections are also scored
+        with the FP32 detections as ground truth (fp32_agreement_map50), which
+        isolates the quantization error from the detector's own error.
+        
+        Args:
+            fp32_path: Original model
+            int8_path: Quantized model
+            dataset_dir: YOLO dataset root (default: web_app/game_dataset)
+            split: Evaluation split (not the calibration split)
+            num_images: Max evaluation frames (0 = all)
+            num_runs: benchmark_model iterations per model
+            
+        Returns:
+            Per-model mAP / latency stats, plus deltas and speedup
+        """
+        dataset_dir = Path(dataset_dir) if dataset_dir else GAME_DATASET_DIR
+        _, input_shape = model_input_shape(fp32_path)
+        samples = load_detection_samples(dataset_dir / 'images' / split, dataset_dir / 'labels' / split,
+                                         input_shape, num_images)
+        ground_truth = [(boxes, classes) for _, boxes, classes in samples]
+        
+        # Low threshold / more detections for mAP, as in YOLO validation
+        decoder = YOLOv8Decoder(DecoderConfig(conf_threshold=0.001, iou_threshold=self.config.iou_threshold,
+                                              max_detections=300))
+        
+        results, predictions = {}, {}
+        for name, path in (('fp32', fp32_path), ('int8', int8_path)):
+            session = self.create_inference_session(Path(path))
+            predictions[name] = run_detector(session, samples, decoder)
+            results[name] = detection_map(predictions[name], ground_truth)
+            results[name].update(self.benchmark_model(session, samples[0][0], num_runs=num_runs))
+        
+        reference = [(boxes, classes) for boxes, _, classes in predictions['fp32']]
+        results['fp32_agreement_map50'] = detection_map(predictions['int8'], reference)['map50']
+        results['map50_delta'] = results['int8']['map50'] - results['fp32']['map50']
+        results['map50_95_delta'] = results['int8']['map50_95'] - results['fp32']['map50_95']
+        results['speedup'] = results['fp32']['mean_latency_ms'] / results['int8']['mean_latency_ms']
+        results['eval_images'] = len(samples)
+        
+        logger.info(f"YOLO INT8: mAP50 {results['fp32']['map50']:.3f} → {results['int8']['map50']:.3f} "
+                    f"({results['map50_delta']:+.3f}), {results['speedup']:.2f}x faster")
+        return results
+    
+    def compare_policy_quantization(self,
+                                    fp32_path: Path,
+                                    int8_path: Path,
+                                    states: np.ndarray = None,
+                                    num_runs: int = 1000) -> Dict[str, Any]:
+        """
+        Action agreement and latency of the FP32 vs INT8 policy.
+        
+        Args:
+            fp32_path: Original model
+            int8_path: Quantized model
+            states: (N, state_dim) evaluation states; defaults to 4096 uniform
+                samples of the normalised [0, 1] state space
+            num_runs: benchmark_model iterations per model (batch of 1)
+            
+        Returns:
+            Agreement stats, per-model latency stats and speedup
+        """
+        fp32 = self.create_inference_session(Path(fp32_path))
+        int8 = self.create_inference_session(Path(int8_path))
+        
+        if states is None:
+            state_dim = fp32.get_inputs()[0].shape[1]
+            states = np.random.default_rng(0).random((4096, state_dim), dtype=np.float32)
+        
+        results = policy_agreement(fp32, int8, states)
+        results['fp32'] = self.benchmark_model(fp32, states[:1], num_runs=num_runs)
+        results['int8'] = self.benchmark_model(int8, states[:1], num_runs=num_runs)
+        results['speedup'] = results['fp32']['mean_latency_ms'] / results['int8']['mean_latency_ms']
+        
+        logger.info(f"Policy INT8: action agreement {results['action_agreement']:.1%}, "
+                    f"{results['speedup']:.2f}x faster")
+        return results
 
 
 class RealTimeInferencePipeline:
@@ -363,10 +774,27 @@ class RealTimeInferencePipeline:
         self.policy_input_name = self.policy_session.get_inputs()[0].name
         self.policy_output_name = self.policy_session.get_outputs()[0].name
         
+        # Vectorized YOLOv8 output decoder (thresholds, top-k, class-aware NMS)
+        self.decoder = YOLOv8Decoder(DecoderConfig(
+            conf_threshold=self.config.conf_threshold,
+            iou_threshold=self.config.iou_threshold,
+            class_conf_thresholds=self.config.class_conf_thresholds,
+            pre_nms_topk=self.config.pre_nms_topk,
+            max_detections=self.config.max_detections
+        ))
+        
+        # Reusable input tensor, bound to the YOLO session via IO binding
+        self.preprocessor = FramePreprocessor(self.config.input_shape[2:], self.config.input_shape[1])
+        self._yolo_binding = None
+        self._yolo_output = None
+        
         # Performance tracking
         self.frame_count = 0
         self.total_inference_time = 0.0
         
+        # Previous frame's player y, for the state's vertical speed
+        self._last_player_y = None
+        
         logger.info("Real-time inference pipeline initialized")
     
     def preprocess_frame(self, frame: np.ndarray) -> np.ndarray:
@@ -377,104 +805,87 @@ class RealTimeInferencePipeline:
             frame: Raw game frame (H, W, C)
             
         Returns:
-            Preprocessed tensor (1, C, H, W)
+            Preprocessed tensor (1, C, H, W); a reused buffer that the
+            next call overwrites
         """
-        # Resize to model input size
-        target_h, target_w = self.config.input_shape[2], self.config.input_shape[3]
-        
-        if frame.shape[:2] != (target_h, target_w):
-            import cv2
-            frame = cv2.resize(frame, (target_w, target_h))
-        
-        # Normalize to [0, 1]
-        frame = frame.astype(np.float32) / 255.0
-        
-        # Convert HWC to CHW
-        frame = np.transpose(frame, (2, 0, 1))
-        
-        # Add batch dimension
-        frame = np.expand_dims(frame, axis=0)
+        return self.preprocessor(frame)
+    
+    def _run_yolo(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Run the YOLO session.
         
-        return frame
+        The preprocessor's tensor is bound once through IO binding, together
+        with a preallocated output buffer, so steady-state frames allocate
+        nothing. Any other tensor goes through a regular session.run().
+        """
+        if frame is not self.preprocessor.tensor:
+            return self.yolo_session.run([self.yolo_output_name], {self.yolo_input_name: frame})[0]
+        
+        if self._yolo_binding is None:
+            # First call sizes the output buffer (anchor count may be a dynamic dim)
+            output = self.yolo_session.run([self.yolo_output_name], {self.yolo_input_name: frame})[0]
+            if frame.dtype != np.float32 or output.dtype != np.float32:
+                return output
+            self._yolo_output = np.empty_like(output)
+            binding = self.yolo_session.io_binding()
+            binding.bind_input(self.yolo_input_name, 'cpu', 0, np.float32, frame.shape, frame.ctypes.data)
+            binding.bind_output(self.yolo_output_name, 'cpu', 0, np.float32,
+                                self._yolo_output.shape, self._yolo_output.ctypes.data)
+            self._yolo_binding = binding
+            return output
+        
+        self.yolo_session.run_with_iobinding(self._yolo_binding)
+        return self._yolo_output
     
-    def detect_objects(self, frame: np.ndarray) -> List[Dict]:
+    def detect_objects(self,
+                       frame: np.ndarray,
+                       original_shape: Optional[Tuple[int, int]] = None) -> List[Dict]:
         """
         Run YOLO object detection on frame.
         
         Args:
-            frame: Preprocessed frame tensor
+            frame: Preprocessed frame tensor (1, C, H, W)
+            original_shape: (H, W) of the raw frame; boxes are rescaled to it
+                when given, otherwise they stay in model input pixels
             
         Returns:
             List of detected objects
         """
-        # Run inference
-        outputs = self.yolo_session.run([self.yolo_output_name], {self.yolo_input_name: frame})
-        detections = outputs[0]
-        
-        # Post-process detections (simplified)
-        # In practice, you'd apply NMS and confidence thresholding
-        processed_detections = []
-        
-        # This is a placeholder - actual YOLO output processing would be more complex
-        if len(detections.shape) >= 2 and detections.shape[1] >= 6:
-            for detection in detections[0]:  # Assuming batch size 1
-                if detection[4] > 0.5:  # Confidence threshold
-                    processed_detections.append({
-                        'bbox': detection[:4].tolist(),
-                        'confidence': float(detection[4]),
-                        'class_id': int(detection[5]) if len(detection) > 5 else 0,
-                        'class_name': 'object'
-                    })
-        
-        return processed_detections
+        # Run inference: (1, 4 + num_classes, anchors)
+        output = self._run_yolo(frame)
+        
+        boxes, scores, class_ids = self.decoder.decode(output)
+        
+        scale = (1.0, 1.0)
+        if original_shape is not None:
+            input_h, input_w = frame.shape[2], frame.shape[3]
+            if (input_h, input_w) == self.preprocessor.input_size:
+                # Undo the letterbox: remove padding, then scale to frame pixels
+                sx, sy, left, top = self.preprocessor.geometry(original_shape)
+                boxes = boxes - np.array([left, top, left, top], dtype=boxes.dtype)
+                scale = (1.0 / sx, 1.0 / sy)
+            else:
+                scale = (original_shape[1] / input_w, original_shape[0] / input_h)
+        
+        return self.decoder.to_detections(boxes, scores, class_ids, scale)
     
     def extract_state_vector(self, detections: List[Dict], frame_shape: Tuple[int, int]) -> np.ndarray:
         """
-        Convert detections to structured state vector for policy network.
+        Convert detections to the policy state vector.
+        
+        Uses the web app's canonical encoder (see state_encoding), so the
+        policy sees the same STATE_FEATURES layout it was trained on. The
+        player's vertical speed is estimated from the previous frame.
         
         Args:
             detections: List of detected objects
             frame_shape: Original frame dimensions (H, W)
             
         Returns:
-            State vector as numpy array
-        """
-        # Initialize state vector with default values
-        state = np.zeros(8, dtype=np.float32)
-        
-        # Find player and obstacles
-        player_detection = None
-        obstacle_detections = []
-        
-        for det in detections:
-            if det['class_id'] == 0:  # Player
-                player_detection = det
-            elif det['class_id'] == 1:  # Obstacle
-                obstacle_detections.append(det)
-        
-        if player_detection:
-            bbox = player_detection['bbox']
-            # Normalize coordinates
-            state[0] = (bbox[0] + bbox[2]) / 2 / frame_shape[1]  # player_x
-            state[1] = (bbox[1] + bbox[3]) / 2 / frame_shape[0]  # player_y
-        
-        if obstacle_detections:
-            # Find nearest obstacle
-            nearest_obstacle = min(obstacle_detections, 
-                                 key=lambda x: x['bbox'][0])  # Leftmost obstacle
-            
-            bbox = nearest_obstacle['bbox']
-            state[2] = (bbox[0] + bbox[2]) / 2 / frame_shape[1]  # obstacle_x
-            state[3] = (bbox[1] + bbox[3]) / 2 / frame_shape[0]  # obstacle_y
-            
-            # Calculate distance and time to collision (simplified)
-            if player_detection:
-                dx = state[2] - state[0]
-                state[4] = max(0, dx)  # distance_to_obstacle
-                state[5] = dx / 0.1 if dx > 0 else 0  # time_to_collision (assuming speed)
-        
-        # Add batch dimension
-        return np.expand_dims(state, axis=0)
+            State vector (1, STATE_DIM)
+        """
+        state, self._last_player_y = detections_to_state(detections, frame_shape, self._last_player_y)
+        return state[None]
     
     def predict_action(self, state_vector: np.ndarray) -> Tuple[str, float]:
         """
@@ -517,7 +928,7 @@ class RealTimeInferencePipeline:
         processed_frame = self.preprocess_frame(frame)
         
         # Object detection
-        detections = self.detect_objects(processed_frame)
+        detections = self.detect_objects(processed_frame, frame.shape[:2])
         
         # Extract state vector
         state_vector = self.extract_state_vector(detections, frame.shape[:2])
@@ -0,0 +1,118 @@
+"""
+Allocation-Free Frame Preprocessing
+
+Author: Minsuk Kim (mk4434)
+Purpose: Convert game frames to YOLO input tensors without per-frame
+allocations, so the 60 FPS loop does not churn through a fresh
+(1, 3, H, W) float32 tensor plus resize/astype/transpose temporaries
+on every frame.
+
+The preprocessor owns its buffers:
+- a uint8 resize buffer that cv2.resize writes into (dst=)
+- the float32 NCHW input tensor, written in one fused
+  normalise + HWC→CHW pass
+
+Frames are letterboxed (aspect ratio kept, borders padded with grey 114,
+as in YOLOv8 training) by default, so rectangular and reduced input sizes
+such as 480x352 see undistorted objects. letterbox_geometry() maps boxes
+back to frame pixels.
+
+Use with ONNX Runtime IO binding (see RealTimeInferencePipeline) so the
+session reads the input tensor in place.
+"""
+
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+LETTERBOX_COLOR = 114
+
+
+def letterbox_geometry(frame_shape: Tuple[int, int],
+                       input_size: Tuple[int, int]) -> Tuple[float, int, int, int, int]:
+    """
+    Where a frame lands inside a letterboxed model input.
+
+    Args:
+        frame_shape: Frame (H, W)
+        input_size: Model input (H, W)
+
+    Returns:
+        (ratio, resized W, resized H, left pad, top pad)
+    """
+    ratio = min(input_size[0] / frame_shape[0], input_size[1] / frame_shape[1])
+    new_w, new_h = int(round(frame_shape[1] * ratio)), int(round(frame_shape[0] * ratio))
+    return ratio, new_w, new_h, (input_size[1] - new_w) // 2, (input_size[0] - new_h) // 2
+
+
+class FramePreprocessor:
+    """
+    Reusable frame → tensor converter.
+
+    The returned tensor is an internal buffer that is overwritten by the
+    next call, so use one preprocessor per thread.
+
+    Example:
+        preprocessor = FramePreprocessor((480, 640))
+        tensor = preprocessor(frame)  # (1, 3, 480, 640) float32, same buffer every call
+    """
+
+    def __init__(self, input_size: Tuple[int, int], channels: int = 3, letterbox: bool = True):
+        """
+        Args:
+            input_size: Model input (H, W)
+            channels: Number of colour channels
+            letterbox: Keep the aspect ratio and pad; False stretches the frame
+        """
+        self.input_size = tuple(input_size)
+        self.letterbox = letterbox
+        self.tensor = np.empty((1, channels) + self.input_size, dtype=np.float32)
+        self._resized = np.empty(self.input_size + (channels,), dtype=np.uint8)
+        # Letterbox layout of the last frame size; padding is refilled only when it changes
+        self._frame_shape = None
+        self._layout = None
+
+    def geometry(self, frame_shape: Tuple[int, int]) -> Tuple[float, float, int, int]:
+        """
+        Input → frame mapping for a frame of this size.
+
+        Returns:
+            (x scale, y scale, left pad, top pad): frame = (input - pad) / scale
+        """
+        if not self.letterbox:
+            return (self.input_size[1] / frame_shape[1], self.input_size[0] / frame_shape[0], 0, 0)
+        ratio, _, _, left, top = letterbox_geometry(frame_shape, self.input_size)
+        return ratio, ratio, left, top
+
+    def __call__(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Preprocess one frame.
+
+        Args:
+            frame: Raw game frame (H, W, C) uint8
+
+        Returns:
+            Input tensor (1, C, H, W) in [0, 1]
+        """
+        target_h, target_w = self.input_size
+        target = self.tensor[0]
+
+        if frame.shape[:2] == (target_h, target_w):
+            self._frame_shape = None  # whole tensor overwritten, padding must be refilled next time
+        elif self.letterbox:
+            if frame.shape[:2] != self._frame_shape:
+                _, new_w, new_h, left, top = letterbox_geometry(frame.shape[:2], self.input_size)
+                self._resized = np.empty((new_h, new_w, frame.shape[2]), dtype=np.uint8)
+                self._layout = (new_w, new_h, left, top)
+                self._frame_shape = frame.shape[:2]
+                target.fill(LETTERBOX_COLOR / 255.0)
+            new_w, new_h, left, top = self._layout
+            frame = cv2.resize(frame, (new_w, new_h), dst=self._resized)
+            target = target[:, top:top + new_h, left:left + new_w]
+        else:
+            frame = cv2.resize(frame, (target_w, target_h), dst=self._resized)
+
+        # Normalise and HWC → CHW in one pass, straight into the input tensor
+        np.multiply(frame.transpose(2, 0, 1), 1.0 / 255.0, out=target, casting='unsafe')
+        return self.tensor
@@ -0,0 +1,262 @@
+"""
+INT8 Quantization for CPU Inference
+
+Author: Minsuk Kim (mk4434)
+Purpose: Shrink the detector and policy models to INT8 so the CPU-only
+deployment has headroom inside the 16.7 ms frame budget.
+
+- YOLO detector: static (calibrated) QDQ quantization. Activation ranges
+  come from recorded game frames (web_app/game_dataset/images), letterboxed
+  exactly like the runtime detector input.
+- Policy MLP: dynamic quantization (INT8 weights, activations quantized
+  per call), no calibration data needed.
+
+The YOLOv8 box-decoding tail (DFL softmax/anchor arithmetic and the final
+concat of pixel boxes with [0, 1] class scores) is left in FP32: sharing one
+INT8 scale between values in [0, 640] and [0, 1] would wipe out the scores.
+
+Detector accuracy is measured with evaluation.py; policy_agreement()
+compares the FP32 and INT8 policies, so ONNXModelOptimizer can report
+deltas next to the latency numbers from benchmark_model.
+"""
+
+import logging
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import onnx
+from onnx import numpy_helper
+from onnxruntime.quantization import (CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType,
+                                      quant_pre_process, quantize_dynamic, quantize_static)
+
+from .evaluation import letterbox_image, select_images
+
+logger = logging.getLogger(__name__)
+
+CALIBRATION_METHODS = {
+    "MinMax": CalibrationMethod.MinMax,
+    "Entropy": CalibrationMethod.Entropy,
+    "Percentile": CalibrationMethod.Percentile,
+}
+
+
+class GameFrameCalibrationReader(CalibrationDataReader):
+    """
+    Feeds letterboxed game frames to the ONNX Runtime calibrator.
+
+    Frames are decoded lazily, one per get_next() call, so calibrating on
+    a few hundred 960x720 frames does not hold them all in memory.
+    """
+
+    def __init__(self,
+                 image_dir: Path,
+                 input_name: str,
+                 input_shape: Tuple[int, int],
+                 num_images: int = 200):
+        """
+        Args:
+            image_dir: Directory of calibration frames
+            input_name: Model input tensor name
+            input_shape: Model input (H, W)
+            num_images: Number of frames to use (spread over the directory)
+        """
+        self.input_name = input_name
+        self.input_shape = tuple(input_shape)
+        self.images = select_images(image_dir, num_images)
+        if not self.images:
+            raise FileNotFoundError(f"No calibration images in {image_dir}")
+        self._iterator: Optional[Iterator[Path]] = None
+        self.rewind()
+
+    def __len__(self) -> int:
+        return len(self.images)
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        path = next(self._iterator, None)
+        if path is None:
+            return None
+        tensor, _, _ = letterbox_image(cv2.imread(str(path)), self.input_shape)
+        return {self.input_name: tensor}
+
+    def rewind(self):
+        self._iterator = iter(self.images)
+
+
+def model_input_shape(model_path: Path) -> Tuple[str, Tuple[int, int]]:
+    """Input name and spatial (H, W) of an image model; dynamic dims fall back to 640."""
+    graph_input = onnx.load(str(model_path), load_external_data=False).graph.input[0]
+    dims = graph_input.type.tensor_type.shape.dim
+    spatial = tuple(d.dim_value if d.dim_value > 0 else 640 for d in dims[2:4])
+    return graph_input.name, spatial
+
+
+def detect_head_nodes(model: onnx.ModelProto) -> List[str]:
+    """
+    Names of the non-Conv nodes that produce the graph outputs.
+
+    Walks back from each output until it reaches a Conv; for a YOLOv8 export
+    this is the DFL / anchor decoding and the box + score concat.
+    """
+    producers = {output: node for node in model.graph.node for output in node.output}
+    head, stack, seen = [], [output.name for output in model.graph.output], set()
+    while stack:
+        node = producers.get(stack.pop())
+        if node is None or node.op_type == "Conv" or id(node) in seen:
+            continue
+        seen.add(id(node))
+        if node.name:
+            head.append(node.name)
+        stack.extend(node.input)
+    return head
+
+
+def gemm_to_matmul(model: onnx.ModelProto) -> int:
+    """
+    Rewrite plain Gemm nodes (alpha = beta = 1, no transA) as MatMul + Add.
+
+    torch.onnx exports nn.Linear as Gemm, which ONNX Runtime's dynamic
+    quantizer does not handle; MatMul it does. Transposed constant weights
+    are transposed in place. Returns the number of rewritten nodes.
+    """
+    initializers = {init.name: init for init in model.graph.initializer}
+    rewritten = 0
+    nodes, transposed = [], set()
+    for node in model.graph.node:
+        attrs = {attr.name: onnx.helper.get_attribute_value(attr) for attr in node.attribute}
+        weight = initializers.get(node.input[1]) if node.op_type == "Gemm" else None
+        if (weight is None or attrs.get("transA", 0) or attrs.get("alpha", 1.0) != 1.0
+                or attrs.get("beta", 1.0) != 1.0):
+            nodes.append(node)
+            continue
+
+        if attrs.get("transB", 0) and weight.name not in transposed:
+            transposed.add(weight.name)
+            weight.CopyFrom(numpy_helper.from_array(numpy_helper.to_array(weight).T.copy(), weight.name))
+
+        if len(node.input) > 2 and node.input[2]:
+            matmul_out = f"{node.output[0]}_matmul"
+            nodes.append(onnx.helper.make_node("MatMul", node.input[:2], [matmul_out], name=f"{node.name}_MatMul"))
+            nodes.append(onnx.helper.make_node("Add", [matmul_out, node.input[2]], list(node.output),
+                                               name=f"{node.name}_Add"))
+        else:
+            nodes.append(onnx.helper.make_node("MatMul", node.input[:2], list(node.output), name=f"{node.name}_MatMul"))
+        rewritten += 1
+
+    del model.graph.node[:]
+    model.graph.node.extend(nodes)
+    return rewritten
+
+
+def _preprocess(model_path: Path, output_path: Path) -> Path:
+    """Shape inference + graph cleanup the quantizer expects; falls back to the original model."""
+    try:
+        # ONNX shape inference covers a conv net; symbolic inference is for transformers
+        quant_pre_process(str(model_path), str(output_path), skip_symbolic_shape=True)
+        return output_path
+    except Exception as e:
+        logger.warning(f"Quantization pre-processing failed ({e}), quantizing the model as exported")
+        return model_path
+
+
+def quantize_detector_static(model_path: Path,
+                             output_path: Path,
+                             calibration_reader: CalibrationDataReader,
+                             calibration_method: str = "MinMax",
+                             per_channel: bool = True,
+                             exclude_detect_head: bool = True) -> Path:
+    """
+    Static INT8 (QDQ) quantization of a detector with calibration frames.
+
+    Args:
+        model_path: FP32 ONNX model
+        output_path: Where to write the INT8 model
+        calibration_reader: Source of representative inputs
+        calibration_method: "MinMax", "Entropy" or "Percentile"
+        per_channel: Per-output-channel weight scales (recommended for Conv)
+        exclude_detect_head: Keep the box-decoding tail in FP32
+
+    Returns:
+        Path to the quantized model
+    """
+    model_path, output_path = Path(model_path), Path(output_path)
+    with tempfile.TemporaryDirectory() as tmp:
+        prepared = _preprocess(model_path, Path(tmp) / "prepared.onnx")
+        excluded = detect_head_nodes(onnx.load(str(prepared))) if exclude_detect_head else []
+        logger.info(f"Calibrating on {len(calibration_reader)} frames ({calibration_method}), "
+                    f"{len(excluded)} head nodes kept in FP32")
+
+        quantize_static(
+            str(prepared),
+            str(output_path),
+            calibration_reader,
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=per_channel,
+            calibrate_method=CALIBRATION_METHODS[calibration_method],
+            nodes_to_exclude=excluded,
+        )
+
+    _copy_metadata(model_path, output_path)
+    return output_path
+
+
+def quantize_policy_dynamic(model_path: Path, output_path: Path) -> Path:
+    """
+    Dynamic INT8 quantization of an MLP policy (MatMul weights).
+
+    Args:
+        model_path: FP32 ONNX model
+        output_path: Where to write the INT8 model
+
+    Returns:
+        Path to the quantized model
+    """
+    model_path, output_path = Path(model_path), Path(output_path)
+    with tempfile.TemporaryDirectory() as tmp:
+        model = onnx.load(str(model_path))
+        rewritten = gemm_to_matmul(model)
+        prepared = Path(tmp) / "matmul.onnx"
+        onnx.save(model, str(prepared))
+        logger.info(f"Dynamic quantization: {rewritten} Gemm nodes rewritten as MatMul")
+
+        quantize_dynamic(str(prepared), str(output_path), weight_type=QuantType.QInt8,
+                         op_types_to_quantize=["MatMul"])
+
+    _copy_metadata(model_path, output_path)
+    return output_path
+
+
+def _copy_metadata(source: Path, target: Path):
+    """Keep export metadata (class names, imgsz) on the quantized model."""
+    metadata = {prop.key: prop.value for prop in onnx.load(str(source), load_external_data=False).metadata_props}
+    if not metadata:
+        return
+    model = onnx.load(str(target))
+    existing = {prop.key for prop in model.metadata_props}
+    for key, value in metadata.items():
+        if key not in existing:
+            model.metadata_props.add(key=key, value=value)
+    onnx.save(model, str(target))
+
+
+def policy_agreement(reference, candidate, states: np.ndarray) -> Dict[str, float]:
+    """
+    Compare two policy sessions on the same states.
+
+    Returns:
+        Fraction of states with the same argmax action, and mean / max
+        absolute difference of the outputs
+    """
+    input_name = reference.get_inputs()[0].name
+    expected = reference.run(None, {input_name: states})[0]
+    actual = candidate.run(None, {candidate.get_inputs()[0].name: states})[0]
+    diff = np.abs(expected - actual)
+    return {
+        "action_agreement": float((expected.argmax(-1) == actual.argmax(-1)).mean()),
+        "mean_abs_diff": float(diff.mean()),
+        "max_abs_diff": float(diff.max()),
+    }
@@ -0,0 +1,62 @@
+"""
+Detection → Policy State Encoding
+
+Author: Minsuk Kim (mk4434)
+Purpose: Build the policy input from YOLO detections with the same
+canonical encoder the web app uses for live inference and training
+export (web_app/vision_agent_shared/state_encoder.py), so a policy
+trained on recorded games sees identically laid-out states when it runs
+from pixels.
+
+Detections carry no velocity; the caller passes the previous frame's
+player y and the vertical speed is estimated from the difference.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from vision_agent_shared import state_encoder
+from vision_agent_shared.yolo_decoder import YOLOV8_CLASS_NAMES
+
+STATE_DIM = state_encoder.STATE_DIM
+STATE_FEATURES = state_encoder.STATE_FEATURES
+
+PLAYER_CLASS = YOLOV8_CLASS_NAMES.index("player")
+# Detector class id → encoder type code (meteor / star; lava is not part of the state)
+OBSTACLE_CLASSES = {class_id: state_encoder.TYPE_CODES[name]
+                    for class_id, name in enumerate(YOLOV8_CLASS_NAMES) if name in state_encoder.TYPE_CODES}
+
+
+def detections_to_state(detections: List[Dict],
+                        frame_shape: Tuple[int, int],
+                        prev_player_y: Optional[float] = None) -> Tuple[np.ndarray, Optional[float]]:
+    """
+    Encode one frame's detections.
+
+    Args:
+        detections: Dicts with 'class_id' and 'bbox' (x1, y1, x2, y2) in frame pixels
+        frame_shape: Frame (H, W)
+        prev_player_y: Player top y on the previous frame (None → vy 0)
+
+    Returns:
+        (STATE_DIM,) float32 state and this frame's player top y (None if no player)
+    """
+    height, width = frame_shape[:2]
+    players = [det for det in detections if det['class_id'] == PLAYER_CLASS]
+    obstacles = [det for det in detections if det['class_id'] in OBSTACLE_CLASSES]
+
+    if players:
+        x1, y1, x2, _ = max(players, key=lambda det: det.get('confidence', 0.0))['bbox']
+        player_x, player_y, player_size = float(x1), float(y1), float(x2 - x1)
+    else:
+        player_x, player_y, player_size = width / 2, height - state_encoder.PLAYER_SIZE, state_encoder.PLAYER_SIZE
+    player_vy = player_y - prev_player_y if players and prev_player_y is not None else 0.0
+
+    boxes = np.array([det['bbox'] for det in obstacles], dtype=np.float64).reshape(-1, 4)
+    types = np.array([OBSTACLE_CLASSES[det['class_id']] for det in obstacles],
+                     dtype=np.int8)
+    state = state_encoder.encode_state(player_x, player_y, player_vy,
+                                       (boxes[:, 0] + boxes[:, 2]) / 2, (boxes[:, 1] + boxes[:, 3]) / 2, types,
+                                       width=width, height=height, player_size=player_size)
+    return state, (player_y if players else None)
@@ -4,7 +4,7 @@
 """
 
 from flask import Flask, render_template, jsonify
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room, leave_room, close_room
 import time
 import random
 import threading
@@ -22,11 +22,31 @@ load_dotenv()
 from storage_manager import get_storage_manager
 
 # CV Module for Vision-based Lava Detection
-from modules.cv_module import ComputerVisionModule
+from modules.cv_module import ComputerVisionModule, default_batch_size, get_detection_batcher_stats
+from modules.model_registry import get_model_registry
+from modules.inference_worker import get_inference_worker
+
+# 다중 게임 배치 물리 엔진 (플레이어/장애물 공유 NumPy 배열)
+from modules.batch_physics import BatchPhysicsEngine, ObstacleView
+
+# 델타 압축 상태 프로토콜 (game_update 대역폭 절감)
+from modules.state_protocol import StateDeltaEncoder, PROTOCOL_VERSION, encode_binary_state
 
 # AI Module for Difficulty Levels
 from modules.ai_module import AILevelManager
 
+# 정책 입력 상태 벡터 (학습 데이터 내보내기와 실시간 추론이 같은 인코더 사용)
+from vision_agent_shared.state_encoder import STATE_DIM, encode_state_dicts
+
+# AI 게임 전체의 정책 추론을 틱마다 배치 forward 한 번으로
+from modules.policy_server import create_policy_server
+
+# 공유 틱 스케줄러 (세션별 스레드 대신)
+from modules.tick_scheduler import TickScheduler
+
+# 서버 시작 시 모델 워밍업 (readiness: /api/ready)
+from modules.warmup import ModelWarmup
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'game-secret'
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
@@ -36,12 +56,25 @@ WIDTH = 960
 HEIGHT = 720
 PLAYER_SIZE = 50
 OBSTACLE_SIZE = 50
+FPS = 30
+TICK_SHARDS = int(os.getenv('TICK_SHARDS', '1'))  # 스케줄러 샤드(스레드) 수
+POLICY_DEADLINE_MS = float(os.getenv('POLICY_DEADLINE_MS', '5'))  # 게임이 정책 결과를 기다리는 최대 시간
+# 다른 샤드의 요청을 기다리는 시간 (샤드가 하나면 한 번의 제출이 곧 전체 배치)
+POLICY_BATCH_WAIT_MS = float(os.getenv('POLICY_BATCH_WAIT_MS', '0' if TICK_SHARDS == 1 else '1'))
+KEYFRAME_INTERVAL = int(os.getenv('STATE_KEYFRAME_INTERVAL', '30'))  # 델타 프로토콜 키프레임 주기 (틱)
+CV_DETECT_INTERVAL = int(os.getenv('CV_DETECT_INTERVAL', '30'))  # 라바 CV 감지 주기 (틱, 0이면 용암 상태 변화 시에만)
+# 실제 프레임 탐지: 클라이언트가 보내는 캔버스 캡처(frame_capture, 10프레임마다)를 YOLO로 탐지
+# (모델이 로드됐을 때만). 이 경로만 추적기(CV_DETECT_EVERY)와 ROI 탐지(CV_ROI_MODE)를 거친다 -
+# 끄면 라바 감지는 게임 상태 기반 시뮬레이션 탐지만 사용.
+CV_LIVE_FRAMES = os.getenv('CV_LIVE_FRAMES', '0') == '1'
 
 # AI 난이도 레벨 관리자 초기화
 # 모델 경로 (환경 변수 또는 기본 경로)
 project_root = Path(__file__).parent.parent
 ppo_model_path = os.getenv('PPO_MODEL_PATH', str(project_root / 'web_app' / 'models' / 'rl' / 'ppo_agent.pt'))
 dqn_model_path = os.getenv('DQN_MODEL_PATH', str(project_root / 'web_app' / 'models' / 'rl' / 'dqn_agent.pt'))
+# 지원님이 훈련한 YOLO 모델 (가중치는 프로세스 전역 레지스트리에서 공유)
+yolo_model_path = os.getenv('YOLO_MODEL_PATH', str(project_root / 'AI_model' / 'best_112217.pt'))
 
 # AI Level Manager 생성
 ai_level_manager = AILevelManager(
@@ -49,6 +82,16 @@ ai_level_manager = AILevelManager(
     dqn_model_path=dqn_model_path if Path(dqn_model_path).exists() else None
 )
 
+# 배치 정책 서버 (정책 모델이 없으면 None → Level 3/4는 휴리스틱 폴백)
+policy_server = create_policy_server(
+    ai_level_manager.strategies,
+    onnx_model_path=os.getenv('POLICY_ONNX_PATH', str(project_root / 'web_app' / 'models' / 'rl' / 'policy.onnx')),
+    expected_state_dim=STATE_DIM,  # encode_game_state()
+    max_wait_ms=POLICY_BATCH_WAIT_MS,
+    inline=TICK_SHARDS == 1,  # 제출 스레드가 하나면 배치 스레드를 거칠 필요 없음
+    deadline_ms=POLICY_DEADLINE_MS,
+)
+
 print("🤖 AI 난이도 레벨 시스템 초기화")
 print(f"   - Level 1: Easy (간단한 휴리스틱)")
 print(f"   - Level 2: Medium (고급 휴리스틱)")
@@ -95,9 +138,16 @@ DATA_DIR.mkdir(exist_ok=True)
 GAMEPLAY_DIR.mkdir(parents=True, exist_ok=True)
 COLLECTED_DIR.mkdir(exist_ok=True)
 
+# CV 감지 입력 프레임 (모든 게임이 공유하는 읽기 전용 버퍼 - 틱마다 2MB 할당 방지)
+CV_FRAME_BUFFER = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+CV_FRAME_BUFFER.flags.writeable = False
+
 # 활성 게임들
 games = {}
 
+# AI 게임 관전자: 대상 sid → 관전자 sid 집합 (opt-in 관전 룸)
+spectators = {}
+
 # Storage Manager 초기화
 storage = get_storage_manager()
 
@@ -161,6 +211,10 @@ def save_training_data(game, session_metadata):
         for state_record in game.collected_states:
             f.write(json.dumps(state_record, ensure_ascii=False) + '\n')
     
+    # 정책 입력 벡터 (N, STATE_DIM) - 실시간 추론과 같은 인코더 (행 순서 = states_actions.jsonl)
+    state_vectors_file = session_dir / "state_vectors.npy"
+    np.save(state_vectors_file, encode_state_dicts([record['state'] for record in game.collected_states]))
+    
     # Bounding Box 라벨 저장 (JSONL 포맷 - 제이용)
     bboxes_file = session_dir / "bboxes.jsonl"
     with open(bboxes_file, 'w', encoding='utf-8') as f:
@@ -195,6 +249,7 @@ def save_training_data(game, session_metadata):
     print(f"📊 훈련 데이터 저장:")
     print(f"   - 디렉토리: {session_dir.name}")
     print(f"   - State-Action 로그: {len(game.collected_states)}개")
+    print(f"   - 상태 벡터: {state_vectors_file.name} ({len(game.collected_states)}, {STATE_DIM})")
     print(f"   - Bbox 라벨: {len(game.collected_states)}개")
     
     # 3. YOLO 데이터셋으로 내보내기 (추가된 기능)
@@ -217,27 +272,79 @@ def save_training_data(game, session_metadata):
     
     return str(session_dir)
 
+def create_physics_engine():
+    """게임 설정으로 배치 물리 엔진 생성"""
+    return BatchPhysicsEngine(
+        width=WIDTH,
+        height=HEIGHT,
+        player_size=PLAYER_SIZE,
+        gravity=1,
+        lava_damage=LAVA_CONFIG['damage_per_frame']
+    )
+
+def _physics_field(name):
+    """배치 엔진 배열에 저장되는 플레이어 필드 (Game 속성처럼 사용)"""
+    def getter(self):
+        return int(getattr(self.physics, name)[self.slot])
+    
+    def setter(self, value):
+        getattr(self.physics, name)[self.slot] = value
+    
+    return property(getter, setter)
+
 class Game:
-    def __init__(self, sid):
+    # 플레이어 상태는 배치 물리 엔진의 슬롯에 저장
+    player_x = _physics_field('player_x')
+    player_y = _physics_field('player_y')
+    player_vy = _physics_field('player_vy')
+    player_health = _physics_field('player_health')  # 용암 데미지용 체력
+    
+    def __init__(self, sid, physics=None):
         self.sid = sid
         # CV 모듈 초기화 (Vision 기반 라바 감지용)
-        # 지원님이 훈련한 YOLO 모델 사용
-        # 프로젝트 루트 기준 경로
-        project_root = Path(__file__).parent.parent
-        yolo_model_path = os.getenv('YOLO_MODEL_PATH', str(project_root / 'AI_model' / 'best_112217.pt'))
-        self.cv_module = ComputerVisionModule(model_path=yolo_model_path)
+        # 지원님이 훈련한 YOLO 모델 사용 (가중치는 프로세스 전역 레지스트리에서 공유)
+        # 추적 모드(CV_DETECT_EVERY > 1)의 새 트랙 초기 속도 = 낙하 속도 (YOLO 클래스 1: meteor, 2: star)
+        self.cv_module = ComputerVisionModule(model_path=yolo_model_path, track_velocity={
+            1: (0, OBJECT_TYPES['meteor']['vy']),
+            2: (0, OBJECT_TYPES['star']['vy']),
+        })
+        
+        # 비동기 CV 추론 워커 (틱 루프는 제출만 하고 최신 결과를 읽음)
+        self.cv_worker = get_inference_worker()
+        # 실제 프레임 탐지 사용 여부 (CV_LIVE_FRAMES + 실제 탐지기 로드됨)
+        self.cv_live = CV_LIVE_FRAMES and self.cv_module.backend != 'simulation'
         
-        # AI 난이도 레벨 (기본값: 1)
+        # AI 난이도 레벨 (기본값: 1)과 공유 전략 핸들 (start_game에서 결정)
         self.ai_level = 1
+        self.ai_strategy = ai_level_manager.get_strategy(self.ai_level)
+        
+        # 배치 물리 엔진 슬롯 (엔진을 안 주면 단독 엔진 사용 - 스크립트/테스트용)
+        self.physics = physics if physics is not None else create_physics_engine()
+        self.slot = self.physics.allocate_slot()
+        self.step_result = None  # prepare_tick()에서 배치 스텝 결과를 받음
+        
+        # 장애물 뷰 (메테오와 별, 엔진의 공유 NumPy 컬럼 중 이 게임 몫)
+        self.obstacle_store = ObstacleView(self.physics, self.slot)
+        
+        # 상태 전송 프로토콜 (connect 시 협상: 'json', 'delta', 'binary')
+        self.protocol = 'json'
+        self.state_encoder = None  # 'delta'일 때만 사용
         
         self.reset()
+    
+    def close(self):
+        """엔진 슬롯 + 추론 요청 + 공유 모델 참조 반환 (disconnect 시 호출)"""
+        self.physics.release_slot(self.slot)
+        self.cv_worker.discard(self.sid)
+        self.cv_module.close()
         
     def reset(self):
         """게임 상태 초기화"""
         self.player_x = WIDTH // 2
         self.player_y = HEIGHT // 2
         self.player_vy = 0
-        self.obstacles = []  # 메테오와 별을 포함
+        self.obstacle_store.clear()  # 메테오와 별을 포함
+        self.next_obstacle_id = 0  # 장애물 ID (델타 프로토콜용)
         self.score = 0
         self.running = False
         self.mode = "human"
@@ -260,20 +367,37 @@ class Game:
         self.lava_phase_timer = 0  # 현재 단계 타이머
         self.lava_zone_x = 0  # 용암이 나올 X 위치 (CV 감지 결과로 업데이트됨)
         self.player_health = 100  # 플레이어 체력 (용암 데미지용)
+        self.physics.set_lava_zone(self.slot, None)
         
         # CV 감지 결과 저장 (라바 감지용)
         self.detected_lava = None  # CVDetectionResult 또는 None
+        self.cv_cache_key = None  # 마지막 감지 시점의 (lava_state, lava_zone_x)
+        self.cv_last_frame = -CV_DETECT_INTERVAL  # 마지막 감지 프레임
+        self.cv_result_frame = -1  # 마지막으로 반영한 추론 결과의 프레임
+        self.cv_staleness = None  # 반영된 추론 결과가 몇 프레임 전 것인지
+        self.cv_log_frame = -30  # 마지막 라바 감지 로그 프레임 (로그 제한)
+        self.cv_worker.discard(self.sid)  # 이전 게임의 대기/진행 중 요청 무효화
         
     def update(self):
-        """물리 업데이트"""
+        """물리 업데이트 (이 게임만 단독 스텝)"""
         if self.game_over:
             return
         
+        self.begin_update()
+        self.finish_update(self.physics.step([self.slot]))
+    
+    def begin_update(self):
+        """
+        물리 스텝 전 단계: 업데이트 전 상태 저장
+        
+        배치 모드에서는 prepare_tick()이 샤드의 모든 게임에 대해 호출한 뒤
+        엔진을 한 번만 스텝한다.
+        """
         # 이벤트 플래그 초기화
         self.star_collected = False
         
         # 📊 현재 상태 저장 (업데이트 전)
-        current_state = {
+        self._pre_state = {
             'player_x': self.player_x,
             'player_y': self.player_y,
             'player_vy': self.player_vy,
@@ -285,35 +409,22 @@ class Game:
                 'zone_width': LAVA_CONFIG['zone_width']
             }
         }
+    
+    def finish_update(self, result):
+        """
+        물리 스텝 후 단계: 엔진 결과(중력/장애물 이동/충돌/용암 데미지) 반영
         
-        # 중력
-        self.player_vy += 1
-        self.player_y += self.player_vy
-        
-        # 바닥 충돌
-        if self.player_y >= HEIGHT - PLAYER_SIZE:
-            self.player_y = HEIGHT - PLAYER_SIZE
-            self.player_vy = 0
+        Args:
+            result: BatchPhysicsEngine.step() 결과 (슬롯 인덱스 기준 배열)
+        """
+        slot = self.slot
         
-        # 장애물 이동 (대각선)
-        for obs in self.obstacles:
-            obs['x'] += obs.get('vx', 0)  # 좌우 이동
-            obs['y'] += obs.get('vy', 5)  # 하강
-            
-            # 화면 밖으로 나가면 반대편에서 등장 (좌우 wrap)
-            if obs['x'] < -obs.get('size', OBSTACLE_SIZE):
-                obs['x'] = WIDTH
-            elif obs['x'] > WIDTH:
-                obs['x'] = -obs.get('size', OBSTACLE_SIZE)
-        
-        # 화면 밖 장애물 제거 + 점수 증가
-        before_count = len(self.obstacles)
-        self.obstacles = [o for o in self.obstacles if o['y'] < HEIGHT]
-        cleared = before_count - len(self.obstacles)
+        # 화면 밖 장애물 제거 → 점수 증가
+        cleared = int(result.cleared[slot])
         self.score += cleared
         
-        # 충돌 검사
-        self.check_collisions()
+        # 충돌 결과
+        self.apply_collisions(bool(result.meteor_hit[slot]), int(result.stars[slot]))
         
         # 📊 보상 계산
         reward = 1.0  # 생존 기본 보상
@@ -326,12 +437,12 @@ class Game:
         if self.game_over:
             reward = OBJECT_TYPES['meteor']['reward']  # -100
         
-        # 별 획득 보상은 check_collisions()에서 별도 처리
+        # 별 획득 보상은 apply_collisions()에서 별도 처리
         
         # 📊 State-Action-Reward 저장 (클로 훈련용)
         self.collected_states.append({
             'frame': self.frame,
-            'state': current_state,
+            'state': self._pre_state,
             'action': self.last_action,
             'reward': reward,
             'done': self.game_over
@@ -343,27 +454,37 @@ class Game:
             obj_type = 'star' if random.random() < 0.1 else 'meteor'
             obj_config = OBJECT_TYPES[obj_type]
             
-            self.obstacles.append({
-                'type': obj_type,
-                'x': random.randint(0, WIDTH - obj_config['size']),
-                'y': -obj_config['size'],
-                'vx': random.randint(-2, 2),  # 대각선 이동
-                'vy': obj_config['vy'],
-                'size': obj_config['size']
-            })
+            self.obstacle_store.spawn(
+                obj_id=self.next_obstacle_id,
+                obj_type=obj_type,
+                x=random.randint(0, WIDTH - obj_config['size']),
+                y=-obj_config['size'],
+                vx=random.randint(-2, 2),  # 대각선 이동
+                vy=obj_config['vy'],
+                size=obj_config['size']
+            )
+            self.next_obstacle_id += 1
         
         # 🌋 용암지대 업데이트 (하드코딩된 로직으로 상태 관리)
         if LAVA_CONFIG['enabled']:
-            self.update_lava()
+            self.update_lava(bool(result.lava_dead[slot]))
         
         # 🔍 Vision 기반 라바 감지 (YOLO로 감지하여 "Vision 기반 인식" 강조)
         self.detect_lava_with_cv()
         
+        # 다음 스텝의 용암 데미지 영역 (최신 CV 감지 결과 반영)
+        self.sync_lava_zone()
+        
         self.frame += 1
     
-    def update_lava(self):
-        """🌋 용암지대 업데이트 (특정 영역만) - 하드코딩된 로직으로 상태 관리"""
-        dt = 1.0 / 30.0  # 30 FPS 기준
+    def update_lava(self, lava_dead=False):
+        """
+        🌋 용암지대 업데이트 (특정 영역만) - 하드코딩된 로직으로 상태 관리
+        
+        데미지 자체는 배치 물리 엔진이 sync_lava_zone()으로 설정된 영역에 적용하고,
+        여기서는 단계 타이머와 체력 소진(lava_dead) 처리만 한다.
+        """
+        dt = 1.0 / FPS  # 30 FPS 기준
         
         if self.lava_state == 'inactive':
             # 용암 대기 중
@@ -389,31 +510,9 @@ class Game:
             # 용암 활성 단계
             self.lava_phase_timer -= dt
             
-            # Vision 기반 라바 감지 결과 사용 (CV 모듈에서 감지된 라바 위치)
-            # CV 감지 결과가 있으면 우선 사용, 없으면 하드코딩된 위치 사용
-            if self.detected_lava is not None:
-                # CV 감지 결과에서 라바 위치 추출
-                lava_bbox = self.detected_lava.bbox
-                lava_x_start = int(lava_bbox[0])
-                lava_x_end = int(lava_bbox[2])
-                lava_y_start = int(lava_bbox[1])
-            else:
-                # 폴백: 하드코딩된 위치 사용
-                lava_y_start = HEIGHT - LAVA_CONFIG['height']
-                lava_x_start = self.lava_zone_x
-                lava_x_end = self.lava_zone_x + LAVA_CONFIG['zone_width']
-            
-            # 플레이어가 용암 영역 안에 있고, Y 좌표도 용암 영역 안이면 데미지
-            player_in_zone_x = (self.player_x + PLAYER_SIZE > lava_x_start and 
-                                self.player_x < lava_x_end)
-            player_in_zone_y = self.player_y + PLAYER_SIZE > lava_y_start
-            
-            if player_in_zone_x and player_in_zone_y:
-                # 용암 데미지
-                self.player_health -= LAVA_CONFIG['damage_per_frame']
-                if self.player_health <= 0:
-                    self.game_over = True
-                    print("🔥 용암에 빠져 게임 오버! (Vision 기반 감지)")
+            if lava_dead:
+                self.game_over = True
+                print("🔥 용암에 빠져 게임 오버! (Vision 기반 감지)")
             
             if self.lava_phase_timer <= 0:
                 # 용암 비활성화, 다음 주기로
@@ -423,6 +522,28 @@ class Game:
                 self.detected_lava = None  # CV 감지 결과 초기화
                 print("✅ 용암 종료")
     
+    def sync_lava_zone(self):
+        """용암 데미지 영역을 물리 엔진에 설정 (활성 단계에서만)"""
+        if self.lava_state != 'active':
+            self.physics.set_lava_zone(self.slot, None)
+            return
+        
+        # Vision 기반 라바 감지 결과 사용 (CV 모듈에서 감지된 라바 위치)
+        # CV 감지 결과가 있으면 우선 사용, 없으면 하드코딩된 위치 사용
+        if self.detected_lava is not None:
+            # CV 감지 결과에서 라바 위치 추출
+            lava_bbox = self.detected_lava.bbox
+            lava_x_start = int(lava_bbox[0])
+            lava_x_end = int(lava_bbox[2])
+            lava_y_start = int(lava_bbox[1])
+        else:
+            # 폴백: 하드코딩된 위치 사용
+            lava_y_start = HEIGHT - LAVA_CONFIG['height']
+            lava_x_start = self.lava_zone_x
+            lava_x_end = self.lava_zone_x + LAVA_CONFIG['zone_width']
+        
+        self.physics.set_lava_zone(self.slot, (lava_x_start, lava_x_end, lava_y_start))
+    
     def detect_lava_with_cv(self):
         """
         🔍 Vision 기반 라바 감지 (YOLO 사용)
@@ -430,62 +551,111 @@ class Game:
         Note: 라바는 바닥에 고정되어 있지만, YOLO로 감지하면 
         "Vision 기반 인식"이라는 점을 더 강조할 수 있습니다.
         
-        성능 최적화: YOLO 추론은 5프레임마다 한 번씩만 실행
+        탐지 입력:
+        - 기본: 게임 상태 기반 시뮬레이션 탐지 (추적기/ROI 탐지는 쓰지 않음)
+        - cv_live: 클라이언트 캔버스 캡처를 실제 YOLO로 탐지 (on_frame_capture →
+          submit_frame_image, 게임 프레임 번호 기준으로 추적기/ROI 탐지 적용)
+        
+        성능 최적화:
+        - 추론은 CVInferenceWorker에서 비동기로 실행 (틱은 블로킹하지 않음)
+        - 세션당 최신 프레임만 처리하고, 지난 요청은 버림
+        - 감지 결과는 캐시하고 (lava_state, lava_zone_x)가 바뀔 때만 즉시 재요청
+        - 그 외에는 CV_DETECT_INTERVAL 틱마다 한 번만 갱신 (0이면 갱신 안 함)
+        - 입력 프레임은 공유 버퍼 재사용, 게임 상태는 감지에 필요한 부분만 전달
         """
-        try:
-            # 게임 상태를 CV 모듈에 전달
-            game_state = self.get_state()
+        cache_key = (self.lava_state, self.lava_zone_x)
+        due = CV_DETECT_INTERVAL > 0 and self.frame - self.cv_last_frame >= CV_DETECT_INTERVAL
+        if not self.cv_live and (cache_key != self.cv_cache_key or due):
+            self.cv_cache_key = cache_key
+            self.cv_last_frame = self.frame
             
-            # 더미 프레임 생성 (실제 YOLO 구현 시 실제 프레임 사용)
-            # 프레임 크기는 게임 화면 크기와 일치
-            dummy_frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+            # 감지에 필요한 상태만 전달 (전체 get_state()는 장애물 dict까지 만듦)
+            game_state = {
+                'player': {
+                    'x': self.player_x,
+                    'y': self.player_y,
+                    'size': PLAYER_SIZE
+                },
+                'lava': {
+                    'state': self.lava_state,
+                    'height': LAVA_CONFIG['height'],
+                    'zone_x': self.lava_zone_x,
+                    'zone_width': LAVA_CONFIG['zone_width']
+                }
+            }
             
             # CV 모듈로 객체 탐지 (게임 상태 포함)
             # 게임 상태가 있으면 시뮬레이션 모드로 자동 전환 (더 빠름)
-            # 더미 프레임을 YOLO에 전달하는 것은 의미 없으므로
-            detections = self.cv_module.detect_objects(dummy_frame, game_state)
-            
-            # 라바 감지 결과 찾기
-            self.detected_lava = None
-            for detection in detections:
-                if detection.class_id == 4 or detection.class_name == "Lava":
-                    self.detected_lava = detection
-                    # 디버깅: 라바 감지 로그 (너무 자주 출력하지 않도록)
-                    if self.frame % 30 == 0:  # 1초마다 한 번
-                        print(f"🔍 [Vision] 라바 감지: bbox={detection.bbox}, confidence={detection.confidence:.2f}")
-                    break
-            
-        except Exception as e:
-            # 오류 발생 시 폴백 (하드코딩된 로직 사용)
-            print(f"⚠️ CV 라바 감지 오류: {e}, 하드코딩된 로직 사용")
+            # 실제 렌더링 프레임이 없으므로 공유 빈 프레임 사용 (크기만 의미 있음)
+            self.cv_worker.submit(self.sid, self.cv_module.detect_objects, CV_FRAME_BUFFER,
+                                  frame_index=self.frame, game_state=game_state, tag=cache_key)
+        
+        # 완료된 최신 결과 반영 (블로킹 없음)
+        result = self.cv_worker.latest(self.sid)
+        if result is None:
+            return
+        self.cv_staleness = result.staleness(self.frame)
+        if result.frame_index == self.cv_result_frame:
+            return
+        self.cv_result_frame = result.frame_index
+        
+        # 용암 상태가 이미 바뀐 뒤 도착한 결과는 버림 (하드코딩된 위치로 폴백)
+        if result.tag != cache_key:
             self.detected_lava = None
+            return
+        
+        # 라바 감지 결과 찾기
+        self.detected_lava = None
+        for detection in result.detections:
+            if detection.class_id == 4 or detection.class_name == "Lava":
+                self.detected_lava = detection
+                # 디버깅: 라바 감지 로그 (너무 자주 출력하지 않도록 30프레임 = 1초에 한 번)
+                if self.frame - self.cv_log_frame >= 30:
+                    self.cv_log_frame = self.frame
+                    print(f"🔍 [Vision] 라바 감지: bbox={detection.bbox}, confidence={detection.confidence:.2f} "
+                          f"({self.cv_staleness}프레임 전)")
+                break
     
-    def check_collisions(self):
-        """충돌 검사 (AABB) - 메테오 vs 별"""
-        for obs in self.obstacles[:]:  # 복사본으로 순회 (리스트 수정 가능)
-            obj_size = obs.get('size', OBSTACLE_SIZE)
-            
-            # AABB (Axis-Aligned Bounding Box) 충돌 감지
-            if (self.player_x < obs['x'] + obj_size and
-                self.player_x + PLAYER_SIZE > obs['x'] and
-                self.player_y < obs['y'] + obj_size and
-                self.player_y + PLAYER_SIZE > obs['y']):
-                
-                obj_type = obs.get('type', 'meteor')
-                
-                if obj_type == 'meteor':
-                    # 메테오 충돌: 게임 오버
-                    self.game_over = True
-                    self.running = False
-                    print(f"💥 메테오 충돌! 게임 오버! 점수: {self.score}, 생존 시간: {time.time() - self.start_time:.1f}초")
-                    
-                elif obj_type == 'star':
-                    # 별 획득: 점수 증가
-                    star_score = OBJECT_TYPES['star']['score']
-                    self.score += star_score
-                    self.obstacles.remove(obs)
-                    self.star_collected = True  # 별 획득 플래그 설정
-                    print(f"⭐ 별 획득! +{star_score}점 (총 {self.score}점)")
+    def submit_frame_image(self, image_bytes, frame_number):
+        """
+        클라이언트 캔버스 캡처 (PNG) → 실제 YOLO 탐지 요청 (cv_live일 때만)
+        
+        디코딩도 추론 워커에서 (소켓 핸들러를 막지 않도록). 결과 태그는 지금의
+        (lava_state, lava_zone_x) - detect_lava_with_cv가 시뮬레이션 결과와 같은 방식으로 반영.
+        """
+        if not self.cv_live:
+            return
+        self.cv_worker.submit(self.sid, self._detect_frame_image, image_bytes,
+                              frame_index=frame_number, tag=(self.lava_state, self.lava_zone_x))
+    
+    def _detect_frame_image(self, image_bytes, game_state=None, frame_index=None):
+        """PNG 바이트 → BGR 프레임 → detect_objects (게임 프레임 번호 전달, 추론 워커 스레드)"""
+        from io import BytesIO
+        from PIL import Image
+        
+        rgb = np.asarray(Image.open(BytesIO(image_bytes)).convert('RGB'))
+        frame = np.ascontiguousarray(rgb[..., ::-1])
+        return self.cv_module.detect_objects(frame, frame_index=frame_index)
+    
+    @property
+    def obstacles(self):
+        """장애물 dict 리스트 뷰 (읽기 전용, get_state()/AI 전략/학습 데이터용)"""
+        return self.obstacle_store.as_dicts()
+    
+    def apply_collisions(self, meteor_hit, num_stars):
+        """충돌 결과 반영 (AABB 판정은 배치 물리 엔진) - 메테오 vs 별"""
+        if meteor_hit:
+            # 메테오 충돌: 게임 오버
+            self.game_over = True
+            self.running = False
+            print(f"💥 메테오 충돌! 게임 오버! 점수: {self.score}, 생존 시간: {time.time() - self.start_time:.1f}초")
+        
+        if num_stars:
+            # 별 획득: 점수 증가 (별은 엔진에서 이미 제거됨)
+            star_score = OBJECT_TYPES['star']['score']
+            self.score += star_score * num_stars
+            self.star_collected = True  # 별 획득 플래그 설정
+            print(f"⭐ 별 획득! +{star_score * num_stars}점 (총 {self.score}점)")
     
     def jump(self):
         """점프"""
@@ -518,6 +688,7 @@ class Game:
             'time': time.time() - self.start_time,
             'frame': self.frame,
             'mode': self.mode,
+            'player_name': self.player_name,  # 세션 식별 (관전/라우팅 확인용, 델타/바이너리에는 미포함)
             'game_over': self.game_over,
             'star_collected': self.star_collected,  # 별 획득 이벤트
             # 데이터 수집 현황 (실제 저장된 데이터 개수)
@@ -547,47 +718,12 @@ def encode_game_state(game):
     - nearest_star_dy_normalized (0~1)
     - nearest_star_distance_normalized (0~1)
     - on_ground (0 or 1)
+    
+    vision_agent_shared/state_encoder.py의 기준 인코더 (학습 데이터 state_vectors.npy와 동일)
     """
-    player_x = game.player_x
-    player_y = game.player_y
-    player_vy = game.player_vy
-    player_center_x = player_x + PLAYER_SIZE / 2
-    
-    # 정규화
-    state = np.zeros(10, dtype=np.float32)
-    state[0] = player_x / WIDTH
-    state[1] = player_y / HEIGHT
-    state[2] = np.clip(player_vy / 20.0, -1, 1)
-    state[9] = 1.0 if player_y >= HEIGHT - PLAYER_SIZE - 5 else 0.0
-    
-    # 가장 가까운 메테오 & 별 찾기
-    nearest_meteor_dist = 1.0
-    nearest_star_dist = 1.0
-    
-    for obs in game.obstacles:
-        obj_type = obs.get('type', 'meteor')
-        obs_center_x = obs['x'] + obs.get('size', OBSTACLE_SIZE) / 2
-        obs_center_y = obs['y'] + obs.get('size', OBSTACLE_SIZE) / 2
-        
-        dx = (obs_center_x - player_center_x) / WIDTH
-        dy = (obs_center_y - player_y) / HEIGHT
-        dist = np.sqrt(dx**2 + dy**2)
-        
-        if obj_type == 'meteor' and dist < nearest_meteor_dist:
-            nearest_meteor_dist = dist
-            state[3] = np.clip(dx, -1, 1)
-            state[4] = np.clip(dy, 0, 1)
-            state[5] = dist
-        
-        elif obj_type == 'star' and dist < nearest_star_dist:
-            nearest_star_dist = dist
-            state[6] = np.clip(dx, -1, 1)
-            state[7] = np.clip(dy, 0, 1)
-            state[8] = dist
-    
-    return state
-
-def ai_decision(game):
+    return game.physics.encode_states([game.slot])[0]
+
+def ai_decision(game, policy_output=None):
     """
     AI 에이전트의 의사결정 로직 (난이도 레벨별)
     
@@ -595,75 +731,181 @@ def ai_decision(game):
     - Level 1 (Easy): 간단한 휴리스틱 (기본 회피만)
     - Level 2 (Medium): 고급 휴리스틱 (회피 + 별 수집)
     - Level 3 (Hard): PPO 모델 기반 (없으면 최고급 휴리스틱)
+    
+    policy_output: 배치 정책 서버가 이번 틱에 계산한 이 게임의 출력 (Level 3/4)
     """
-    # AI 레벨에 따른 의사결정
-    ai_level_manager.set_level(game.ai_level)
+    # 세션별 전략 핸들 사용 (공유 전략은 읽기 전용 - 락/전역 상태 변경 없음)
+    if policy_output is not None:
+        return game.ai_strategy.make_decision(game.get_state(), policy_output)
+    return game.ai_strategy.make_decision(game.get_state())
+
+def spectator_room(sid):
+    """AI 게임 관전 룸 이름"""
+    return f"spectate:{sid}"
+
+def emit_to_session(event, data, sid):
+    """
+    세션 본인(sid 룸) + 해당 게임 관전자 룸에만 전송
     
-    # 게임 상태를 AI 모듈 형식으로 변환
-    game_state = game.get_state()
+    전역 브로드캐스트를 하면 모든 클라이언트가 모든 게임의 30 FPS 스트림을
+    받게 되므로(O(N²)), 게임 이벤트는 반드시 이 함수를 통해 보낸다.
+    """
+    socketio.emit(event, data, to=sid)
+    if spectators.get(sid):
+        socketio.emit(event, data, to=spectator_room(sid))
+
+def emit_game_state(sid, game):
+    """
+    게임 상태 전송
     
-    # AI 의사결정
-    action = ai_level_manager.make_decision(game_state)
+    - 'delta' 클라이언트: 'game_delta' (키프레임 + 변경분)
+    - 'binary' 클라이언트: 'game_binary' (struct 패킹 버퍼, 바이너리 첨부)
+    - 'json' 클라이언트: 'game_update' (전체 상태, 폴백)
+    - 관전자는 중간 합류하므로 항상 전체 상태
+    """
+    state = game.get_state()
     
-    return action
+    if game.protocol == 'delta':
+        socketio.emit('game_delta', game.state_encoder.encode(state), to=sid)
+    elif game.protocol == 'binary':
+        socketio.emit('game_binary', encode_binary_state(state), to=sid)
+    else:
+        socketio.emit('game_update', {'state': state}, to=sid)
+    
+    if spectators.get(sid):
+        socketio.emit('game_update', {'state': state}, to=spectator_room(sid))
 
-def game_loop(sid):
-    """게임 루프"""
-    game = games.get(sid)
-    if not game:
+def apply_ai_action(game, policy_output=None):
+    """AI 모드: 자동 의사결정 후 행동 적용"""
+    action = ai_decision(game, policy_output)
+    if action == 'jump':
+        game.jump()
+    elif action == 'left':
+        game.move_left()
+    elif action == 'right':
+        game.move_right()
+
+def prepare_tick(shard_index, items):
+    """
+    샤드의 모든 게임을 한 번에 물리 스텝 (TickScheduler batch_fn)
+    
+    정책 모델을 쓰는 AI 게임들의 상태 벡터를 모아 정책 서버에 한 번에 보내고,
+    AI 행동 적용 + 업데이트 전 상태 저장을 게임별로 한 뒤,
+    샤드 엔진을 한 번만 스텝하고 결과를 각 게임에 넘긴다.
+    (tick_game()에서 finish_update()로 반영)
+    """
+    engine = physics_engines[shard_index]
+    batch = [game for _, game in items
+             if game.running and not game.game_over and game.physics is engine]
+    if not batch:
         return
     
-    print(f"🎮 게임 루프 시작: {sid} (모드: {game.mode})")
+    # 정책 추론: 샤드의 Level 3/4 게임 전체를 배치 하나로 (데드라인 초과 게임은 None → 휴리스틱)
+    policy_outputs = {}
+    if policy_server is not None:
+        policy_games = [game for game in batch if game.mode == 'ai' and game.ai_strategy.uses_policy]
+        if policy_games:
+            states = engine.encode_states([game.slot for game in policy_games])
+            outputs = policy_server.decide_many(list(states))
+            policy_outputs = {id(game): output for game, output in zip(policy_games, outputs)}
     
-    while game.running and not game.game_over:
-        try:
-            # AI 모드: 자동 의사결정
-            if game.mode == 'ai':
-                action = ai_decision(game)
-                if action == 'jump':
-                    game.jump()
-                elif action == 'left':
-                    game.move_left()
-                elif action == 'right':
-                    game.move_right()
-            
-            game.update()
-            
-            # 상태 전송
-            socketio.emit('game_update', {
-                'state': game.get_state()
-            })
-            
-            time.sleep(1.0 / 30)  # 30 FPS
-            
-        except Exception as e:
-            print(f"❌ 에러: {e}")
-            break
+    for game in batch:
+        if game.mode == 'ai':
+            apply_ai_action(game, policy_outputs.get(id(game)))
+        game.begin_update()
+    
+    result = engine.step(game.slot for game in batch)
+    for game in batch:
+        game.step_result = result
+
+def tick_game(sid, game):
+    """
+    게임 한 틱 진행 (TickScheduler에서 prepare_tick() 다음에 호출)
+    
+    Returns:
+        계속 진행하면 True, 게임이 끝났으면 False
+    """
+    if not game.running or game.game_over:
+        print(f"🛑 게임 루프 종료: {sid}")
+        return False
+    
+    result, game.step_result = game.step_result, None
+    if result is not None:
+        game.finish_update(result)
+    else:
+        # 배치 스텝에 포함되지 않은 경우 (샤드 엔진 밖의 게임 등) 단독 진행
+        if game.mode == 'ai':
+            apply_ai_action(game)
+        game.update()
+    
+    # 상태 전송 (본인 + 관전자에게만)
+    emit_game_state(sid, game)
     
-    # 게임 오버 처리
     if game.game_over:
-        survival_time = time.time() - game.start_time
-        
-        # 게임 세션 저장 (팀원들의 훈련 데이터용)
-        save_gameplay_session(game)
-        
-        # 리더보드에 점수 추가
-        player_name = game.player_name or f"Player-{sid[:6]}"
-        leaderboard = add_score(player_name, game.score, survival_time, game.mode, sid)
-        
-        # 클라이언트에 게임 오버 + 랭킹 전송
-        socketio.emit('game_over', {
-            'score': game.score,
-            'time': survival_time,
-            'frame': game.frame,
-            'player_name': player_name,
-            'mode': game.mode,  # 모드 추가
-            'leaderboard': leaderboard['scores'][:10]  # 상위 10개만
-        })
-        
-        print(f"💾 점수 저장: {player_name} ({game.mode}) - {game.score}점 ({survival_time:.1f}초)")
+        # 저장/리더보드 I/O는 틱 루프 밖에서 처리
+        threading.Thread(target=finish_game, args=(sid, game), daemon=True).start()
+        print(f"🛑 게임 루프 종료: {sid}")
+        return False
     
-    print(f"🛑 게임 루프 종료: {sid}")
+    return True
+
+def finish_game(sid, game):
+    """게임 오버 처리 (세션 저장 + 리더보드)"""
+    survival_time = time.time() - game.start_time
+    
+    # 게임 세션 저장 (팀원들의 훈련 데이터용)
+    save_gameplay_session(game)
+    
+    # 리더보드에 점수 추가
+    player_name = game.player_name or f"Player-{sid[:6]}"
+    leaderboard = add_score(player_name, game.score, survival_time, game.mode, sid)
+    
+    # 클라이언트에 게임 오버 + 랭킹 전송
+    emit_to_session('game_over', {
+        'score': game.score,
+        'time': survival_time,
+        'frame': game.frame,
+        'player_name': player_name,
+        'mode': game.mode,  # 모드 추가
+        'leaderboard': leaderboard['scores'][:10]  # 상위 10개만
+    }, sid)
+    
+    print(f"💾 점수 저장: {player_name} ({game.mode}) - {game.score}점 ({survival_time:.1f}초)")
+
+# 모든 활성 게임을 고정 타임스텝으로 진행하는 공유 스케줄러
+# 샤드마다 배치 물리 엔진 하나 (샤드 스레드만 스텝하므로 엔진 간 경합 없음)
+scheduler = TickScheduler(tick_game, batch_fn=prepare_tick, fps=FPS, num_shards=TICK_SHARDS, name='game')
+physics_engines = [create_physics_engine() for _ in range(scheduler.num_shards)]
+scheduler.start()
+
+# 모델 워밍업 (백그라운드): 첫 게임이 모델 로드/첫 추론 비용을 치르지 않도록
+# 탐지 모델은 워밍업 객체가 참조를 유지하므로 유휴 해제되지 않음
+WARMUP_SAMPLE_STATE = {
+    'player': {'x': WIDTH / 2, 'y': HEIGHT - PLAYER_SIZE, 'vy': 0, 'size': PLAYER_SIZE, 'health': 100},
+    'obstacles': [],
+    'score': 0,
+    'time': 0.0,
+    'frame': 0,
+    'mode': 'ai',
+    'game_over': False,
+    'star_collected': 0,
+    'lava': {'state': 'inactive', 'timer': 0.0, 'height': LAVA_CONFIG['height'],
+             'zone_x': 0, 'zone_width': LAVA_CONFIG['zone_width']},
+}
+model_warmup = ModelWarmup(
+    yolo_model_path,
+    policies={f'level{level}': strategy.make_decision for level, strategy in ai_level_manager.strategies.items()},
+    sample_state=WARMUP_SAMPLE_STATE,
+    iterations=int(os.getenv('WARMUP_ITERATIONS', '3')),
+    batch_sizes=(1, default_batch_size()),
+    frame_shape=(HEIGHT, WIDTH, 3),
+)
+if os.getenv('WARMUP_ENABLED', '1') == '1':
+    model_warmup.start()
+
+def physics_engine_for(sid):
+    """sid가 배정될 스케줄러 샤드의 물리 엔진"""
+    return physics_engines[scheduler.shard_index(sid)]
 
 @app.route('/')
 def index():
@@ -688,13 +930,85 @@ def api_stats():
     """통계 정보 (Cloud Storage 연동)"""
     return jsonify(storage.get_stats())
 
+@app.route('/api/games/ai')
+def api_ai_games():
+    """관전 가능한 AI 게임 목록"""
+    return jsonify({
+        'games': [
+            {
+                'sid': sid,
+                'player_name': game.player_name,
+                'ai_level': game.ai_level,
+                'score': game.score,
+                'spectators': len(spectators.get(sid, ()))
+            }
+            for sid, game in list(games.items())
+            if game.mode == 'ai' and game.running
+        ]
+    })
+
+@app.route('/api/models')
+def api_models():
+    """공유 모델 레지스트리 현황"""
+    return jsonify(get_model_registry().get_stats())
+
+@app.route('/api/scheduler')
+def api_scheduler():
+    """틱 스케줄러 타이밍 통계 + 샤드별 물리 엔진 현황"""
+    stats = scheduler.get_stats()
+    stats['physics'] = [engine.get_stats() for engine in physics_engines]
+    return jsonify(stats)
+
+@app.route('/api/policy')
+def api_policy():
+    """배치 정책 서버 통계 (배치 크기, 지연, 데드라인 초과율)"""
+    if policy_server is None:
+        return jsonify({'enabled': False})
+    stats = policy_server.get_stats()
+    stats['enabled'] = True
+    return jsonify(stats)
+
+@app.route('/api/ready')
+def api_ready():
+    """Readiness: 모델 워밍업이 끝나면 200, 진행 중이면 503 (단계별 소요 시간 포함)"""
+    status = model_warmup.get_status()
+    if os.getenv('WARMUP_ENABLED', '1') != '1':
+        status['ready'] = True
+    return jsonify(status), 200 if status['ready'] else 503
+
+@app.route('/api/cv')
+def api_cv():
+    """비동기 CV 추론 워커 통계 + 게임별 결과 지연 (프레임) + 모델별 마이크로 배치 통계"""
+    stats = get_inference_worker().get_stats()
+    stats['batchers'] = get_detection_batcher_stats()
+    stats['staleness_frames'] = {
+        sid: game.cv_staleness
+        for sid, game in list(games.items())
+        if game.running
+    }
+    return jsonify(stats)
+
 @socketio.on('connect')
 def on_connect():
     from flask import request
     sid = request.sid
-    games[sid] = Game(sid)
-    print(f"✅ 연결: {sid}")
-    emit('connected', {'config': {'width': WIDTH, 'height': HEIGHT}})
+    game = Game(sid, physics=physics_engine_for(sid))
+    
+    # 상태 프로토콜 협상: io({query: {protocol: 'delta' | 'binary'}}), 그 외는 JSON 폴백
+    protocol = request.args.get('protocol', 'json')
+    if protocol == 'delta':
+        game.state_encoder = StateDeltaEncoder(keyframe_interval=KEYFRAME_INTERVAL)
+    elif protocol != 'binary':
+        protocol = 'json'
+    game.protocol = protocol
+    
+    games[sid] = game
+    print(f"✅ 연결: {sid} (프로토콜: {protocol})")
+    emit('connected', {
+        'config': {'width': WIDTH, 'height': HEIGHT},
+        'protocol': protocol,
+        'protocol_version': PROTOCOL_VERSION
+    })
 
 @socketio.on('disconnect')
 def on_disconnect():
@@ -702,7 +1016,15 @@ def on_disconnect():
     sid = request.sid
     if sid in games:
         games[sid].running = False
+        scheduler.remove(sid)
+        games[sid].close()  # 물리 엔진 슬롯 + 공유 YOLO 모델 참조 반환
         del games[sid]
+    
+    # 관전 정리 (관전자였으면 제거, 관전 대상이었으면 룸 닫기)
+    for target_sid, watchers in list(spectators.items()):
+        watchers.discard(sid)
+    if spectators.pop(sid, None):
+        close_room(spectator_room(sid))
     print(f"❌ 연결 해제: {sid}")
 
 @socketio.on('start_game')
@@ -717,9 +1039,15 @@ def on_start_game(data):
     
     # 게임 재시작: 상태 초기화
     game.reset()
+    if game.state_encoder is not None:
+        game.state_encoder.reset()  # 새 게임은 키프레임부터
     game.mode = data.get('mode', 'human')
     game.player_name = data.get('player_name', None)  # 플레이어 이름 저장
     game.ai_level = data.get('ai_level', 2)  # AI 난이도 레벨 (기본값: 2)
+    if game.ai_level not in ai_level_manager.strategies:
+        print(f"⚠️ 잘못된 AI 레벨: {game.ai_level}, Level 2로 대체")
+        game.ai_level = 2
+    game.ai_strategy = ai_level_manager.get_strategy(game.ai_level)
     game.running = True
     
     # 플레이어 이름 설정 (AI면 자동 생성)
@@ -732,13 +1060,53 @@ def on_start_game(data):
     
     print(f"🚀 게임 시작: {sid}, 모드: {game.mode}, 플레이어: {game.player_name}, AI 레벨: {game.ai_level}")
     
-    # 게임 루프 시작
-    thread = threading.Thread(target=game_loop, args=(sid,))
-    thread.daemon = True
-    thread.start()
+    # 공유 스케줄러에 등록 (게임 루프 시작)
+    print(f"🎮 게임 루프 시작: {sid} (모드: {game.mode})")
+    scheduler.add(sid, game)
     
     emit('game_started', {'state': game.get_state()})
 
+@socketio.on('request_keyframe')
+def on_request_keyframe(data=None):
+    """델타 디코더 재동기화 요청 (seq 누락 시)"""
+    from flask import request
+    game = games.get(request.sid)
+    if game and game.state_encoder is not None:
+        game.state_encoder.force_keyframe()
+
+@socketio.on('spectate')
+def on_spectate(data):
+    """AI 게임 관전 시작 (opt-in)"""
+    from flask import request
+    sid = request.sid
+    target_sid = (data or {}).get('sid')
+    target = games.get(target_sid)
+    
+    if not target or target.mode != 'ai' or target_sid == sid:
+        emit('spectate_error', {'error': 'AI 게임을 찾을 수 없습니다', 'sid': target_sid})
+        return
+    
+    # 기존 관전 룸에서 나가기 (한 번에 하나만 관전)
+    _leave_spectating(sid)
+    
+    join_room(spectator_room(target_sid))
+    spectators.setdefault(target_sid, set()).add(sid)
+    print(f"👀 관전 시작: {sid} → {target_sid}")
+    emit('spectating', {'sid': target_sid, 'state': target.get_state()})
+
+@socketio.on('stop_spectating')
+def on_stop_spectating(data=None):
+    """AI 게임 관전 종료"""
+    from flask import request
+    _leave_spectating(request.sid)
+
+def _leave_spectating(sid):
+    """sid가 관전 중인 모든 룸에서 나가기"""
+    for target_sid, watchers in list(spectators.items()):
+        if sid in watchers:
+            watchers.discard(sid)
+            leave_room(spectator_room(target_sid), sid=sid)
+
 @socketio.on('player_action')
 def on_action(data):
     from flask import request
@@ -792,6 +1160,9 @@ def on_frame_capture(data):
         
         if saved_path and frame_number % 30 == 0:  # 30프레임마다 로그
             print(f"📸 프레임 저장: {saved_path}")
+        
+        # 실제 프레임 탐지 (CV_LIVE_FRAMES, 추적기/ROI 탐지 경로)
+        game.submit_frame_image(image_bytes, frame_number)
     
     except Exception as e:
         print(f"❌ 프레임 저장 오류: {e}")
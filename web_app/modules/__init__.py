@@ -13,6 +13,15 @@ Modules Package - Team Collaboration Modules
 from .game_engine import GameState, GameActions, GameObject, Player, Obstacle
 from .cv_module import ComputerVisionModule, CVDetectionResult
 from .ai_module import AIModule, AIDecisionResult
+from .model_registry import ModelRegistry, SharedModel, get_model_registry
+from .inference_worker import CVInferenceWorker, InferenceResult, get_inference_worker
+from .micro_batcher import MicroBatcher
+from .policy_server import PolicyServer
+from .numpy_mlp import NumpyMLP
+from vision_agent_shared.state_encoder import STATE_DIM, STATE_FEATURES, encode_states
+from .roi_detection import DirtyRegionDetector
+from .object_tracker import ObjectTracker
+from .warmup import ModelWarmup
 
 __all__ = [
     # Game Engine (공통)
@@ -29,6 +38,27 @@ __all__ = [
     # AI Module (Chloe)
     'AIModule',
     'AIDecisionResult',
+    
+    # 공유 모델 레지스트리
+    'ModelRegistry',
+    'SharedModel',
+    'get_model_registry',
+    
+    # 비동기 CV 추론 워커
+    'CVInferenceWorker',
+    'InferenceResult',
+    'get_inference_worker',
+    'MicroBatcher',
+    'PolicyServer',
+    'NumpyMLP',
+    'STATE_DIM',
+    'STATE_FEATURES',
+    'encode_states',
+    'DirtyRegionDetector',
+    'ObjectTracker',
+    
+    # 서버 시작 워밍업
+    'ModelWarmup',
 ]
 
 # 버전 정보
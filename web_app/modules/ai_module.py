@@ -22,6 +22,10 @@ import time
 import random
 from pathlib import Path
 
+from .numpy_mlp import NumpyMLP, load_policy_network
+from .policy_server import policy_action
+from vision_agent_shared.state_encoder import STATE_DIM, encode_state_dict
+
 # PyTorch는 선택적 (실제 RL 모델 구현 시 필요)
 try:
     import torch
@@ -55,7 +59,7 @@ class PolicyNetwork(nn.Module):
     Chloe가 구현할 신경망 구조
     """
     
-    def __init__(self, state_dim: int = 8, hidden_dim: int = 128, action_dim: int = 4):
+    def __init__(self, state_dim: int = STATE_DIM, hidden_dim: int = 128, action_dim: int = 4):
         if not TORCH_AVAILABLE:
             raise ImportError("PyTorch (torch)가 필요합니다. 실제 RL 모델 구현 시 사용됩니다.")
         super().__init__()
@@ -80,7 +84,7 @@ class ValueNetwork(nn.Module):
     Chloe가 PPO 구현 시 사용
     """
     
-    def __init__(self, state_dim: int = 8, hidden_dim: int = 128):
+    def __init__(self, state_dim: int = STATE_DIM, hidden_dim: int = 128):
         if not TORCH_AVAILABLE:
             raise ImportError("PyTorch (torch)가 필요합니다. 실제 RL 모델 구현 시 사용됩니다.")
         super().__init__()
@@ -302,21 +306,9 @@ class AIModule:
         """
         게임 상태를 RL 모델 입력 벡터로 변환
         
-        TODO for Chloe: 상태 표현 최적화
+        실시간 추론 / 학습 데이터와 같은 기준 인코더 (state_encoder, STATE_DIM차원)
         """
-        # 8차원 상태 벡터 생성
-        state_vector = np.array([
-            game_state.get('player_x', 0.5),
-            game_state.get('player_y', 0.5),
-            game_state.get('player_vy', 0.0),
-            game_state.get('on_ground', 0.0),
-            game_state.get('obstacle_x', 0.0),
-            game_state.get('obstacle_y', 0.0),
-            game_state.get('obstacle_distance', 1.0),
-            game_state.get('time_to_collision', 10.0)
-        ], dtype=np.float32)
-        
-        return state_vector
+        return encode_state_dict(game_state)
     
     def update_reward(self, reward: float, done: bool = False):
         """
@@ -489,6 +481,9 @@ if __name__ == "__main__":
 class AIStrategy:
     """AI 전략 베이스 클래스"""
     
+    # True면 make_decision(game_state, policy_output)으로 배치 정책 서버 출력을 받음
+    uses_policy = False
+    
     def __init__(self, level: int, name: str):
         self.level = level
         self.name = name
@@ -686,10 +681,13 @@ class Level3Strategy(AIStrategy):
     Level 3 (Hard) - PPO 모델 기반
     
     전략:
-    - 학습된 PPO 모델 사용 (models/rl/ppo_agent.pt)
+    - 학습된 PPO 모델 사용 (models/rl/ppo_agent.pt, state_dict면 torch 없이 NumPy로)
     - 모델이 없으면 최고급 휴리스틱으로 폴백
+    - 배치 정책 서버(PolicyServer)가 있으면 그 출력을 policy_output으로 받음
     """
     
+    uses_policy = True
+    
     def __init__(self, model_path: Optional[str] = None):
         super().__init__(level=3, name="Hard (PPO)")
         self.model_path = model_path
@@ -711,21 +709,44 @@ class Level3Strategy(AIStrategy):
                 print(f"⚠️ Level 3: PPO 모델 파일 없음 ({self.model_path}), 휴리스틱으로 폴백")
                 return
             
-            # PyTorch 모델 로드 시도
+            # state_dict (.pt / .npz)면 torch 없이 NumPy 엔진으로 로드
+            try:
+                model = load_policy_network(self.model_path)
+            except Exception as e:
+                numpy_error = e
+            else:
+                if model.state_dim != STATE_DIM:
+                    print(f"⚠️ Level 3: PPO 모델 입력 차원 불일치 ({model.state_dim} != {STATE_DIM}), 휴리스틱으로 폴백")
+                    return
+                self.ppo_model = model
+                print(f"✅ Level 3: PPO 모델 로드 성공 - NumPy ({self.model_path})")
+                return
+            
+            # 통째로 저장된 nn.Module이면 PyTorch 필요
             if TORCH_AVAILABLE:
                 import torch
                 self.ppo_model = torch.load(self.model_path, map_location='cpu')
                 self.ppo_model.eval()
                 print(f"✅ Level 3: PPO 모델 로드 성공 ({self.model_path})")
             else:
-                print("⚠️ Level 3: PyTorch 없음, 휴리스틱으로 폴백")
+                print(f"⚠️ Level 3: state_dict가 아니고 PyTorch 없음 ({numpy_error}), 휴리스틱으로 폴백")
         
         except Exception as e:
             print(f"⚠️ Level 3: PPO 모델 로드 실패 ({e}), 휴리스틱으로 폴백")
             self.ppo_model = None
     
-    def make_decision(self, game_state: Dict[str, Any]) -> Optional[str]:
-        """PPO 모델 또는 폴백 전략"""
+    def make_decision(self, game_state: Dict[str, Any],
+                      policy_output: Optional[np.ndarray] = None) -> Optional[str]:
+        """
+        PPO 모델 또는 폴백 전략
+        
+        Args:
+            game_state: 게임 상태
+            policy_output: 배치 정책 서버의 이 게임 출력 (None이면 데드라인 초과/서버 없음)
+        """
+        if policy_output is not None:
+            return policy_action(policy_output)
+        
         # PPO 모델이 있으면 사용
         if self.ppo_model is not None:
             try:
@@ -738,24 +759,19 @@ class Level3Strategy(AIStrategy):
     
     def _ppo_decision(self, game_state: Dict[str, Any]) -> Optional[str]:
         """
-        PPO 모델 기반 의사결정
+        PPO 모델 기반 의사결정 (배치 정책 서버가 없거나 결과가 없을 때 게임 하나만)
         
-        TODO for Chloe: 실제 PPO 추론 구현
+        상태는 PolicyServer 경로와 같은 기준 인코더(encode_state_dict)로 만든다.
+        NumpyMLP는 torch 없이, 통째로 저장된 nn.Module만 PyTorch로 실행.
         """
-        # TODO: 게임 상태를 PPO 입력 형식으로 변환
-        # state_vector = self._encode_state(game_state)
-        
-        # TODO: PPO 추론
-        # with torch.no_grad():
-        #     action_probs = self.ppo_model(state_vector)
-        #     action_idx = torch.argmax(action_probs).item()
+        state = encode_state_dict(game_state)
+        if isinstance(self.ppo_model, NumpyMLP):
+            return policy_action(self.ppo_model(state))
         
-        # TODO: 행동 매핑
-        # actions = [None, 'jump', 'left', 'right']
-        # return actions[action_idx]
-        
-        # 임시: 폴백 사용
-        return self.fallback_strategy.make_decision(game_state)
+        import torch
+        with torch.no_grad():
+            output = self.ppo_model(torch.from_numpy(state).unsqueeze(0))
+        return policy_action(output.numpy()[0])
 
 
 class Level4Strategy(AIStrategy):
@@ -768,6 +784,8 @@ class Level4Strategy(AIStrategy):
     - 가장 높은 성능 목표
     """
     
+    uses_policy = True
+    
     def __init__(self, ppo_model_path: Optional[str] = None, dqn_model_path: Optional[str] = None):
         super().__init__(level=4, name="Expert (Ensemble)")
         self.ppo_strategy = Level3Strategy(model_path=ppo_model_path)
@@ -799,13 +817,14 @@ class Level4Strategy(AIStrategy):
             print(f"⚠️ Level 4: DQN 모델 로드 실패 ({e})")
             self.dqn_model = None
     
-    def make_decision(self, game_state: Dict[str, Any]) -> Optional[str]:
-        """앙상블 의사결정"""
+    def make_decision(self, game_state: Dict[str, Any],
+                      policy_output: Optional[np.ndarray] = None) -> Optional[str]:
+        """앙상블 의사결정 (policy_output은 배치 정책 서버 출력, Level3Strategy 참고)"""
         # 여러 전략의 결정을 수집
         decisions = []
         
         # PPO 전략
-        ppo_action = self.ppo_strategy.make_decision(game_state)
+        ppo_action = self.ppo_strategy.make_decision(game_state, policy_output)
         if ppo_action:
             decisions.append(('ppo', ppo_action, 0.5))  # 가중치 0.5
         
@@ -832,7 +851,14 @@ class Level4Strategy(AIStrategy):
 
 
 class AILevelManager:
-    """AI 난이도 레벨 관리자"""
+    """
+    AI 난이도 레벨 관리자
+    
+    레벨별 전략(모델 포함)을 한 번만 만들어 두는 공유 캐시. 전략은 생성 후
+    읽기 전용이므로 세션마다 get_strategy()로 핸들을 받아 쓰거나
+    make_decision(state, level)처럼 레벨을 호출마다 넘기면, 여러 게임
+    스레드가 동시에 써도 락이 필요 없다.
+    """
     
     def __init__(self, ppo_model_path: Optional[str] = None, dqn_model_path: Optional[str] = None):
         """
@@ -848,25 +874,40 @@ class AILevelManager:
             3: Level3Strategy(model_path=ppo_model_path),
             4: Level4Strategy(ppo_model_path=ppo_model_path, dqn_model_path=dqn_model_path)
         }
-        self.current_level = 1
+        self.current_level = 1  # set_level()을 쓰는 단일 세션 스크립트용 기본 레벨
     
-    def set_level(self, level: int):
-        """난이도 레벨 설정"""
+    def get_strategy(self, level: int) -> AIStrategy:
+        """레벨의 공유 전략 핸들 (세션 시작 시 한 번 받아 매 틱 재사용)"""
         if level not in self.strategies:
             raise ValueError(f"Invalid level: {level}. Must be 1, 2, 3, or 4.")
+        return self.strategies[level]
+    
+    def set_level(self, level: int):
+        """
+        기본 레벨 설정 (단일 세션 스크립트용)
+        
+        공유 상태를 바꾸므로 여러 게임이 쓰는 서버에서는 get_strategy() 또는
+        make_decision(state, level)을 사용한다.
+        """
+        self.get_strategy(level)
         self.current_level = level
-        print(f"🎮 AI 난이도: Level {level} ({self.strategies[level].name})")
     
-    def make_decision(self, game_state: Dict[str, Any]) -> Optional[str]:
-        """현재 레벨의 전략으로 의사결정"""
-        strategy = self.strategies[self.current_level]
-        return strategy.make_decision(game_state)
+    def make_decision(self, game_state: Dict[str, Any], level: Optional[int] = None) -> Optional[str]:
+        """
+        레벨 전략으로 의사결정 (level을 넘기면 공유 상태를 읽지도 쓰지도 않음)
+        
+        Args:
+            game_state: 게임 상태
+            level: AI 난이도 레벨 (None이면 set_level()로 정한 기본 레벨)
+        """
+        return self.get_strategy(self.current_level if level is None else level).make_decision(game_state)
     
-    def get_level_info(self) -> Dict[str, Any]:
-        """현재 레벨 정보 반환"""
-        strategy = self.strategies[self.current_level]
+    def get_level_info(self, level: Optional[int] = None) -> Dict[str, Any]:
+        """레벨 정보 반환 (None이면 기본 레벨)"""
+        level = self.current_level if level is None else level
+        strategy = self.get_strategy(level)
         return {
-            'level': self.current_level,
+            'level': level,
             'name': strategy.name,
-            'description': f"Level {self.current_level}: {strategy.name}"
+            'description': f"Level {level}: {strategy.name}"
         }
@@ -0,0 +1,309 @@
+"""
+Batch Physics Engine - 다중 게임 일괄 물리 스텝
+
+활성 세션 전체의 플레이어/장애물 상태를 공유 배열에 보관하고,
+한 번의 벡터 연산으로 모든 게임을 진행시킨다.
+
+- 중력 + 바닥 충돌
+- 장애물 이동 / 좌우 wrap / 화면 밖 제거 (게임별 제거 개수 집계)
+- 플레이어 vs 장애물 AABB 충돌 (메테오 충돌, 별 획득 집계)
+- 용암 데미지
+- 정책 입력 벡터 일괄 인코딩 (state_encoder)
+
+각 Game은 엔진의 슬롯 하나를 할당받고, 플레이어 필드와
+ObstacleView를 통해 기존 Game API를 그대로 유지한다.
+엔진은 스레드 하나(스케줄러 샤드)가 스텝을 돌리는 것을 전제로 하며,
+다른 스레드(소켓 핸들러)의 생성/제거/조회는 lock으로 보호한다.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .obstacle_store import ObstacleStore, TYPE_METEOR, TYPE_STAR
+from vision_agent_shared.state_encoder import encode_states
+
+
+class PhysicsStepResult:
+    """한 번의 배치 스텝 결과 (슬롯 인덱스 기준 배열)"""
+
+    def __init__(self, capacity: int):
+        self.cleared = np.zeros(capacity, dtype=np.int64)       # 화면 밖으로 나간 장애물 수
+        self.stars = np.zeros(capacity, dtype=np.int64)         # 획득한 별 수
+        self.meteor_hit = np.zeros(capacity, dtype=bool)        # 메테오 충돌 여부
+        self.lava_dead = np.zeros(capacity, dtype=bool)         # 용암으로 체력 소진
+        self.stepped = np.zeros(capacity, dtype=bool)           # 이번 스텝에 진행된 슬롯
+
+
+class BatchPhysicsEngine:
+    """공유 배열 기반 다중 게임 물리 엔진"""
+
+    def __init__(self,
+                 width: int,
+                 height: int,
+                 player_size: int,
+                 gravity: int = 1,
+                 lava_damage: int = 3,
+                 capacity: int = 16):
+        """
+        Args:
+            width, height: 화면 크기
+            player_size: 플레이어 크기 (정사각형)
+            gravity: 프레임당 중력 가속도
+            lava_damage: 용암 위에서 프레임당 체력 감소량
+            capacity: 초기 게임 슬롯 수 (넘치면 두 배로 확장)
+        """
+        self.width = width
+        self.height = height
+        self.player_size = player_size
+        self.gravity = gravity
+        self.lava_damage = lava_damage
+
+        self.lock = threading.RLock()
+        self.obstacles = ObstacleStore(capacity=capacity * 8)
+        self.last_result = PhysicsStepResult(0)
+
+        self.capacity = 0
+        self._free_slots: List[int] = []
+        self._allocate(max(1, capacity))
+
+        # 게임별 장애물 그룹 인덱스 캐시 (obstacles.version 기준)
+        self._group_version = -1
+        self._group_order = np.zeros(0, dtype=np.int64)
+        self._group_starts = np.zeros(0, dtype=np.int64)
+        self._group_ends = np.zeros(0, dtype=np.int64)
+
+    def _allocate(self, capacity: int):
+        """슬롯 배열 (재)할당 - 기존 데이터 보존"""
+        old_capacity = self.capacity
+        arrays = {
+            'player_x': np.zeros(capacity, dtype=np.int32),
+            'player_y': np.zeros(capacity, dtype=np.int32),
+            'player_vy': np.zeros(capacity, dtype=np.int32),
+            'player_health': np.zeros(capacity, dtype=np.int32),
+            'in_use': np.zeros(capacity, dtype=bool),
+            # 슬롯별 장애물 변경 카운터 (다른 게임의 spawn이 뷰 캐시를 깨지 않도록)
+            'slot_version': np.zeros(capacity, dtype=np.int64),
+            # 용암 영역 (lava_on일 때만 데미지)
+            'lava_on': np.zeros(capacity, dtype=bool),
+            'lava_x0': np.zeros(capacity, dtype=np.int32),
+            'lava_x1': np.zeros(capacity, dtype=np.int32),
+            'lava_y0': np.zeros(capacity, dtype=np.int32),
+        }
+        for name, array in arrays.items():
+            if old_capacity:
+                array[:old_capacity] = getattr(self, name)
+            setattr(self, name, array)
+
+        self._free_slots.extend(range(capacity - 1, old_capacity - 1, -1))
+        self.capacity = capacity
+        self._group_version = -1
+
+    # ========== 슬롯 관리 ==========
+
+    def allocate_slot(self) -> int:
+        """게임 슬롯 할당"""
+        with self.lock:
+            if not self._free_slots:
+                self._allocate(self.capacity * 2)
+            slot = self._free_slots.pop()
+            self.in_use[slot] = True
+            self.lava_on[slot] = False
+            return slot
+
+    def release_slot(self, slot: int):
+        """게임 슬롯 반환 (장애물 포함)"""
+        with self.lock:
+            if not self.in_use[slot]:
+                return
+            self.clear_obstacles(slot)
+            self.in_use[slot] = False
+            self.lava_on[slot] = False
+            self._free_slots.append(slot)
+
+    def set_lava_zone(self, slot: int, zone: Optional[Iterable[int]]):
+        """용암 데미지 영역 설정 ((x_start, x_end, y_start) 또는 None)"""
+        if zone is None:
+            self.lava_on[slot] = False
+            return
+        x0, x1, y0 = zone
+        self.lava_x0[slot] = x0
+        self.lava_x1[slot] = x1
+        self.lava_y0[slot] = y0
+        self.lava_on[slot] = True
+
+    # ========== 장애물 ==========
+
+    def spawn(self, slot: int, **obstacle):
+        """슬롯에 장애물 추가 (ObstacleStore.spawn 인자)"""
+        with self.lock:
+            self.obstacles.spawn(owner=slot, **obstacle)
+            self.slot_version[slot] += 1
+
+    def clear_obstacles(self, slot: int):
+        """슬롯의 장애물 전체 제거"""
+        with self.lock:
+            store = self.obstacles
+            n = store.count
+            store.alive[:n] &= store.owner[:n] != slot
+            store.compact()
+            self.slot_version[slot] += 1
+
+    def obstacle_indices(self, slot: int) -> np.ndarray:
+        """슬롯의 장애물 행 인덱스 (생성 순서)"""
+        with self.lock:
+            store = self.obstacles
+            if self._group_version != store.version:
+                n = store.count
+                owner = store.owner[:n]
+                self._group_order = np.argsort(owner, kind='stable')
+                sorted_owner = owner[self._group_order]
+                slots = np.arange(self.capacity)
+                self._group_starts = np.searchsorted(sorted_owner, slots, side='left')
+                self._group_ends = np.searchsorted(sorted_owner, slots, side='right')
+                self._group_version = store.version
+            return self._group_order[self._group_starts[slot]:self._group_ends[slot]]
+
+    def encode_states(self, slots: Sequence[int]) -> np.ndarray:
+        """
+        슬롯들의 정책 입력 벡터 (state_encoder.encode_states 한 번, 잠금 한 번)
+
+        Returns:
+            (len(slots), STATE_DIM) float32, slots 순서
+        """
+        slots = np.asarray(slots, dtype=np.intp)
+        with self.lock:
+            store = self.obstacles
+            n = store.count
+            row = np.full(self.capacity, -1, dtype=np.intp)
+            row[slots] = np.arange(len(slots))
+            owner_row = row[store.owner[:n]]
+            keep = (owner_row >= 0) & store.alive[:n]
+            half = store.size[:n][keep] / 2
+            return encode_states(self.player_x[slots], self.player_y[slots], self.player_vy[slots],
+                                 store.x[:n][keep] + half, store.y[:n][keep] + half,
+                                 store.type[:n][keep], owner_row[keep],
+                                 width=self.width, height=self.height, player_size=self.player_size)
+
+    # ========== 배치 스텝 ==========
+
+    def step(self, slots: Optional[Iterable[int]] = None) -> PhysicsStepResult:
+        """
+        지정된 슬롯(None이면 사용 중인 전체)을 한 프레임 진행
+
+        Returns:
+            슬롯별 결과 (self.last_result 에도 저장)
+        """
+        with self.lock:
+            capacity = self.capacity
+            if slots is None:
+                active = self.in_use.copy()
+            else:
+                active = np.zeros(capacity, dtype=bool)
+                active[np.fromiter(slots, dtype=np.int64)] = True
+                active &= self.in_use
+
+            result = PhysicsStepResult(capacity)
+            result.stepped = active
+            self.slot_version[active] += 1
+            size = self.player_size
+
+            # 중력 + 바닥 충돌
+            floor_y = self.height - size
+            self.player_vy[active] += self.gravity
+            self.player_y[active] += self.player_vy[active]
+            on_floor = active & (self.player_y >= floor_y)
+            self.player_y[on_floor] = floor_y
+            self.player_vy[on_floor] = 0
+
+            # 장애물 이동 + wrap
+            store = self.obstacles
+            n = store.count
+            if n:
+                owner = store.owner[:n]
+                moving = active[owner]
+                store.step(self.width, moving)
+
+                # 화면 밖 장애물 제거 (게임별 집계)
+                culled = moving & (store.y[:n] >= self.height)
+                result.cleared = np.bincount(owner[culled], minlength=capacity)
+                store.alive[:n] &= ~culled
+
+                # 플레이어 vs 장애물 AABB
+                px = self.player_x[owner]
+                py = self.player_y[owner]
+                x, y, obj_size = store.x[:n], store.y[:n], store.size[:n]
+                hits = (moving & store.alive[:n] &
+                        (px < x + obj_size) & (px + size > x) &
+                        (py < y + obj_size) & (py + size > y))
+
+                obj_type = store.type[:n]
+                meteor_hits = hits & (obj_type == TYPE_METEOR)
+                result.meteor_hit = np.bincount(owner[meteor_hits], minlength=capacity) > 0
+
+                # 별은 획득 즉시 제거 (메테오는 남김)
+                star_hits = hits & (obj_type == TYPE_STAR)
+                result.stars = np.bincount(owner[star_hits], minlength=capacity)
+                store.alive[:n] &= ~star_hits
+                store.compact()
+
+            # 용암 데미지
+            px, py = self.player_x, self.player_y
+            in_lava = (active & self.lava_on &
+                       (px + size > self.lava_x0) & (px < self.lava_x1) &
+                       (py + size > self.lava_y0))
+            self.player_health[in_lava] -= self.lava_damage
+            result.lava_dead = in_lava & (self.player_health <= 0)
+
+            self.last_result = result
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """엔진 현황"""
+        with self.lock:
+            return {
+                'capacity': self.capacity,
+                'games': int(np.count_nonzero(self.in_use)),
+                'obstacles': len(self.obstacles),
+                'obstacle_capacity': self.obstacles.capacity
+            }
+
+
+class ObstacleView:
+    """
+    게임 하나의 장애물 뷰
+
+    Game이 쓰던 ObstacleStore API(spawn/clear/as_dicts/columns/len)를
+    공유 엔진 위에서 슬롯 단위로 제공한다.
+    """
+
+    def __init__(self, engine: BatchPhysicsEngine, slot: int):
+        self.engine = engine
+        self.slot = slot
+        self._cache_version = -1
+        self._cache: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.engine.obstacle_indices(self.slot))
+
+    def spawn(self, **obstacle):
+        self.engine.spawn(self.slot, **obstacle)
+
+    def clear(self):
+        self.engine.clear_obstacles(self.slot)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """이 게임 장애물 컬럼 (복사본)"""
+        with self.engine.lock:
+            return self.engine.obstacles.columns(self.engine.obstacle_indices(self.slot))
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        """dict 리스트 뷰 (이 게임의 장애물이 바뀔 때까지 캐시)"""
+        engine = self.engine
+        with engine.lock:
+            version = int(engine.slot_version[self.slot])
+            if self._cache_version != version:
+                self._cache = engine.obstacles.as_dicts(engine.obstacle_indices(self.slot))
+                self._cache_version = version
+            return self._cache
@@ -12,7 +12,10 @@ TODO for Jeewon:
 
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Any
+import os
+import threading
 import time
+from collections import deque
 
 # OpenCV는 선택적 (실제 YOLO 구현 시 필요)
 try:
@@ -33,15 +36,37 @@ except ImportError:
 # Path import 추가
 from pathlib import Path
 
+# 프로세스 전역 공유 모델 풀
+from .model_registry import ModelRegistry, SharedModel, get_model_registry
+
+# 세션 간 마이크로 배칭 (여러 세션 프레임을 한 번의 forward로)
+from .micro_batcher import MicroBatcher
+
+# ONNX Runtime 백엔드 (torch/ultralytics 없이 추론)
+from .yolo_onnx import ORT_AVAILABLE, ONNXYOLODetector, preprocess, scale_boxes, optimized_model_cache_path
+from vision_agent_shared.yolo_decoder import decode_predictions
+
+# 바뀐 영역만 다시 탐지 (dirty-rect)
+from .roi_detection import DirtyRegionDetector, Rect
+
+# 탐지 사이 프레임 외삽 + track ID
+from .object_tracker import ObjectTracker
+
+# YOLO 데이터셋 클래스 이름
+# 0: player, 1: meteor, 2: star, 3: lava_warning, 4: lava_active
+YOLO_CLASS_NAMES = ['player', 'meteor', 'star', 'lava_warning', 'lava_active']
+
 
 class CVDetectionResult:
     """객체 탐지 결과 클래스"""
     
-    def __init__(self, bbox: List[float], class_id: int, confidence: float, class_name: str = ""):
+    def __init__(self, bbox: List[float], class_id: int, confidence: float, class_name: str = "",
+                 track_id: Optional[int] = None):
         self.bbox = bbox  # [x1, y1, x2, y2]
         self.class_id = class_id
         self.confidence = confidence
         self.class_name = class_name or self._get_class_name(class_id)
+        self.track_id = track_id  # 추적 모드에서만 (프레임 간 같은 객체면 같은 값)
     
     def _get_class_name(self, class_id: int) -> str:
         """클래스 ID를 이름으로 변환"""
@@ -56,12 +81,162 @@ class CVDetectionResult:
     
     def to_dict(self) -> Dict[str, Any]:
         """딕셔너리로 변환 (웹 전송용)"""
-        return {
+        result = {
             'bbox': self.bbox,
             'class_id': self.class_id,
             'confidence': self.confidence,
             'class_name': self.class_name
         }
+        if self.track_id is not None:
+            result['track_id'] = self.track_id
+        return result
+
+
+def make_detections(boxes, scores, class_ids, class_names: Optional[Dict[int, str]] = None) -> List[CVDetectionResult]:
+    """박스/점수/클래스 배열 → CVDetectionResult 리스트"""
+    names = class_names or dict(enumerate(YOLO_CLASS_NAMES))
+    return [
+        CVDetectionResult(
+            bbox=box,
+            class_id=cls,
+            confidence=conf,
+            class_name=names.get(cls, f'class_{cls}')
+        )
+        for box, conf, cls in zip(np.asarray(boxes).tolist(), np.asarray(scores).tolist(),
+                                  np.asarray(class_ids).astype(int).tolist())
+    ]
+
+
+def convert_yolo_result(result) -> List[CVDetectionResult]:
+    """ultralytics Results 하나 → CVDetectionResult 리스트"""
+    boxes = result.boxes
+    if len(boxes) == 0:
+        return []
+    
+    # 텐서 → numpy 한 번에 변환 (박스마다 .cpu() 호출하지 않음)
+    return make_detections(boxes.xyxy.cpu().numpy(), boxes.conf.cpu().numpy(), boxes.cls.cpu().numpy())
+
+
+def run_yolo_batch(handle: SharedModel, frames: List[np.ndarray]) -> List[List[CVDetectionResult]]:
+    """공유 모델로 프레임 리스트를 한 번에 추론 → 프레임별 탐지 리스트 (백엔드 무관)"""
+    model = handle.model
+    if isinstance(model, ONNXYOLODetector):
+        return [
+            make_detections(boxes, scores, class_ids, model.class_names)
+            for boxes, scores, class_ids in handle.run(frames)
+        ]
+    return [convert_yolo_result(r) for r in handle.run(frames, verbose=False)]
+
+
+def _stride_ceil(value: float, stride: int = 32) -> int:
+    """stride 배수로 올림 (최소 stride)"""
+    return max(stride, int(-(-value // stride)) * stride)
+
+
+def run_yolo_regions(handle: SharedModel,
+                     frame: np.ndarray,
+                     rects: List[Rect],
+                     input_shape: Tuple[int, int] = (640, 640)) -> List[List[CVDetectionResult]]:
+    """
+    프레임의 사각형 영역들만 추론 → 영역별 탐지 리스트 (프레임 좌표)
+    
+    영역은 전체 프레임 letterbox와 같은 배율로 줄여 넣어 객체 크기가 전체 탐지 때와 같다.
+    입력 크기는 (영역 크기 × 배율)을 32 배수로 올린 값이고, 같은 크기 영역끼리 한 번에 추론한다.
+    ONNX 백엔드는 dynamic 입력 크기로 export된 모델이어야 한다.
+    """
+    ratio = min(input_shape[0] / frame.shape[0], input_shape[1] / frame.shape[1])
+    groups: Dict[Tuple[int, int], List[int]] = {}
+    for i, (x1, y1, x2, y2) in enumerate(rects):
+        size = (_stride_ceil((y2 - y1) * ratio), _stride_ceil((x2 - x1) * ratio))
+        groups.setdefault(size, []).append(i)
+    
+    model = handle.model
+    results: List[List[CVDetectionResult]] = [[] for _ in rects]
+    for size, indices in groups.items():
+        crops = [frame[rects[i][1]:rects[i][3], rects[i][0]:rects[i][2]] for i in indices]
+        if isinstance(model, ONNXYOLODetector):
+            outputs = [
+                make_detections(boxes, scores, class_ids, model.class_names)
+                for boxes, scores, class_ids in handle.run(crops, input_shape=size)
+            ]
+        else:
+            outputs = [convert_yolo_result(r) for r in handle.run(crops, imgsz=list(size), verbose=False)]
+        
+        # 영역 좌표 → 프레임 좌표
+        for i, detections in zip(indices, outputs):
+            x_offset, y_offset = rects[i][0], rects[i][1]
+            for det in detections:
+                x1, y1, x2, y2 = det.bbox
+                det.bbox = [x1 + x_offset, y1 + y_offset, x2 + x_offset, y2 + y_offset]
+            results[i] = detections
+    return results
+
+
+# ========== 모델별 공유 배처 (모든 세션이 같은 배처로 제출) ==========
+
+def default_batch_size() -> int:
+    """
+    세션 간 마이크로 배치 크기 (CV_BATCH_SIZE, 없으면 CV_INFERENCE_WORKERS)
+
+    게임 세션의 탐지는 CVInferenceWorker 스레드에서만 실행되므로 동시에 모델을
+    호출하는 요청은 워커 수를 넘지 않는다. 배치를 그보다 크게 잡으면 배치가
+    차지 않아 매 탐지가 batch_wait_ms 만큼 기다리기만 하므로, 워커가 1개인
+    기본 설정에서는 배칭을 끈다 (1).
+    """
+    return max(1, int(os.getenv('CV_BATCH_SIZE', os.getenv('CV_INFERENCE_WORKERS', '1'))))
+
+
+_detection_batchers: Dict[Any, Tuple[SharedModel, MicroBatcher]] = {}
+_detection_batchers_lock = threading.Lock()
+
+
+def get_detection_batcher(handle: SharedModel,
+                          max_batch_size: int,
+                          max_wait_ms: float,
+                          registry: Optional[ModelRegistry] = None) -> MicroBatcher:
+    """
+    공유 모델 핸들에 대한 마이크로 배처 (모델 key당 하나)
+    
+    배처는 핸들을 참조하므로, registry가 모델을 유휴 해제하면 배처도 종료하고
+    목록에서 뺀다 (모델 메모리가 실제로 풀리도록). 다시 로드되면 새 핸들로
+    배처를 다시 만든다.
+    """
+    if registry is not None:
+        registry.add_eviction_listener(_close_detection_batcher)
+    
+    with _detection_batchers_lock:
+        entry = _detection_batchers.get(handle.key)
+        if entry is not None and entry[0] is handle:
+            return entry[1]
+        if entry is not None:
+            entry[1].close()
+        
+        def run_batch(frames):
+            # 프레임 리스트를 한 번의 forward로 처리 → 프레임별 결과
+            return run_yolo_batch(handle, frames)
+        
+        batcher = MicroBatcher(run_batch, max_batch_size=max_batch_size,
+                               max_wait_ms=max_wait_ms, name=f"yolo:{Path(str(handle.key)).name}")
+        _detection_batchers[handle.key] = (handle, batcher)
+        print(f"📦 YOLO 마이크로 배칭: batch≤{max_batch_size}, wait≤{max_wait_ms}ms")
+        return batcher
+
+
+def _close_detection_batcher(key: Any, handle: SharedModel):
+    """레지스트리 유휴 해제 리스너: 해제된 핸들의 배처 종료"""
+    with _detection_batchers_lock:
+        entry = _detection_batchers.get(key)
+        if entry is None or entry[0] is not handle:
+            return
+        del _detection_batchers[key]
+    entry[1].close()
+
+
+def get_detection_batcher_stats() -> Dict[str, Any]:
+    """모델별 배처 통계 (배치 크기/지연 히스토그램, 처리량)"""
+    with _detection_batchers_lock:
+        entries = list(_detection_batchers.items())
+    return {str(key): batcher.get_stats() for key, (_, batcher) in entries}
 
 
 class ComputerVisionModule:
@@ -74,21 +249,59 @@ class ComputerVisionModule:
     3. 성능 최적화 (60 FPS 목표)
     """
     
-    def __init__(self, model_path: Optional[str] = None, use_onnx: bool = True):
+    def __init__(self, model_path: Optional[str] = None, use_onnx: bool = True,
+                 registry: Optional[ModelRegistry] = None,
+                 batch_size: Optional[int] = None,
+                 batch_wait_ms: Optional[float] = None,
+                 roi_mode: Optional[bool] = None,
+                 detect_every: Optional[int] = None,
+                 track_velocity: Optional[Dict[int, Tuple[float, float]]] = None):
         """
         초기화
         
         Args:
             model_path: YOLOv8 모델 경로
             use_onnx: ONNX 최적화 사용 여부
+            registry: 공유 모델 레지스트리 (None이면 프로세스 전역 싱글톤)
+            batch_size: 세션 간 마이크로 배치 최대 크기 (None이면 default_batch_size(), 1이면 배칭 안 함)
+            batch_wait_ms: 배치를 모으는 최대 대기 시간 (None이면 CV_BATCH_WAIT_MS)
+            roi_mode: 이전 프레임과 비교해 바뀐 영역만 탐지 (None이면 CV_ROI_MODE, 기본 끔)
+            detect_every: k 프레임마다 한 번만 탐지, 사이 프레임은 추적기가 외삽
+                (None이면 CV_DETECT_EVERY, 1이면 추적 안 함)
+            track_velocity: 클래스별 새 트랙 초기 속도 (px/frame, 예: {1: (0, 5)})
         """
         self.model_path = model_path
         self.use_onnx = use_onnx
         self.model = None
         self.onnx_session = None
+        self.backend = 'simulation'  # 'onnx', 'ultralytics', 'simulation'
         
-        # 성능 측정
-        self.inference_times = []
+        # 공유 모델 핸들 (모든 세션이 같은 가중치 사용)
+        self.registry = registry or get_model_registry()
+        self._model_handle = None
+        
+        # 세션 간 마이크로 배칭 (동시에 여러 세션이 추론할 때만 효과 - 기본은 워커 수만큼)
+        self.batch_size = batch_size if batch_size is not None else default_batch_size()
+        self.batch_wait_ms = batch_wait_ms if batch_wait_ms is not None else float(os.getenv('CV_BATCH_WAIT_MS', '3'))
+        self._batcher = None
+        
+        # dirty-rect 탐지 (세션별 이전 프레임/결과 상태)
+        if roi_mode is None:
+            roi_mode = os.getenv('CV_ROI_MODE', '0') == '1'
+        self.roi = DirtyRegionDetector(
+            refresh_interval=int(os.getenv('CV_ROI_REFRESH', '30'))
+        ) if roi_mode else None
+        
+        # tracking-by-detection (탐지 호출 k배 감소, 객체별 track_id)
+        self.detect_every = detect_every if detect_every is not None else int(os.getenv('CV_DETECT_EVERY', '1'))
+        self.tracker = ObjectTracker(
+            max_age=max(10, 3 * self.detect_every), class_velocity=track_velocity
+        ) if self.detect_every > 1 else None
+        self._last_detect_frame: Optional[int] = None
+        self._track_class_names: Dict[int, str] = {}
+        
+        # 성능 측정 (최근 N회만 유지 - 장시간 세션에서 무한히 쌓이지 않도록)
+        self.inference_times = deque(maxlen=1000)
         self.frame_count = 0
         
         # 초기화
@@ -99,43 +312,96 @@ class ComputerVisionModule:
         모델 초기화
         
         실제 YOLOv8 모델 로드 (지원님 구현 완료)
+        - use_onnx=True 이고 .onnx 모델이 있으면 ONNX Runtime 백엔드 (torch 불필요)
+        - 아니면 ultralytics YOLO
+        - 둘 다 안 되면 시뮬레이션 모드
         """
-        if self.model_path:
+        if not self.model_path:
+            print("⚠️ 모델 경로가 없습니다. 시뮬레이션 모드로 실행합니다.")
+            return
+        
+        # 상대 경로 처리 (AI_model/best_112217.pt)
+        if not os.path.isabs(self.model_path):
+            # 프로젝트 루트 기준으로 경로 조정
+            project_root = Path(__file__).parent.parent.parent
+            full_path = project_root / self.model_path
+            if full_path.exists():
+                self.model_path = str(full_path)
+        
+        onnx_path = self._find_onnx_model() if self.use_onnx else None
+        if onnx_path is not None:
             try:
-                # 실제 YOLO 모델 로드
+                # ONNX Runtime 세션 (프로세스당 한 번, 레지스트리에서 공유 - run()은 스레드 안전)
+                self._model_handle = self.registry.acquire(
+                    onnx_path, loader=lambda: self._load_onnx_detector(onnx_path), thread_safe=True
+                )
+                self.model = self._model_handle.model
+                self.onnx_session = self.model.session
+                self.backend = 'onnx'
+                print(f"✅ YOLOv8 ONNX 모델 연결 (공유): {onnx_path}")
+            except Exception as e:
+                print(f"⚠️ ONNX 모델 로드 실패: {e}. ultralytics로 시도합니다.")
+        
+        if self._model_handle is None:
+            try:
+                # 실제 YOLO 모델 로드 (프로세스당 한 번, 레지스트리에서 공유)
                 from ultralytics import YOLO
-                import os
-                
-                # 상대 경로 처리 (AI_model/best_112217.pt)
-                if not os.path.isabs(self.model_path):
-                    # 프로젝트 루트 기준으로 경로 조정
-                    project_root = Path(__file__).parent.parent.parent
-                    full_path = project_root / self.model_path
-                    if full_path.exists():
-                        self.model_path = str(full_path)
                 
-                self.model = YOLO(self.model_path)
-                print(f"✅ YOLOv8 모델 로드 성공: {self.model_path}")
-                
-                # ONNX 최적화는 나중에 (선택적)
-                # if self.use_onnx:
-                #     optimizer = ONNXModelOptimizer()
-                #     onnx_path = optimizer.export_yolo_model(self.model, 'optimized_yolo.onnx')
-                #     self.onnx_session = optimizer.create_inference_session(onnx_path)
+                model_path = self.model_path
+                self._model_handle = self.registry.acquire(model_path, loader=lambda: YOLO(model_path))
+                self.model = self._model_handle.model
+                self.backend = 'ultralytics'
+                print(f"✅ YOLOv8 모델 연결 (공유): {self.model_path}")
             except ImportError:
                 print("⚠️ ultralytics 패키지가 없습니다. 시뮬레이션 모드로 실행합니다.")
+                return
             except Exception as e:
                 print(f"⚠️ 모델 로드 실패: {e}. 시뮬레이션 모드로 실행합니다.")
-        else:
-            print("⚠️ 모델 경로가 없습니다. 시뮬레이션 모드로 실행합니다.")
+                return
+        
+        if self.batch_size > 1:
+            self._batcher = get_detection_batcher(self._model_handle, self.batch_size, self.batch_wait_ms,
+                                                  registry=self.registry)
     
-    def detect_objects(self, frame: np.ndarray, game_state: Optional[Dict[str, Any]] = None) -> List[CVDetectionResult]:
+    @staticmethod
+    def _load_onnx_detector(onnx_path: str) -> ONNXYOLODetector:
+        """
+        ONNX 탐지기 로드
+        
+        - ORT_GRAPH_CACHE=1이면 최적화 그래프를 디스크에 캐시해 재사용
+        - CV_INPUT_SIZE="480x352" (W x H)면 dynamic 입력 모델을 그 크기로 추론
+          (고정 크기 모델은 export한 크기 그대로 - 예: best_480x352.onnx)
+        """
+        cache_path = optimized_model_cache_path(onnx_path) if os.getenv('ORT_GRAPH_CACHE', '1') == '1' else None
+        input_shape = None
+        if os.getenv('CV_INPUT_SIZE'):
+            width, height = (int(v) for v in os.environ['CV_INPUT_SIZE'].lower().split('x'))
+            input_shape = (height, width)
+        detector = ONNXYOLODetector(onnx_path, optimized_model_path=cache_path, input_shape=input_shape)
+        print(f"⚙️ ONNX 세션 생성 {detector.session_load_ms:.0f}ms (그래프 캐시: {detector.graph_cache}, "
+              f"입력 {detector.input_shape[1]}x{detector.input_shape[0]})")
+        return detector
+    
+    def _find_onnx_model(self) -> Optional[str]:
+        """ONNX 모델 경로 (.onnx 경로 자체 또는 .pt 옆의 같은 이름 .onnx)"""
+        if not ORT_AVAILABLE:
+            return None
+        path = Path(self.model_path)
+        candidate = path if path.suffix == '.onnx' else path.with_suffix('.onnx')
+        return str(candidate) if candidate.exists() else None
+    
+    def detect_objects(self, frame: np.ndarray, game_state: Optional[Dict[str, Any]] = None,
+                       frame_index: Optional[int] = None) -> List[CVDetectionResult]:
         """
         객체 탐지 메인 함수
         
         Args:
             frame: 입력 프레임 (H, W, C)
             game_state: 게임 상태 (시뮬레이션 모드에서 라바 감지용, 선택적)
+            frame_index: 게임 프레임 번호 (추적 모드에서 외삽 기준, None이면 호출 횟수)
+            
+        game_state가 있으면 시뮬레이션 탐지만 하고 추적기(detect_every)/ROI 탐지는 쓰지
+        않는다 - 둘 다 실제 프레임 입력 (app.py의 CV_LIVE_FRAMES 경로)에서만 동작.
             
         Returns:
             탐지된 객체 리스트
@@ -151,7 +417,10 @@ class ComputerVisionModule:
             results = self._simulate_detection(frame, game_state)
         else:
             # 실제 YOLOv8 추론 (실제 프레임이 있을 때만)
-            results = self._real_yolo_detection(frame)
+            if self.tracker is not None:
+                results = self._tracked_detection(frame, self.frame_count if frame_index is None else frame_index)
+            else:
+                results = self._run_detector(frame)
         
         # 성능 측정
         inference_time = time.perf_counter() - start_time
@@ -160,6 +429,43 @@ class ComputerVisionModule:
         
         return results
     
+    def _run_detector(self, frame: np.ndarray) -> List[CVDetectionResult]:
+        """실제 탐지기 한 번 실행 (ROI 모드면 바뀐 영역만)"""
+        if self.roi is not None:
+            return self.roi.detect(frame, self._real_yolo_detection, self._region_detector())
+        return self._real_yolo_detection(frame)
+    
+    def _tracked_detection(self, frame: np.ndarray, frame_index: int) -> List[CVDetectionResult]:
+        """
+        detect_every 프레임마다 탐지 + 추적기 갱신, 사이 프레임은 추적기 외삽만
+        
+        프레임 번호가 뒤로 가면 (새 게임) 트랙을 비우고 바로 탐지한다.
+        """
+        last = self._last_detect_frame
+        if last is not None and frame_index < last:
+            self.tracker.reset()
+            last = None
+        
+        if last is None or frame_index - last >= self.detect_every:
+            detections = self._run_detector(frame)
+            self._last_detect_frame = frame_index
+            for det in detections:
+                self._track_class_names[det.class_id] = det.class_name
+            tracks = self.tracker.update(
+                [det.bbox for det in detections],
+                [det.confidence for det in detections],
+                [det.class_id for det in detections],
+                frame_index
+            )
+        else:
+            tracks = self.tracker.predict(frame_index)
+        
+        return [
+            CVDetectionResult(track['bbox'], track['class_id'], track['confidence'],
+                              self._track_class_names.get(track['class_id'], ''), track_id=track['track_id'])
+            for track in tracks
+        ]
+    
     def _simulate_detection(self, frame: np.ndarray, game_state: Optional[Dict[str, Any]] = None) -> List[CVDetectionResult]:
         """
         시뮬레이션된 객체 탐지 (현재 구현)
@@ -255,83 +561,59 @@ class ComputerVisionModule:
             return self._simulate_detection(frame)
         
         try:
-            # YOLOv8 추론 실행
-            # YOLO 모델은 자동으로 전처리/후처리 수행
-            yolo_results = self.model(frame, verbose=False)
-            
-            # 결과 변환
-            results = []
-            for result in yolo_results:
-                # result.boxes는 탐지된 박스 정보
-                boxes = result.boxes
-                
-                for i in range(len(boxes)):
-                    # 박스 정보 추출
-                    box = boxes.xyxy[i].cpu().numpy()  # [x1, y1, x2, y2]
-                    conf = float(boxes.conf[i].cpu().numpy())  # 신뢰도
-                    cls = int(boxes.cls[i].cpu().numpy())  # 클래스 ID
-                    
-                    # 클래스 이름 매핑 (YOLO 데이터셋 기준)
-                    # 0: player, 1: meteor, 2: star, 3: lava_warning, 4: lava_active
-                    class_names = ['player', 'meteor', 'star', 'lava_warning', 'lava_active']
-                    class_name = class_names[cls] if cls < len(class_names) else f'class_{cls}'
-                    
-                    # CVDetectionResult 생성
-                    detection = CVDetectionResult(
-                        bbox=[float(box[0]), float(box[1]), float(box[2]), float(box[3])],
-                        class_id=cls,
-                        confidence=conf,
-                        class_name=class_name
-                    )
-                    results.append(detection)
+            # 마이크로 배칭: 다른 세션 프레임과 함께 한 번의 forward로 처리
+            if self._batcher is not None:
+                return self._batcher(frame)
             
-            return results
+            # YOLOv8 추론 실행 (공유 모델 - 핸들이 동시 호출을 보호)
+            # ultralytics는 자동으로 전처리/후처리, ONNX는 yolo_onnx의 NumPy 전/후처리
+            return run_yolo_batch(self._model_handle, [frame])[0]
             
         except Exception as e:
             print(f"❌ YOLOv8 추론 오류: {e}")
             # 오류 시 시뮬레이션으로 폴백
             return self._simulate_detection(frame)
     
-    def _preprocess_frame(self, frame: np.ndarray) -> np.ndarray:
+    def _region_detector(self):
+        """영역 탐지 함수 (입력 크기를 바꿀 수 없는 백엔드면 None → 바뀐 프레임은 전체 탐지)"""
+        if self.backend == 'ultralytics' or (self.backend == 'onnx' and self.model.dynamic_shape):
+            input_shape = self.model.input_shape if self.backend == 'onnx' else (640, 640)
+            return lambda frame, rects: run_yolo_regions(self._model_handle, frame, rects, input_shape)
+        return None
+    
+    def _preprocess_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, Any]:
         """
-        YOLOv8 입력을 위한 프레임 전처리
+        YOLOv8 입력을 위한 프레임 전처리 (ONNX 백엔드용)
         
-        TODO for Jeewon: YOLOv8 입력 형식에 맞게 구현
-        """
-        if not CV2_AVAILABLE:
-            # OpenCV 없을 때는 numpy로만 처리
-            # 간단한 리사이즈 (numpy만 사용)
-            # 실제 구현 시에는 OpenCV 필요
-            raise NotImplementedError("OpenCV (cv2)가 필요합니다. 실제 YOLO 구현 시 사용됩니다.")
-        
-        # 예시 구현
-        # 1. 리사이즈 (640x640)
-        # 2. 정규화 (0-1)
-        # 3. HWC → CHW 변환
-        # 4. 배치 차원 추가
-        
-        resized = cv2.resize(frame, (640, 640))
-        normalized = resized.astype(np.float32) / 255.0
-        transposed = np.transpose(normalized, (2, 0, 1))
-        batched = np.expand_dims(transposed, axis=0)
-        
-        return batched
-    
-    def _postprocess_outputs(self, outputs: np.ndarray) -> List[CVDetectionResult]:
-        """
-        YOLOv8 출력 후처리
+        letterbox 리사이즈 → RGB → CHW → 0~1 정규화 → 배치 차원
         
-        TODO for Jeewon: NMS, 신뢰도 필터링 구현
+        Returns:
+            (입력 텐서 (1, 3, H, W), 좌표 복원용 LetterboxInfo)
         """
-        results = []
+        if isinstance(self.model, ONNXYOLODetector):
+            # 스레드별 재사용 버퍼 (다음 호출에서 덮어씀)
+            batch, infos = self.model.preprocessor()([frame])
+        else:
+            batch, infos = preprocess([frame], (640, 640))
+        return batch, infos[0]
+    
+    def _postprocess_outputs(self, outputs: np.ndarray, letterbox_info: Any) -> List[CVDetectionResult]:
+        """
+        YOLOv8 출력 후처리 (ONNX 백엔드용)
         
-        # TODO: 실제 후처리 구현
-        # 1. 신뢰도 임계값 적용
-        # 2. NMS (Non-Maximum Suppression)
-        # 3. 좌표 변환 (정규화 → 픽셀)
-        # 4. CVDetectionResult 객체 생성
+        신뢰도 필터링 → 클래스별 NMS → 좌표 변환 (letterbox → 원본 픽셀) → CVDetectionResult
         
-        return results
+        Args:
+            outputs: 원시 출력 (1, 4+nc, anchors)
+            letterbox_info: _preprocess_frame()이 반환한 변환 정보
+        """
+        detector = self.model if isinstance(self.model, ONNXYOLODetector) else None
+        if detector is not None:
+            boxes, scores, class_ids = detector.decoder.decode(outputs[0])
+        else:
+            boxes, scores, class_ids = decode_predictions(outputs[0])
+        return make_detections(scale_boxes(boxes, letterbox_info), scores, class_ids,
+                               detector.class_names if detector else None)
     
     def get_performance_stats(self) -> Dict[str, float]:
         """성능 통계 반환"""
@@ -341,18 +623,31 @@ class ComputerVisionModule:
         avg_time = np.mean(self.inference_times)
         avg_fps = 1.0 / avg_time if avg_time > 0 else 0
         
-        return {
+        stats = {
             'avg_inference_time_ms': avg_time * 1000,
             'avg_fps': avg_fps,
             'target_fps': 60.0,
             'meets_target': avg_fps >= 57.0,  # 95% of 60 FPS
             'total_frames': self.frame_count
         }
+        if self.roi is not None:
+            stats['roi'] = self.roi.get_stats()
+        if self.tracker is not None:
+            stats['tracker'] = self.tracker.get_stats()
+        return stats
     
     def reset_performance_stats(self):
         """성능 통계 초기화"""
-        self.inference_times = []
+        self.inference_times.clear()
         self.frame_count = 0
+    
+    def close(self):
+        """공유 모델 참조 반환 (세션 종료 시 호출)"""
+        if self._model_handle is not None:
+            self.registry.release(self._model_handle.key)
+            self._model_handle = None
+            self._batcher = None
+            self.model = None
 
 
 # Jeewon이 사용할 헬퍼 함수들
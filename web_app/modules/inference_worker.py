@@ -0,0 +1,273 @@
+"""
+CV Inference Worker - 게임 루프 밖 비동기 추론
+
+실제 YOLO 추론(수십 ms)을 틱 안에서 동기로 돌리면 33ms 예산을 넘기므로,
+게임은 프레임을 제출만 하고 완료된 최신 결과를 블로킹 없이 읽어간다.
+
+- 세션(key)당 대기 요청은 최대 1개: 새 프레임이 오면 이전 대기 요청은 버림 (latest-frame-wins)
+- 같은 세션의 추론은 동시에 하나만 실행 (결과 순서 보장) - discard() 뒤에도
+  실행 중인 요청이 끝날 때까지는 슬롯을 유지하고, 그 결과만 버림
+- 결과에는 제출 시점의 프레임 번호가 남아 있어 staleness(프레임 단위)를 계산할 수 있음
+- 워커는 스레드 풀 (torch/onnxruntime 추론은 GIL을 놓으므로 스레드로 충분)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
+
+import numpy as np
+
+
+class InferenceResult:
+    """완료된 추론 결과"""
+
+    def __init__(self, detections: List[Any], frame_index: int, tag: Any,
+                 submitted_at: float, completed_at: float):
+        self.detections = detections
+        self.frame_index = frame_index      # 제출 시점의 게임 프레임
+        self.tag = tag                      # 제출자가 붙인 식별 값 (예: 용암 상태)
+        self.submitted_at = submitted_at
+        self.completed_at = completed_at
+
+    @property
+    def latency_ms(self) -> float:
+        """제출 → 완료까지 걸린 시간"""
+        return (self.completed_at - self.submitted_at) * 1000
+
+    def staleness(self, current_frame: int) -> int:
+        """현재 프레임 기준으로 몇 프레임 지난 결과인지"""
+        return max(0, current_frame - self.frame_index)
+
+
+class _Request:
+    """대기 중인 추론 요청"""
+
+    __slots__ = ('detect_fn', 'frame', 'game_state', 'frame_index', 'tag', 'submitted_at')
+
+    def __init__(self, detect_fn, frame, game_state, frame_index, tag):
+        self.detect_fn = detect_fn
+        self.frame = frame
+        self.game_state = game_state
+        self.frame_index = frame_index
+        self.tag = tag
+        self.submitted_at = time.perf_counter()
+
+
+class CVInferenceWorker:
+    """
+    세션별 최신 프레임만 처리하는 비동기 추론 워커
+
+    사용 예:
+        worker.submit(sid, cv_module.detect_objects, frame, frame_index=game.frame)
+        result = worker.latest(sid)   # 블로킹 없음, 아직 없으면 None
+    """
+
+    def __init__(self, num_workers: int = 1, history_size: int = 300, name: str = "cv"):
+        """
+        Args:
+            num_workers: 추론 스레드 수
+            history_size: 지연 통계에 유지할 최근 결과 수
+            name: 로그/스레드 이름
+        """
+        if num_workers < 1:
+            raise ValueError(f"Invalid num_workers: {num_workers}")
+
+        self.num_workers = num_workers
+        self.name = name
+
+        self._cond = threading.Condition()
+        self._pending: Dict[Hashable, _Request] = {}
+        self._ready: Deque[Hashable] = deque()  # 대기 요청이 있는 key (제출 순서)
+        self._inflight: set = set()
+        self._discarded: set = set()  # 실행 중에 discard()된 key (결과 버림)
+        self._results: Dict[Hashable, InferenceResult] = {}
+        self._threads: List[threading.Thread] = []
+        self._running = False
+
+        # 통계
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0    # 처리되기 전에 더 새 프레임으로 교체된 요청
+        self.failed = 0
+        self._latencies_ms: Deque[float] = deque(maxlen=history_size)
+
+    # ========== 수명 주기 ==========
+
+    def start(self):
+        """워커 스레드 시작"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+
+        for i in range(self.num_workers):
+            thread = threading.Thread(target=self._run, name=f"{self.name}-infer-{i}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+        print(f"🧵 [{self.name}] 추론 워커 시작 ({self.num_workers} threads)")
+
+    def stop(self, timeout: float = 2.0):
+        """워커 스레드 정지 (대기 요청은 버림)"""
+        with self._cond:
+            self._running = False
+            self._pending.clear()
+            self._ready.clear()
+            self._cond.notify_all()
+
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    # ========== 제출 / 조회 ==========
+
+    def submit(self,
+               key: Hashable,
+               detect_fn: Callable[..., List[Any]],
+               frame: np.ndarray,
+               frame_index: int,
+               game_state: Optional[Dict[str, Any]] = None,
+               tag: Any = None) -> bool:
+        """
+        추론 요청 제출 (블로킹 없음)
+
+        frame은 처리될 때까지 수정하면 안 된다 (복사하지 않음).
+
+        Args:
+            key: 세션 식별자
+            detect_fn: detect_fn(frame, game_state, frame_index=frame_index) → 탐지 리스트
+            frame: detect_fn의 첫 인자 (입력 프레임, 또는 detect_fn이 디코딩할 이미지 바이트)
+            frame_index: 제출 시점 게임 프레임 번호
+            game_state: detect_fn에 넘길 게임 상태 (선택)
+            tag: 결과에 그대로 붙는 값 (결과가 아직 유효한지 판단용)
+
+        Returns:
+            이전 대기 요청을 대체했으면 True
+        """
+        request = _Request(detect_fn, frame, game_state, frame_index, tag)
+
+        with self._cond:
+            replaced = key in self._pending
+            self._pending[key] = request
+            self.submitted += 1
+            if replaced:
+                self.dropped += 1
+            elif key not in self._inflight:
+                self._ready.append(key)
+                self._cond.notify()
+
+        return replaced
+
+    def latest(self, key: Hashable) -> Optional[InferenceResult]:
+        """완료된 최신 결과 (없으면 None, 블로킹 없음)"""
+        return self._results.get(key)
+
+    def discard(self, key: Hashable):
+        """
+        세션 종료/재시작: 대기 요청과 결과 제거
+
+        실행 중인 요청은 끝날 때까지 in-flight로 남고 (같은 세션 동시 실행 방지),
+        완료되면 결과만 버린다.
+        """
+        with self._cond:
+            self._pending.pop(key, None)
+            self._results.pop(key, None)
+            if key in self._inflight:
+                self._discarded.add(key)
+            try:
+                self._ready.remove(key)
+            except ValueError:
+                pass
+
+    # ========== 워커 루프 ==========
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._ready:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                key = self._ready.popleft()
+                request = self._pending.pop(key)
+                self._inflight.add(key)
+
+            detections = None
+            try:
+                detections = request.detect_fn(request.frame, request.game_state,
+                                               frame_index=request.frame_index)
+            except Exception as e:
+                print(f"❌ [{self.name}] 추론 오류 ({key}): {e}")
+
+            completed_at = time.perf_counter()
+
+            with self._cond:
+                self._inflight.discard(key)
+                if key in self._discarded:
+                    # 처리 중에 discard() 된 세션: 결과 버림
+                    self._discarded.discard(key)
+                elif detections is None:
+                    self.failed += 1
+                else:
+                    previous = self._results.get(key)
+                    if previous is None or previous.frame_index <= request.frame_index:
+                        self._results[key] = InferenceResult(
+                            detections, request.frame_index, request.tag,
+                            request.submitted_at, completed_at
+                        )
+                    self.completed += 1
+                    self._latencies_ms.append((completed_at - request.submitted_at) * 1000)
+
+                # 처리 중에 들어온 새 프레임은 이제 실행 가능
+                if key in self._pending:
+                    self._ready.append(key)
+                    self._cond.notify()
+
+    # ========== 통계 ==========
+
+    def get_stats(self) -> Dict[str, Any]:
+        """제출/완료/버림 카운트와 지연 통계"""
+        with self._cond:
+            latencies = np.array(self._latencies_ms) if self._latencies_ms else None
+            stats = {
+                'workers': self.num_workers,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'pending': len(self._pending),
+                'inflight': len(self._inflight),
+            }
+
+        if latencies is not None:
+            stats['latency_ms'] = {
+                'avg': float(latencies.mean()),
+                'p95': float(np.percentile(latencies, 95)),
+                'max': float(latencies.max())
+            }
+        return stats
+
+
+# ========== 싱글톤 인스턴스 (앱 전역 사용) ==========
+
+_inference_worker_instance = None
+_inference_worker_lock = threading.Lock()
+
+
+def get_inference_worker() -> CVInferenceWorker:
+    """
+    CVInferenceWorker 싱글톤 인스턴스 반환 (최초 호출 시 시작)
+
+    스레드 수는 CV_INFERENCE_WORKERS 환경 변수로 설정 (기본 1)
+    """
+    global _inference_worker_instance
+
+    with _inference_worker_lock:
+        if _inference_worker_instance is None:
+            num_workers = int(os.getenv('CV_INFERENCE_WORKERS', '1'))
+            _inference_worker_instance = CVInferenceWorker(num_workers=num_workers)
+            _inference_worker_instance.start()
+
+    return _inference_worker_instance
@@ -0,0 +1,217 @@
+"""
+Micro Batcher - 여러 세션 요청을 모아 한 번에 추론
+
+세션마다 배치 크기 1로 모델을 호출하는 대신, 짧은 시간(max_wait_ms) 동안
+들어온 요청을 최대 max_batch_size 개까지 모아 batch_fn 한 번으로 처리하고
+결과를 각 요청자에게 돌려준다.
+
+- 첫 요청이 도착한 시점부터 max_wait_ms 가 지나거나 배치가 가득 차면 실행
+- 요청자는 Future로 결과를 받음 (submit / submit_many) 또는 블로킹 호출 (__call__)
+- 배치 크기 / 대기 시간 / 전체 지연 히스토그램과 처리량 통계 노출
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 지연 히스토그램 버킷 경계 (ms)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class _Histogram:
+    """고정 버킷 히스토그램 (마지막 버킷은 상한 초과)"""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+
+    def add(self, value: float):
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def to_dict(self) -> Dict[str, int]:
+        labels = [f"<={bound:g}" for bound in self.bounds] + [f">{self.bounds[-1]:g}"]
+        return dict(zip(labels, self.counts))
+
+
+class MicroBatcher:
+    """
+    요청 마이크로 배칭 프런트엔드
+
+    사용 예:
+        batcher = MicroBatcher(lambda frames: model(frames), max_batch_size=8, max_wait_ms=3)
+        detections = batcher(frame)          # 블로킹
+        future = batcher.submit(frame)       # 비블로킹
+    """
+
+    def __init__(self,
+                 batch_fn: Callable[[List[Any]], Sequence[Any]],
+                 max_batch_size: int = 8,
+                 max_wait_ms: float = 3.0,
+                 history_size: int = 1000,
+                 name: str = "batch"):
+        """
+        Args:
+            batch_fn: 입력 리스트 → 같은 순서의 출력 리스트
+            max_batch_size: 한 번에 처리할 최대 요청 수
+            max_wait_ms: 첫 요청 이후 배치를 모으는 최대 시간
+            history_size: 처리량 계산에 유지할 최근 배치 수
+            name: 로그/스레드 이름
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"Invalid max_batch_size: {max_batch_size}")
+
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._cond = threading.Condition()
+        self._queue: Deque[Tuple[Any, Future, float]] = deque()
+
+        # 통계
+        self.batches = 0
+        self.items = 0
+        self.failed_batches = 0
+        self._batch_size_counts = [0] * (max_batch_size + 1)
+        self._wait_hist = _Histogram(LATENCY_BUCKETS_MS)
+        self._latency_hist = _Histogram(LATENCY_BUCKETS_MS)
+        self._recent: Deque[Tuple[float, int]] = deque(maxlen=history_size)  # (완료 시각, 배치 크기)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"{name}-batcher", daemon=True)
+        self._thread.start()
+
+    # ========== 요청 ==========
+
+    def submit(self, item: Any) -> Future:
+        """요청 제출 → 결과 Future"""
+        future = Future()
+        with self._cond:
+            if not self._running:
+                raise RuntimeError(f"MicroBatcher '{self.name}' is closed")
+            self._queue.append((item, future, time.perf_counter()))
+            self._cond.notify()
+        return future
+
+    def submit_many(self, items: Sequence[Any]) -> List[Future]:
+        """
+        여러 요청을 한 번에 제출 (같은 배치에 들어가도록 큐에 원자적으로 추가)
+
+        한 스레드가 N개를 submit()으로 하나씩 넣으면 배치 스레드가 중간에 깨어나
+        배치가 쪼개질 수 있다.
+        """
+        futures = [Future() for _ in items]
+        with self._cond:
+            if not self._running:
+                raise RuntimeError(f"MicroBatcher '{self.name}' is closed")
+            now = time.perf_counter()
+            self._queue.extend((item, future, now) for item, future in zip(items, futures))
+            self._cond.notify()
+        return futures
+
+    def __call__(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """요청 제출 후 결과까지 블로킹"""
+        return self.submit(item).result(timeout=timeout)
+
+    def close(self):
+        """배처 종료 (남은 요청은 취소)"""
+        with self._cond:
+            self._running = False
+            pending = list(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+        for _, future, _ in pending:
+            future.cancel()
+        self._thread.join(timeout=2.0)
+
+    # ========== 배치 루프 ==========
+
+    def _collect(self) -> List[Tuple[Any, Future, float]]:
+        """첫 요청 이후 max_wait 또는 max_batch_size 까지 모으기"""
+        with self._cond:
+            while self._running and not self._queue:
+                self._cond.wait()
+            if not self._running:
+                return []
+
+            deadline = self._queue[0][2] + self.max_wait
+            while len(self._queue) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or not self._running:
+                    break
+                self._cond.wait(remaining)
+
+            count = min(len(self._queue), self.max_batch_size)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                if not self._running:
+                    return
+                continue
+
+            started = time.perf_counter()
+            inputs = [item for item, _, _ in batch]
+            try:
+                outputs = self.batch_fn(inputs)
+                if len(outputs) != len(inputs):
+                    raise RuntimeError(f"batch_fn returned {len(outputs)} outputs for {len(inputs)} inputs")
+            except Exception as e:
+                self.failed_batches += 1
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            finished = time.perf_counter()
+            for (_, future, _), output in zip(batch, outputs):
+                future.set_result(output)
+
+            with self._cond:
+                self.batches += 1
+                self.items += len(batch)
+                self._batch_size_counts[len(batch)] += 1
+                self._recent.append((finished, len(batch)))
+                for _, _, submitted in batch:
+                    self._wait_hist.add((started - submitted) * 1000)
+                    self._latency_hist.add((finished - submitted) * 1000)
+
+    # ========== 통계 ==========
+
+    def get_stats(self) -> Dict[str, Any]:
+        """배치 크기 / 대기 / 지연 히스토그램과 처리량"""
+        with self._cond:
+            recent = list(self._recent)
+            stats = {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000,
+                'batches': self.batches,
+                'items': self.items,
+                'failed_batches': self.failed_batches,
+                'queued': len(self._queue),
+                'avg_batch_size': self.items / self.batches if self.batches else 0.0,
+                'batch_size_hist': {
+                    str(size): count for size, count in enumerate(self._batch_size_counts) if count
+                },
+                'queue_wait_ms_hist': self._wait_hist.to_dict(),
+                'latency_ms_hist': self._latency_hist.to_dict(),
+            }
+
+        # 최근 배치 구간의 처리량 (요청/초)
+        if len(recent) >= 2:
+            span = recent[-1][0] - recent[0][0]
+            items = sum(size for _, size in recent[1:])
+            stats['throughput_per_s'] = items / span if span > 0 else 0.0
+        else:
+            stats['throughput_per_s'] = 0.0
+        stats['recent_avg_batch_size'] = float(np.mean([size for _, size in recent])) if recent else 0.0
+        return stats
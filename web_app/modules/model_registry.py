@@ -0,0 +1,242 @@
+"""
+Model Registry - 프로세스 전역 공유 모델 풀
+
+소켓 연결마다 YOLO 가중치를 새로 로드하지 않도록, 모델을 경로(key)별로
+프로세스당 한 번만 로드해서 모든 Game 인스턴스가 공유한다.
+
+- 지연 초기화: 첫 acquire() 시점에 로드
+- 스레드 안전: key별 로드 락 (같은 모델을 두 번 로드하지 않음)
+- 참조 카운팅: acquire()/release() 쌍
+- 유휴 제거: 참조가 0이 된 뒤 idle_timeout 이 지나면 메모리에서 해제
+  (백그라운드 스위퍼가 sweep_interval 마다 확인 - 연결이 없어도 해제됨)
+- 해제 리스너: 핸들을 붙잡고 있는 부가 객체(마이크로 배처 등)도 함께 정리
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class SharedModel:
+    """레지스트리가 관리하는 공유 모델 핸들"""
+
+    def __init__(self, key: Hashable, thread_safe: bool = False):
+        self.key = key
+        self.model = None
+        self.thread_safe = thread_safe
+        self.refcount = 0
+        self.last_used = time.monotonic()
+        self.load_time = 0.0
+
+        self.load_lock = threading.Lock()
+        # 스레드 안전하지 않은 모델(ultralytics 등)은 추론을 직렬화
+        self.inference_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self.model is not None
+
+    def run(self, *args, **kwargs) -> Any:
+        """공유 모델로 추론 실행 (필요하면 락으로 보호)"""
+        self.last_used = time.monotonic()
+        if self.thread_safe:
+            return self.model(*args, **kwargs)
+        with self.inference_lock:
+            return self.model(*args, **kwargs)
+
+
+class ModelRegistry:
+    """
+    공유 모델 레지스트리
+
+    사용 예:
+        handle = registry.acquire(path, loader=lambda: YOLO(path))
+        results = handle.run(frame, verbose=False)
+        registry.release(path)
+    """
+
+    def __init__(self, idle_timeout: float = 300.0, sweep_interval: Optional[float] = None):
+        """
+        Args:
+            idle_timeout: 참조가 없는 모델을 메모리에 유지하는 시간 (초)
+            sweep_interval: 유휴 모델 확인 주기 (초, 기본 idle_timeout / 2를 1~60초로 제한)
+        """
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval if sweep_interval is not None else max(min(idle_timeout / 2, 60.0), 1.0)
+        self._models: Dict[Hashable, SharedModel] = {}
+        self._lock = threading.Lock()
+
+        self._sweep_stop = threading.Event()
+        self._sweep_thread: Optional[threading.Thread] = None
+        self._eviction_listeners: List[Callable[[Hashable, SharedModel], None]] = []
+
+    def acquire(self,
+                key: Hashable,
+                loader: Callable[[], Any],
+                thread_safe: bool = False) -> SharedModel:
+        """
+        모델 핸들 획득 (없으면 로드) + 참조 카운트 증가
+
+        Args:
+            key: 모델 식별자 (보통 모델 경로)
+            loader: 모델을 로드하는 함수 (최초 1회만 호출)
+            thread_safe: 모델 호출이 동시 실행에 안전한지 여부
+
+        Raises:
+            loader에서 발생한 예외 (참조 카운트는 증가하지 않음)
+        """
+        # 지금 가져갈 모델은 제외 (해제 직후 다시 로드하지 않도록)
+        self.evict_idle(keep=key)
+
+        with self._lock:
+            handle = self._models.get(key)
+            if handle is None:
+                handle = SharedModel(key, thread_safe=thread_safe)
+                self._models[key] = handle
+            handle.refcount += 1
+
+        # 로드는 전역 락 밖에서 (다른 모델 acquire를 막지 않도록)
+        try:
+            with handle.load_lock:
+                if not handle.loaded:
+                    start_time = time.perf_counter()
+                    handle.model = loader()
+                    handle.load_time = time.perf_counter() - start_time
+                    print(f"📦 공유 모델 로드: {key} ({handle.load_time:.2f}s)")
+        except Exception:
+            with self._lock:
+                handle.refcount -= 1
+                if handle.refcount <= 0 and not handle.loaded:
+                    self._models.pop(key, None)
+            raise
+
+        handle.last_used = time.monotonic()
+        return handle
+
+    def release(self, key: Hashable):
+        """참조 카운트 감소 (0이 되어도 idle_timeout 동안은 유지)"""
+        with self._lock:
+            handle = self._models.get(key)
+            if handle is None:
+                return
+            handle.refcount = max(0, handle.refcount - 1)
+            handle.last_used = time.monotonic()
+
+        self.evict_idle()
+
+    def evict_idle(self, now: Optional[float] = None, keep: Optional[Hashable] = None) -> List[Hashable]:
+        """
+        참조가 없고 idle_timeout 이상 사용되지 않은 모델 해제
+
+        Args:
+            now: 기준 시각 (time.monotonic, 기본 현재)
+            keep: 제외할 key (acquire 중인 모델)
+        """
+        now = time.monotonic() if now is None else now
+        evicted = []
+
+        with self._lock:
+            for key, handle in list(self._models.items()):
+                if (key != keep and handle.refcount == 0 and handle.loaded
+                        and now - handle.last_used >= self.idle_timeout):
+                    del self._models[key]
+                    evicted.append((key, handle))
+            listeners = list(self._eviction_listeners)
+
+        # 리스너는 락 밖에서 (배처 종료처럼 스레드 join이 있을 수 있음)
+        for key, handle in evicted:
+            print(f"🧹 유휴 모델 해제: {key}")
+            for listener in listeners:
+                try:
+                    listener(key, handle)
+                except Exception as e:
+                    print(f"⚠️ 모델 해제 리스너 실패 ({key}): {e}")
+
+        return [key for key, _ in evicted]
+
+    def add_eviction_listener(self, listener: Callable[[Hashable, SharedModel], None]):
+        """
+        유휴 해제 시 호출할 함수 등록 (listener(key, handle), 같은 함수는 한 번만)
+
+        핸들을 참조하는 객체를 정리하지 않으면 레지스트리에서 빠져도 모델이
+        메모리에 남는다.
+        """
+        with self._lock:
+            if listener not in self._eviction_listeners:
+                self._eviction_listeners.append(listener)
+
+    # ========== 주기적 유휴 제거 ==========
+
+    def start_sweeper(self):
+        """유휴 제거 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._sweep_thread is not None and self._sweep_thread.is_alive():
+            return
+        self._sweep_stop.clear()
+        self._sweep_thread = threading.Thread(target=self._run_sweeper, name="model-registry-sweeper", daemon=True)
+        self._sweep_thread.start()
+
+    def stop_sweeper(self, timeout: Optional[float] = None):
+        """유휴 제거 스레드 종료"""
+        self._sweep_stop.set()
+        if self._sweep_thread is not None:
+            self._sweep_thread.join(timeout)
+            self._sweep_thread = None
+
+    def _run_sweeper(self):
+        """sweep_interval 마다 evict_idle() - 마지막 세션이 끊긴 뒤에도 모델이 해제되도록"""
+        while not self._sweep_stop.wait(self.sweep_interval):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                print(f"⚠️ 유휴 모델 정리 실패: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """로드된 모델 및 참조 현황"""
+        now = time.monotonic()
+        with self._lock:
+            models = [
+                {
+                    'key': str(key),
+                    'loaded': handle.loaded,
+                    'refcount': handle.refcount,
+                    'idle_s': now - handle.last_used,
+                    'load_time_s': handle.load_time
+                }
+                for key, handle in self._models.items()
+            ]
+        return {
+            'idle_timeout_s': self.idle_timeout,
+            'sweep_interval_s': self.sweep_interval,
+            'sweeper_running': self._sweep_thread is not None and self._sweep_thread.is_alive(),
+            'models': models
+        }
+
+
+# ========== 싱글톤 인스턴스 (앱 전역 사용) ==========
+
+_model_registry_instance = None
+_model_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    ModelRegistry 싱글톤 인스턴스 반환
+
+    유휴 제거 시간은 MODEL_IDLE_TIMEOUT 환경 변수로 설정 (기본 300초),
+    확인 주기는 MODEL_SWEEP_INTERVAL (기본 timeout / 2, 1~60초).
+    유휴 제거 스레드는 여기서 함께 시작한다.
+    """
+    global _model_registry_instance
+
+    with _model_registry_lock:
+        if _model_registry_instance is None:
+            idle_timeout = float(os.getenv('MODEL_IDLE_TIMEOUT', '300'))
+            sweep_interval = os.getenv('MODEL_SWEEP_INTERVAL')
+            _model_registry_instance = ModelRegistry(
+                idle_timeout=idle_timeout,
+                sweep_interval=float(sweep_interval) if sweep_interval else None
+            )
+            _model_registry_instance.start_sweeper()
+
+    return _model_registry_instance
@@ -0,0 +1,248 @@
+"""
+NumPy MLP - torch 없이 PolicyNetwork / ValueNetwork 추론
+
+PolicyNetwork / ValueNetwork는 은닉층 두 개짜리 MLP인데, Level3Strategy가
+torch.load로 불러오면 torch 전체가 필요하다 (슬림 Docker 이미지의
+web_app/requirements.txt에는 torch가 없음). 이 모듈은 state_dict 가중치를
+contiguous float32 NumPy 배열로 바꿔 두고 forward를 NumPy로 실행한다.
+
+- 로드: .npz (convert_to_npz로 변환) 또는 torch.save로 저장한 state_dict (.pt)를
+  torch 없이 직접 읽음 (zip 안의 pickle에서 텐서 재구성만 허용 - 임의 객체 로드 불가)
+- forward: 층마다 matmul → bias → ReLU를 스레드별 재사용 버퍼에 in-place로,
+  마지막에 softmax (PolicyNetwork) 또는 그대로 (ValueNetwork)
+- 배치 입력 (N, D) → (N, A), 단일 상태 (D,) → (A,)
+
+변환 (torch가 있는 곳에서 한 번, 또는 torch 없이도 가능):
+    python -m modules.numpy_mlp models/rl/ppo_agent.pt models/rl/ppo_agent.npz
+"""
+
+import pickle
+import re
+import sys
+import threading
+import zipfile
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# torch.save 레거시 스토리지 타입 → NumPy dtype
+TORCH_STORAGE_DTYPES = {
+    'FloatStorage': np.float32,
+    'DoubleStorage': np.float64,
+    'HalfStorage': np.float16,
+    'LongStorage': np.int64,
+    'IntStorage': np.int32,
+    'ShortStorage': np.int16,
+    'CharStorage': np.int8,
+    'ByteStorage': np.uint8,
+    'BoolStorage': np.bool_,
+}
+
+# nn.Sequential 안의 Linear 가중치 키 (예: network.0.weight)
+_LINEAR_KEY = re.compile(r'^(.*?)(\d+)\.weight$')
+
+
+# ============================================================================
+# state_dict 로드 (torch 없이)
+# ============================================================================
+
+def _rebuild_tensor(storage, storage_offset, size, stride, *args):
+    """torch._utils._rebuild_tensor_v2 대체: 스토리지 → (size, stride) 배열 복사본"""
+    itemsize = storage.dtype.itemsize
+    view = np.lib.stride_tricks.as_strided(storage[storage_offset:], shape=tuple(size),
+                                           strides=tuple(s * itemsize for s in stride))
+    return np.array(view)
+
+
+def _rebuild_parameter(data, *args):
+    """torch._utils._rebuild_parameter 대체 (nn.Parameter → 배열)"""
+    return data
+
+
+class _StateDictUnpickler(pickle.Unpickler):
+    """torch.save zip 아카이브의 data.pkl 전용 언피클러 (텐서/OrderedDict만 허용)"""
+
+    def __init__(self, archive: zipfile.ZipFile, prefix: str, byteorder: str):
+        super().__init__(archive.open(f"{prefix}data.pkl"))
+        self.archive = archive
+        self.prefix = prefix
+        self.byteorder = '<' if byteorder == 'little' else '>'
+        self._storages = {}
+
+    def find_class(self, module, name):
+        if module == 'torch._utils' and name == '_rebuild_tensor_v2':
+            return _rebuild_tensor
+        if module == 'torch._utils' and name == '_rebuild_parameter':
+            return _rebuild_parameter
+        if module == 'torch' and name in TORCH_STORAGE_DTYPES:
+            return name
+        if module == 'collections' and name == 'OrderedDict':
+            return OrderedDict
+        raise pickle.UnpicklingError(f"state_dict 파일에 허용되지 않는 객체: {module}.{name}")
+
+    def persistent_load(self, pid):
+        typename, storage_type, key, _location, _numel = pid
+        if typename != 'storage':
+            raise pickle.UnpicklingError(f"알 수 없는 persistent id: {typename}")
+        if key not in self._storages:
+            dtype = np.dtype(TORCH_STORAGE_DTYPES[storage_type]).newbyteorder(self.byteorder)
+            data = self.archive.read(f"{self.prefix}data/{key}")
+            self._storages[key] = np.frombuffer(data, dtype=dtype)
+        return self._storages[key]
+
+
+def load_torch_state_dict(path: str) -> Dict[str, np.ndarray]:
+    """torch.save(state_dict) 파일 (zip 포맷, torch >= 1.6)을 torch 없이 읽기"""
+    with zipfile.ZipFile(path) as archive:
+        pickle_name = next((n for n in archive.namelist() if n.endswith('data.pkl')), None)
+        if pickle_name is None:
+            raise ValueError(f"torch.save zip 아카이브가 아닙니다: {path}")
+        prefix = pickle_name[:-len('data.pkl')]
+        names = set(archive.namelist())
+        byteorder = archive.read(f"{prefix}byteorder").decode() if f"{prefix}byteorder" in names else 'little'
+        return _StateDictUnpickler(archive, prefix, byteorder).load()
+
+
+def load_state_dict(path: str) -> Dict[str, np.ndarray]:
+    """state_dict 로드: .npz 또는 torch.save 파일 (값은 NumPy 배열)"""
+    path = str(path)
+    if path.endswith('.npz'):
+        with np.load(path) as data:
+            return {key: data[key] for key in data.files}
+    return load_torch_state_dict(path)
+
+
+# ============================================================================
+# MLP 엔진
+# ============================================================================
+
+class NumpyMLP:
+    """
+    Linear/ReLU MLP의 NumPy forward
+
+    사용 예:
+        policy = NumpyMLP.from_state_dict(load_state_dict('ppo_agent.pt'), output='softmax')
+        probs = policy(states)         # (N, D) → (N, A)
+        probs = policy(state)          # (D,) → (A,)
+    """
+
+    def __init__(self, layers: List[Tuple[np.ndarray, np.ndarray]], output: Optional[str] = 'softmax'):
+        """
+        Args:
+            layers: (weight (out, in), bias (out,)) 목록 - nn.Linear 순서 그대로
+            output: 'softmax' (PolicyNetwork) 또는 None (ValueNetwork, 로짓 그대로)
+        """
+        if output not in ('softmax', None):
+            raise ValueError(f"Invalid output: {output}")
+        # x @ W.T 를 행 우선으로 계산하도록 (in, out) 전치본을 contiguous하게 보관
+        self.weights = [np.ascontiguousarray(w.T, dtype=np.float32) for w, _ in layers]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for _, b in layers]
+        self.output = output
+        self.state_dim = self.weights[0].shape[0]
+        self.output_dim = self.weights[-1].shape[1]
+        self._local = threading.local()  # 스레드별 은닉층 버퍼 (배치 크기별)
+
+    @classmethod
+    def from_state_dict(cls, state_dict: Dict[str, np.ndarray], prefix: Optional[str] = None,
+                        output: Optional[str] = 'softmax') -> 'NumpyMLP':
+        """
+        nn.Sequential state_dict → NumpyMLP
+
+        Args:
+            state_dict: '<prefix><index>.weight' / '.bias' 키의 Linear 층들
+            prefix: Sequential 키 접두사 (예: 'network.'); None이면 하나뿐인 접두사를 자동 선택
+            output: 'softmax' 또는 None
+        """
+        groups: Dict[str, List[int]] = {}
+        for key, value in state_dict.items():
+            match = _LINEAR_KEY.match(key)
+            if match and np.ndim(value) == 2:
+                groups.setdefault(match.group(1), []).append(int(match.group(2)))
+
+        if prefix is None:
+            if len(groups) != 1:
+                raise ValueError(f"Linear 층 접두사를 지정하세요: {sorted(groups)}")
+            prefix = next(iter(groups))
+        if prefix not in groups:
+            raise ValueError(f"'{prefix}' 접두사의 Linear 층이 없습니다: {sorted(groups)}")
+
+        layers = [(np.asarray(state_dict[f"{prefix}{i}.weight"]), np.asarray(state_dict[f"{prefix}{i}.bias"]))
+                  for i in sorted(groups[prefix])]
+        for (w0, _), (w1, _) in zip(layers, layers[1:]):
+            if w0.shape[0] != w1.shape[1]:
+                raise ValueError(f"층 크기가 맞지 않습니다: {w0.shape} → {w1.shape}")
+        return cls(layers, output=output)
+
+    def _buffers(self, batch_size: int) -> List[np.ndarray]:
+        cache = getattr(self._local, 'buffers', None)
+        if cache is None:
+            cache = self._local.buffers = {}
+        buffers = cache.get(batch_size)
+        if buffers is None:
+            buffers = [np.empty((batch_size, w.shape[1]), dtype=np.float32) for w in self.weights[:-1]]
+            cache[batch_size] = buffers
+        return buffers
+
+    def __call__(self, states: np.ndarray) -> np.ndarray:
+        """
+        Forward
+
+        Args:
+            states: (N, D) 또는 (D,) 상태
+
+        Returns:
+            (N, A) 또는 (A,) 출력 (새 배열 - 은닉층 버퍼만 재사용)
+        """
+        x = np.asarray(states, dtype=np.float32)
+        single = x.ndim == 1
+        if single:
+            x = x[None]
+
+        for weight, bias, buffer in zip(self.weights, self.biases, self._buffers(len(x))):
+            np.matmul(x, weight, out=buffer)
+            buffer += bias
+            np.maximum(buffer, 0.0, out=buffer)
+            x = buffer
+
+        out = x @ self.weights[-1]
+        out += self.biases[-1]
+        if self.output == 'softmax':
+            out -= out.max(axis=1, keepdims=True)
+            np.exp(out, out=out)
+            out /= out.sum(axis=1, keepdims=True)
+        return out[0] if single else out
+
+    def to_state_dict(self, prefix: str = 'network.') -> Dict[str, np.ndarray]:
+        """nn.Sequential(Linear, ReLU, ...) 키 순서의 state_dict (Linear는 짝수 인덱스)"""
+        state_dict = {}
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            state_dict[f"{prefix}{2 * i}.weight"] = np.ascontiguousarray(weight.T)
+            state_dict[f"{prefix}{2 * i}.bias"] = bias
+        return state_dict
+
+
+def load_policy_network(path: str, prefix: Optional[str] = None) -> NumpyMLP:
+    """PolicyNetwork 가중치 (.pt state_dict 또는 .npz) → softmax 출력 NumpyMLP"""
+    return NumpyMLP.from_state_dict(load_state_dict(path), prefix=prefix, output='softmax')
+
+
+def load_value_network(path: str, prefix: Optional[str] = None) -> NumpyMLP:
+    """ValueNetwork 가중치 (.pt state_dict 또는 .npz) → 값 출력 NumpyMLP"""
+    return NumpyMLP.from_state_dict(load_state_dict(path), prefix=prefix, output=None)
+
+
+def convert_to_npz(src: str, dst: str) -> List[str]:
+    """torch state_dict → .npz (모든 텐서 그대로, 키 유지)"""
+    state_dict = load_state_dict(src)
+    arrays = {key: np.asarray(value) for key, value in state_dict.items() if isinstance(value, np.ndarray)}
+    np.savez(dst, **arrays)
+    return list(arrays)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("사용법: python -m modules.numpy_mlp <state_dict.pt> <output.npz>")
+        sys.exit(1)
+    keys = convert_to_npz(sys.argv[1], sys.argv[2])
+    print(f"💾 {len(keys)}개 텐서 변환 완료: {sys.argv[2]}")
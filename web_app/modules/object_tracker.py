@@ -0,0 +1,197 @@
+"""
+Object Tracker - 탐지 사이 프레임을 등속 외삽으로 채우는 tracking-by-detection
+
+게임 객체는 등속 운동(OBJECT_TYPES의 vx, vy)이므로 YOLO를 k 프레임마다 한 번만 돌리고
+그 사이 프레임은 트랙의 속도로 박스를 외삽해도 충분히 정확하다.
+
+- 예측 박스와 새 탐지를 클래스별 IoU로 greedy 매칭 (IoU 행렬은 NumPy로 한 번에)
+- 매칭되면 박스 갱신 + 중심 이동량으로 속도 추정 (지수 평활)
+- 새 트랙은 클래스별 사전 속도로 시작 (예: 메테오 vy=5)
+- max_age 프레임 동안 다시 안 잡히면 트랙 삭제
+- 트랙마다 안정적인 track_id 부여
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """(N, 4) × (M, 4) xyxy 박스 IoU 행렬"""
+    ix1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    iy1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    ix2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    iy2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+class ObjectTracker:
+    """
+    등속 모델 + IoU 매칭 다중 객체 추적기
+
+    사용 예:
+        tracker = ObjectTracker(class_velocity={1: (0, 5), 2: (0, 3)})
+        tracks = tracker.update(boxes, scores, class_ids, frame_index)   # 탐지 프레임
+        tracks = tracker.predict(frame_index + 1)                        # 사이 프레임
+    """
+
+    def __init__(self,
+                 iou_threshold: float = 0.3,
+                 max_age: int = 10,
+                 velocity_smoothing: float = 0.5,
+                 class_velocity: Optional[Dict[int, Tuple[float, float]]] = None):
+        """
+        Args:
+            iou_threshold: 예측 박스와 탐지를 같은 객체로 볼 최소 IoU
+            max_age: 매칭 없이 트랙을 유지할 최대 프레임 수
+            velocity_smoothing: 새 속도 측정값 가중치 (1이면 마지막 측정만 사용)
+            class_velocity: 클래스별 새 트랙 초기 속도 (px/frame)
+        """
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.velocity_smoothing = velocity_smoothing
+        self.class_velocity = dict(class_velocity or {})
+        self._next_id = 1
+        self.reset()
+
+        # 통계
+        self.updates = 0
+        self.predictions = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def reset(self):
+        """모든 트랙 삭제 (track_id는 계속 증가)"""
+        # 트랙 상태 (SoA)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.class_ids = np.zeros(0, dtype=np.int64)
+        self.boxes = np.zeros((0, 4), dtype=np.float64)      # 마지막 탐지 시점 박스
+        self.velocity = np.zeros((0, 2), dtype=np.float64)   # (vx, vy) px/frame
+        self.scores = np.zeros(0, dtype=np.float64)
+        self.last_seen = np.zeros(0, dtype=np.int64)
+        self.hits = np.zeros(0, dtype=np.int64)
+
+    # ========== 예측 ==========
+
+    def predicted_boxes(self, frame_index: int) -> np.ndarray:
+        """frame_index 시점으로 외삽한 트랙 박스 (N, 4)"""
+        shift = self.velocity * (frame_index - self.last_seen)[:, None]
+        return self.boxes + np.tile(shift, 2)
+
+    def predict(self, frame_index: int) -> List[Dict[str, Any]]:
+        """탐지 없이 트랙만 외삽 (사이 프레임용)"""
+        self.predictions += 1
+        self._expire(frame_index)
+        return self._tracks(frame_index)
+
+    # ========== 갱신 ==========
+
+    def update(self,
+               boxes: np.ndarray,
+               scores: np.ndarray,
+               class_ids: np.ndarray,
+               frame_index: int) -> List[Dict[str, Any]]:
+        """
+        새 탐지로 트랙 갱신
+
+        Args:
+            boxes: (M, 4) xyxy
+            scores: (M,)
+            class_ids: (M,)
+            frame_index: 탐지한 프레임 번호
+
+        Returns:
+            frame_index 시점의 트랙 리스트
+        """
+        self.updates += 1
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+        class_ids = np.asarray(class_ids, dtype=np.int64).reshape(-1)
+
+        track_idx, det_idx = self._associate(boxes, class_ids, frame_index)
+
+        # 매칭된 트랙: 중심 이동량 / 경과 프레임 → 속도 (지수 평활)
+        if len(track_idx):
+            elapsed = np.maximum(frame_index - self.last_seen[track_idx], 1)[:, None]
+            old_center = (self.boxes[track_idx, :2] + self.boxes[track_idx, 2:]) / 2
+            new_center = (boxes[det_idx, :2] + boxes[det_idx, 2:]) / 2
+            measured = (new_center - old_center) / elapsed
+            alpha = self.velocity_smoothing
+            self.velocity[track_idx] = alpha * measured + (1 - alpha) * self.velocity[track_idx]
+            self.boxes[track_idx] = boxes[det_idx]
+            self.scores[track_idx] = scores[det_idx]
+            self.last_seen[track_idx] = frame_index
+            self.hits[track_idx] += 1
+
+        # 매칭 안 된 탐지: 새 트랙 (클래스별 사전 속도)
+        new = np.setdiff1d(np.arange(len(boxes)), det_idx)
+        if len(new):
+            count = len(new)
+            prior = np.array([self.class_velocity.get(int(c), (0.0, 0.0)) for c in class_ids[new]],
+                             dtype=np.float64).reshape(count, 2)
+            self.ids = np.concatenate([self.ids, np.arange(self._next_id, self._next_id + count)])
+            self._next_id += count
+            self.class_ids = np.concatenate([self.class_ids, class_ids[new]])
+            self.boxes = np.concatenate([self.boxes, boxes[new]])
+            self.velocity = np.concatenate([self.velocity, prior])
+            self.scores = np.concatenate([self.scores, scores[new]])
+            self.last_seen = np.concatenate([self.last_seen, np.full(count, frame_index)])
+            self.hits = np.concatenate([self.hits, np.ones(count, dtype=np.int64)])
+
+        self._expire(frame_index)
+        return self._tracks(frame_index)
+
+    def _associate(self, boxes: np.ndarray, class_ids: np.ndarray, frame_index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """예측 박스 ↔ 탐지 greedy IoU 매칭 (같은 클래스끼리) → (트랙 인덱스, 탐지 인덱스)"""
+        empty = np.zeros(0, dtype=np.int64)
+        if len(self.ids) == 0 or len(boxes) == 0:
+            return empty, empty
+
+        ious = iou_matrix(self.predicted_boxes(frame_index), boxes)
+        ious[self.class_ids[:, None] != class_ids[None, :]] = 0.0
+
+        # IoU 내림차순으로 트랙/탐지가 모두 비어 있으면 매칭
+        flat = np.argsort(-ious, axis=None)
+        flat = flat[ious.ravel()[flat] >= self.iou_threshold]
+        used_tracks, used_dets = set(), set()
+        track_idx, det_idx = [], []
+        for t, d in zip(*np.unravel_index(flat, ious.shape)):
+            if t not in used_tracks and d not in used_dets:
+                used_tracks.add(t)
+                used_dets.add(d)
+                track_idx.append(t)
+                det_idx.append(d)
+        return np.asarray(track_idx, dtype=np.int64), np.asarray(det_idx, dtype=np.int64)
+
+    def _expire(self, frame_index: int):
+        alive = frame_index - self.last_seen <= self.max_age
+        if alive.all():
+            return
+        for name in ('ids', 'class_ids', 'boxes', 'velocity', 'scores', 'last_seen', 'hits'):
+            setattr(self, name, getattr(self, name)[alive])
+
+    def _tracks(self, frame_index: int) -> List[Dict[str, Any]]:
+        boxes = self.predicted_boxes(frame_index)
+        return [
+            {'track_id': tid, 'bbox': box, 'class_id': cls, 'confidence': score, 'age': age}
+            for tid, box, cls, score, age in zip(
+                self.ids.tolist(), boxes.tolist(), self.class_ids.tolist(), self.scores.tolist(),
+                (frame_index - self.last_seen).tolist()
+            )
+        ]
+
+    # ========== 통계 ==========
+
+    def get_stats(self) -> Dict[str, Any]:
+        """트랙 수와 탐지/외삽 호출 수"""
+        total = self.updates + self.predictions
+        return {
+            'tracks': len(self.ids),
+            'detector_updates': self.updates,
+            'predicted_frames': self.predictions,
+            'detector_call_ratio': self.updates / total if total else 0.0,
+        }
@@ -0,0 +1,171 @@
+"""
+Obstacle Store - NumPy 기반 장애물 저장소 (Structure of Arrays)
+
+장애물을 dict 리스트 대신 미리 할당된 NumPy 컬럼으로 보관하고,
+이동 / 좌우 wrap 을 벡터 연산으로 처리한다.
+여러 게임의 장애물을 한 저장소에 담을 수 있도록 owner(게임 슬롯) 컬럼을 둔다.
+(화면 밖 제거 / 충돌 / 게임별 뷰는 batch_physics.BatchPhysicsEngine 참고)
+
+- 컬럼: id, owner, x, y, vx, vy, size, type, alive
+- 게임 좌표는 정수이므로 위치/속도/크기 컬럼은 int32
+- 배열 [0:count] 구간은 항상 생성 순서대로 촘촘하게 유지 (compact)
+- 기존 호출자(get_state(), AI 전략, 학습 데이터)를 위해 dict 뷰 제공
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# 타입 코드 (state_protocol.OBJECT_TYPE_CODES 와 동일)
+TYPE_METEOR = 0
+TYPE_STAR = 1
+TYPE_NAMES = ('meteor', 'star')
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+
+
+class ObstacleStore:
+    """장애물 SoA 저장소"""
+
+    COLUMNS = ('id', 'owner', 'x', 'y', 'vx', 'vy', 'size', 'type', 'alive')
+
+    def __init__(self, capacity: int = 64):
+        """
+        Args:
+            capacity: 초기 할당 크기 (넘치면 두 배로 확장)
+        """
+        self.count = 0
+        self.version = 0  # 변경될 때마다 증가 (뷰 캐시 무효화용)
+        self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity: int):
+        """컬럼 (재)할당 - 기존 데이터는 보존"""
+        old = getattr(self, 'id', None)
+        columns = {
+            'id': np.zeros(capacity, dtype=np.int64),
+            'owner': np.zeros(capacity, dtype=np.int32),
+            'x': np.zeros(capacity, dtype=np.int32),
+            'y': np.zeros(capacity, dtype=np.int32),
+            'vx': np.zeros(capacity, dtype=np.int32),
+            'vy': np.zeros(capacity, dtype=np.int32),
+            'size': np.zeros(capacity, dtype=np.int32),
+            'type': np.zeros(capacity, dtype=np.int8),
+            'alive': np.zeros(capacity, dtype=bool),
+        }
+        if old is not None:
+            for name, column in columns.items():
+                column[:self.count] = getattr(self, name)[:self.count]
+        for name, column in columns.items():
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return self.count
+
+    def touch(self):
+        """외부에서 컬럼을 직접 수정한 뒤 호출 (뷰 캐시 무효화)"""
+        self.version += 1
+
+    # ========== 생성 / 제거 ==========
+
+    def clear(self):
+        """전체 제거 (할당된 버퍼는 재사용)"""
+        self.alive[:self.count] = False
+        self.count = 0
+        self.touch()
+
+    def spawn(self, obj_id: int, obj_type: str, x: int, y: int, vx: int, vy: int, size: int,
+              owner: int = 0):
+        """장애물 추가 (생성 순서 유지)"""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+
+        i = self.count
+        self.id[i] = obj_id
+        self.owner[i] = owner
+        self.type[i] = TYPE_CODES.get(obj_type, TYPE_METEOR)
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.size[i] = size
+        self.alive[i] = True
+        self.count += 1
+        self.touch()
+
+    def compact(self) -> int:
+        """alive=False 인 슬롯을 제거하고 앞으로 당김 (순서 유지). 제거된 개수 반환"""
+        n = self.count
+        keep = self.alive[:n]
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return 0
+
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:kept] = column[:n][keep]
+        self.alive[kept:n] = False
+        self.count = kept
+        self.touch()
+        return n - kept
+
+    # ========== 벡터화된 물리 ==========
+
+    def step(self, width: int, mask: Optional[np.ndarray] = None):
+        """
+        등속 이동 + 좌우 wrap (화면 밖으로 나가면 반대편에서 등장)
+
+        Args:
+            width: 화면 너비
+            mask: 이동할 장애물 마스크 ([0:count] 구간, None이면 전체)
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        if mask is None:
+            mask = np.ones(n, dtype=bool)
+
+        x = self.x[:n]
+        size = self.size[:n]
+        x += np.where(mask, self.vx[:n], 0).astype(np.int32)
+        self.y[:n] += np.where(mask, self.vy[:n], 0).astype(np.int32)
+
+        left = mask & (x < -size)
+        right = mask & (x > width)
+        x[left] = width
+        x[right] = -size[right]
+        self.touch()
+
+    # ========== 조회 ==========
+
+    def type_mask(self, obj_type: str) -> np.ndarray:
+        """특정 타입 마스크 ([0:count] 구간)"""
+        return self.type[:self.count] == TYPE_CODES[obj_type]
+
+    def columns(self, indices: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        컬럼 조회
+
+        indices가 없으면 활성 구간 뷰(복사 없음), 있으면 해당 행만 복사
+        """
+        if indices is None:
+            return {name: getattr(self, name)[:self.count] for name in self.COLUMNS}
+        return {name: getattr(self, name)[indices] for name in self.COLUMNS}
+
+    def as_dicts(self, indices: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        기존 dict 리스트 형식 (get_state(), AI 전략, 학습 데이터용)
+
+        반환된 dict를 수정해도 저장소에는 반영되지 않는다.
+        """
+        if indices is None:
+            indices = slice(0, self.count)
+        rows = tuple(
+            getattr(self, name)[indices].tolist()
+            for name in ('id', 'type', 'x', 'y', 'vx', 'vy', 'size')
+        )
+        return [
+            {'id': obj_id, 'type': TYPE_NAMES[obj_type], 'x': x, 'y': y,
+             'vx': vx, 'vy': vy, 'size': size}
+            for obj_id, obj_type, x, y, vx, vy, size in zip(*rows)
+        ]
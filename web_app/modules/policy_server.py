@@ -0,0 +1,275 @@
+"""
+Policy Server - 모든 AI 게임의 정책 추론을 배치 forward 한 번으로
+
+Level 3/4 전략이 게임마다 8~10차원 상태 벡터로 정책 네트워크를 따로 호출하면
+연산보다 호출 오버헤드(torch 디스패치, ORT run)가 대부분이다. PolicyServer는
+이번 틱에 결정이 필요한 AI 게임들의 상태 벡터를 (N, D) 배치 하나로 쌓아
+forward를 한 번만 실행하고, 게임별 행동 확률(또는 로짓)을 돌려준다.
+
+- 배칭은 MicroBatcher 재사용: 한 샤드의 게임들은 submit_many()로 한 배치,
+  여러 샤드 스레드가 max_wait_ms 안에 제출하면 샤드를 넘어 합쳐짐
+- 데드라인: decide_many()는 deadline_ms 안에 결과가 안 나온 게임에 None을
+  돌려주고, 전략은 휴리스틱으로 폴백 (정책 때문에 틱을 놓치는 게임 없음)
+- inline 모드 (샤드가 하나일 때): 합칠 다른 제출자가 없으므로 배치 스레드를
+  거치지 않고 호출 스레드에서 바로 forward (스레드 전환 ~40µs 절약).
+  forward를 중간에 끊을 수 없으므로 직전/이동평균 forward 시간이 데드라인을
+  넘으면 forward를 건너뛰고 None (휴리스틱 폴백). 회복을 확인하려고
+  probe_interval번째 호출마다 한 번은 forward를 실행
+- 백엔드: NumpyMLP, PyTorch 모듈 (torch_policy_fn) 또는 ONNX Runtime (onnx_policy_fn)
+"""
+
+import time
+from concurrent.futures import wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .micro_batcher import MicroBatcher
+from .numpy_mlp import NumpyMLP
+
+# 정책 출력 인덱스 → 게임 행동 (0 = 정지)
+POLICY_ACTIONS = (None, 'jump', 'left', 'right')
+
+
+def policy_action(policy_output: np.ndarray) -> Optional[str]:
+    """정책 출력 한 행 (확률 또는 로짓) → 행동"""
+    return POLICY_ACTIONS[int(np.argmax(policy_output))]
+
+
+def torch_policy_fn(model) -> Callable[[np.ndarray], np.ndarray]:
+    """PyTorch 정책 모듈 → (N, D) float32 → (N, A) 함수"""
+    import torch
+
+    model.eval()
+
+    def run(states: np.ndarray) -> np.ndarray:
+        with torch.no_grad():
+            return model(torch.from_numpy(states)).numpy()
+
+    return run
+
+
+def onnx_policy_fn(model_path: str, intra_op_num_threads: int = 1) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    ONNX 정책 모델 → (N, D) float32 → (N, A) 함수
+
+    배치 차원이 1로 고정된 모델은 행 단위로 실행한다 (동적 배치로 다시
+    export하는 편이 빠름).
+    """
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = intra_op_num_threads
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session = ort.InferenceSession(str(model_path), options, providers=['CPUExecutionProvider'])
+    model_input = session.get_inputs()[0]
+    fixed_batch = model_input.shape[0] == 1
+
+    def run(states: np.ndarray) -> np.ndarray:
+        if fixed_batch and len(states) > 1:
+            return np.concatenate([session.run(None, {model_input.name: states[i:i + 1]})[0]
+                                   for i in range(len(states))])
+        return session.run(None, {model_input.name: states})[0]
+
+    run.state_dim = model_input.shape[1] if isinstance(model_input.shape[1], int) else None
+    return run
+
+
+class PolicyServer:
+    """
+    배치 정책 추론 서버
+
+    사용 예:
+        server = PolicyServer(onnx_policy_fn('models/policy.onnx'), deadline_ms=5)
+        outputs = server.decide_many([encode_game_state(g) for g in ai_games])
+        actions = [policy_action(o) if o is not None else fallback(g) for g, o in zip(ai_games, outputs)]
+    """
+
+    def __init__(self,
+                 policy_fn: Callable[[np.ndarray], np.ndarray],
+                 max_batch_size: int = 64,
+                 max_wait_ms: float = 1.0,
+                 deadline_ms: float = 5.0,
+                 state_dim: Optional[int] = None,
+                 inline: bool = False,
+                 probe_interval: int = 10,
+                 name: str = "policy"):
+        """
+        Args:
+            policy_fn: (N, D) float32 상태 배치 → (N, A) 출력
+            max_batch_size: forward 한 번의 최대 게임 수
+            max_wait_ms: 첫 요청 이후 다른 샤드의 요청을 기다리는 시간
+                (샤드가 하나면 0: 샤드의 게임은 submit_many로 이미 한 배치)
+            deadline_ms: 게임이 정책 결과를 기다리는 최대 시간
+            state_dim: 모델 입력 차원 (None이면 policy_fn.state_dim, 없으면 검사 안 함)
+            inline: 배치 스레드 없이 호출 스레드에서 실행 (제출자가 하나뿐일 때)
+            probe_interval: inline 모드에서 forward가 데드라인보다 느려 건너뛰는 동안
+                몇 번째 호출마다 forward를 실행해 시간을 다시 잴지
+            name: 로그/스레드 이름
+        """
+        self.policy_fn = policy_fn
+        self.deadline = deadline_ms / 1000.0
+        self.state_dim = state_dim if state_dim is not None else getattr(policy_fn, 'state_dim', None)
+        self.inline = inline
+        self.name = name
+        self._batcher = None if inline else MicroBatcher(self._run_batch, max_batch_size=max_batch_size,
+                                                         max_wait_ms=max_wait_ms, name=name)
+        self._inline_batches = 0
+
+        # inline 데드라인: 직전/이동평균 forward 시간 (초)
+        self.probe_interval = max(1, probe_interval)
+        self.forward_last = 0.0
+        self.forward_ema = 0.0
+        self._skipped_calls = 0
+
+        # 통계 (샤드 스레드들이 갱신 - 근사치로 충분)
+        self.requests = 0
+        self.deadline_misses = 0
+        self.deadline_skips = 0  # inline: forward를 건너뛰고 폴백한 게임 수
+        self.failures = 0
+
+    def _run_batch(self, states: List[np.ndarray]) -> List[np.ndarray]:
+        batch = np.stack(states).astype(np.float32, copy=False)
+        return list(self.policy_fn(batch))
+
+    # ========== 요청 ==========
+
+    def decide_many(self, states: Sequence[np.ndarray],
+                    deadline_ms: Optional[float] = None) -> List[Optional[np.ndarray]]:
+        """
+        여러 게임의 상태 벡터 → 게임별 정책 출력
+
+        Args:
+            states: 게임별 (D,) 상태 벡터
+            deadline_ms: 이번 호출의 데드라인 (None이면 서버 기본값)
+
+        Returns:
+            states와 같은 순서의 (A,) 출력, 데드라인을 넘기거나 실패한 게임은 None
+        """
+        if not states:
+            return []
+        deadline = self.deadline if deadline_ms is None else deadline_ms / 1000.0
+        if self.inline:
+            return self._decide_inline(states, deadline)
+
+        futures = self._batcher.submit_many(states)
+        wait(futures, timeout=max(0.0, deadline))
+
+        outputs = []
+        for future in futures:
+            if not future.done():
+                self.deadline_misses += 1  # 늦은 결과는 버림 (배치 스레드가 나중에 채움)
+                outputs.append(None)
+            elif future.cancelled() or future.exception() is not None:
+                self.failures += 1
+                outputs.append(None)
+            else:
+                outputs.append(future.result())
+        self.requests += len(states)
+        return outputs
+
+    def _decide_inline(self, states: Sequence[np.ndarray], deadline: float) -> List[Optional[np.ndarray]]:
+        self.requests += len(states)
+
+        # 최근 forward가 데드라인보다 느리면 실행하지 않고 폴백 (probe_interval마다 한 번은 다시 측정)
+        probe = max(self.forward_last, self.forward_ema) > deadline
+        if probe:
+            self._skipped_calls += 1
+            if self._skipped_calls < self.probe_interval:
+                self.deadline_skips += len(states)
+                self.deadline_misses += len(states)
+                return [None] * len(states)
+        self._skipped_calls = 0
+
+        started = time.perf_counter()
+        try:
+            outputs = self._run_batch(states)
+        except Exception:
+            self.failures += len(states)
+            outputs = [None] * len(states)
+        elapsed = time.perf_counter() - started
+        self.forward_last = elapsed
+        if not self._inline_batches or (probe and elapsed <= deadline):
+            self.forward_ema = elapsed  # 회복 확인 (느렸던 구간의 평균은 버림)
+        else:
+            self.forward_ema = 0.8 * self.forward_ema + 0.2 * elapsed
+        self._inline_batches += 1
+
+        if elapsed > deadline:
+            self.deadline_misses += len(states)  # 이번 결과는 이미 기다렸으므로 사용, 다음 호출부터 폴백
+        return outputs
+
+    def decide(self, state: np.ndarray, deadline_ms: Optional[float] = None) -> Optional[np.ndarray]:
+        """게임 하나의 정책 출력 (데드라인 초과 시 None)"""
+        return self.decide_many([state], deadline_ms)[0]
+
+    def close(self):
+        """배치 스레드 종료"""
+        if self._batcher is not None:
+            self._batcher.close()
+
+    # ========== 통계 ==========
+
+    def get_stats(self) -> Dict[str, Any]:
+        """배치 통계 + 데드라인 초과/실패 수"""
+        if self._batcher is not None:
+            stats = self._batcher.get_stats()
+        else:
+            stats = {'batches': self._inline_batches, 'items': self.requests,
+                     'avg_batch_size': self.requests / self._inline_batches if self._inline_batches else 0.0}
+        stats.update({
+            'inline': self.inline,
+            'deadline_ms': self.deadline * 1000,
+            # batched: 결과를 deadline까지만 기다림 / inline: 느린 forward를 건너뜀
+            'deadline_enforcement': 'skip_slow_forward' if self.inline else 'wait_timeout',
+            'state_dim': self.state_dim,
+            'requests': self.requests,
+            'deadline_misses': self.deadline_misses,
+            'failures': self.failures,
+            'deadline_miss_rate': self.deadline_misses / self.requests if self.requests else 0.0,
+        })
+        if self.inline:
+            stats.update({
+                'deadline_skips': self.deadline_skips,
+                'forward_ms_last': self.forward_last * 1000,
+                'forward_ms_ema': self.forward_ema * 1000,
+            })
+        return stats
+
+
+def create_policy_server(strategies: Dict[int, Any],
+                         onnx_model_path: Optional[str] = None,
+                         expected_state_dim: Optional[int] = None,
+                         **kwargs) -> Optional[PolicyServer]:
+    """
+    사용 가능한 정책 모델로 PolicyServer 생성
+
+    ONNX 모델이 있으면 우선 사용하고, 없으면 Level 3 전략이 로드한 PPO 모델
+    (NumpyMLP 또는 PyTorch)을 쓴다. 둘 다 없거나 모델 입력 차원이 expected_state_dim과 다르면
+    None (전략은 휴리스틱으로 동작).
+    """
+    server, backend = None, None
+    if onnx_model_path and Path(onnx_model_path).exists():
+        try:
+            server, backend = PolicyServer(onnx_policy_fn(onnx_model_path), **kwargs), f"ONNX ({onnx_model_path})"
+        except Exception as e:
+            print(f"⚠️ ONNX 정책 모델 로드 실패 ({e})")
+
+    ppo_model = getattr(strategies.get(3), 'ppo_model', None)
+    if server is None and isinstance(ppo_model, NumpyMLP):
+        server, backend = PolicyServer(ppo_model, **kwargs), "NumPy PPO"
+    elif server is None and ppo_model is not None:
+        server, backend = PolicyServer(torch_policy_fn(ppo_model), **kwargs), "PyTorch PPO"
+
+    if server is None:
+        print("ℹ️ 정책 모델 없음 - 배치 정책 서버 비활성화 (휴리스틱)")
+        return None
+
+    if expected_state_dim is not None and server.state_dim not in (None, expected_state_dim):
+        print(f"⚠️ 정책 모델 입력 차원 불일치 ({server.state_dim} != {expected_state_dim}) - 배치 정책 서버 비활성화")
+        server.close()
+        return None
+
+    print(f"✅ 배치 정책 서버: {backend} (데드라인 {server.deadline * 1000:g}ms)")
+    return server
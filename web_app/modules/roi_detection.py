@@ -0,0 +1,233 @@
+"""
+Dirty-Region Detection - 바뀐 영역만 다시 탐지
+
+게임 화면은 고정 배경 + 30~50px 스프라이트 몇 개 + 하단 용암 띠라서
+매 프레임 전체를 YOLO에 넣으면 연산 대부분이 변하지 않은 배경에 쓰인다.
+
+- 마지막으로 탐지한 프레임과 비교해 픽셀이 바뀐 타일을 찾음 (4px 간격 샘플링)
+- 바뀐 타일을 연결 영역별 사각형(+여백)으로 묶어 그 영역만 탐지
+- 정적 영역의 이전 탐지 결과는 재사용, 아무것도 안 바뀌면 탐지 생략
+- refresh_interval 프레임마다, 또는 바뀐 영역이 너무 넓으면 전체 프레임 탐지
+
+탐지 결과 객체는 bbox [x1, y1, x2, y2] (프레임 픽셀) 속성만 있으면 된다.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (x1, y1, x2, y2) 프레임 픽셀 사각형
+Rect = Tuple[int, int, int, int]
+
+
+class DirtyRegionDetector:
+    """
+    세션별 dirty-rect 탐지 상태
+
+    사용 예:
+        roi = DirtyRegionDetector()
+        detections = roi.detect(frame, detect_full, detect_regions)
+    """
+
+    def __init__(self,
+                 tile_size: int = 32,
+                 diff_threshold: int = 24,
+                 margin: int = 16,
+                 refresh_interval: int = 30,
+                 max_dirty_ratio: float = 0.4,
+                 sample_step: int = 4):
+        """
+        Args:
+            tile_size: 변화 판정 타일 크기 (px, sample_step의 배수)
+            diff_threshold: 픽셀 변화로 볼 채널 차이 (JPEG/스케일링 노이즈 무시용)
+            margin: 탐지 영역에 더할 여백 (px, 경계 객체 문맥 확보)
+            refresh_interval: 전체 프레임 탐지 주기 (탐지 호출 수 기준)
+            max_dirty_ratio: 바뀐 타일 비율이 이보다 크면 전체 프레임 탐지
+            sample_step: 차이 계산 시 픽셀 샘플링 간격
+        """
+        if tile_size % sample_step:
+            raise ValueError(f"tile_size({tile_size})는 sample_step({sample_step})의 배수여야 합니다")
+
+        self.tile_size = tile_size
+        self.diff_threshold = diff_threshold
+        self.margin = margin
+        self.refresh_interval = refresh_interval
+        self.max_dirty_ratio = max_dirty_ratio
+        self.sample_step = sample_step
+
+        self._reference: Optional[np.ndarray] = None  # 마지막 탐지 프레임 (샘플링)
+        self._scratch: Tuple[np.ndarray, ...] = ()    # 차이 계산용 재사용 버퍼
+        self._detections: List[Any] = []
+        self._since_full = 0
+
+        # 통계
+        self.full_frames = 0
+        self.region_frames = 0
+        self.skipped_frames = 0
+        self.region_pixels = 0
+        self.frame_pixels = 0
+
+    def reset(self):
+        """이전 프레임/결과 버림 (다음 호출은 전체 프레임 탐지)"""
+        self._reference = None
+        self._detections = []
+        self._since_full = 0
+
+    # ========== 탐지 ==========
+
+    def detect(self,
+               frame: np.ndarray,
+               detect_full: Callable[[np.ndarray], List[Any]],
+               detect_regions: Optional[Callable[[np.ndarray, Sequence[Rect]], List[List[Any]]]] = None) -> List[Any]:
+        """
+        바뀐 영역만 탐지하고 정적 영역의 이전 결과와 합침
+
+        Args:
+            frame: (H, W, 3) 프레임
+            detect_full: 전체 프레임 탐지 함수
+            detect_regions: (프레임, 사각형 리스트) → 사각형별 탐지 (프레임 좌표).
+                None이면 바뀐 프레임은 전체 탐지, 안 바뀐 프레임만 생략
+
+        Returns:
+            탐지 리스트
+        """
+        height, width = frame.shape[:2]
+        self.frame_pixels += height * width
+        sampled = frame[::self.sample_step, ::self.sample_step]
+
+        if (self._reference is None or self._reference.shape != sampled.shape
+                or self._since_full >= self.refresh_interval):
+            return self._detect_full(frame, sampled, detect_full)
+
+        dirty = self._dirty_tiles(sampled)
+        if not dirty.any():
+            self.skipped_frames += 1
+            self._since_full += 1
+            return list(self._detections)
+
+        if detect_regions is None or dirty.mean() > self.max_dirty_ratio:
+            return self._detect_full(frame, sampled, detect_full)
+
+        rects = self._regions(dirty, height, width)
+        region_detections = detect_regions(frame, rects)
+
+        # 영역 안에 완전히 들어가는 이전 결과는 새 결과로 대체, 나머지는 재사용
+        detections = [d for d in self._detections if not any(_contains(r, d.bbox) for r in rects)]
+        for rect, found in zip(rects, region_detections):
+            detections.extend(d for d in found if not _touches_inner_edge(rect, d.bbox, width, height))
+
+        np.copyto(self._reference, sampled)
+        self._detections = detections
+        self._since_full += 1
+        self.region_frames += 1
+        self.region_pixels += sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in rects)
+        return list(detections)
+
+    def _detect_full(self, frame: np.ndarray, sampled: np.ndarray,
+                     detect_full: Callable[[np.ndarray], List[Any]]) -> List[Any]:
+        detections = detect_full(frame)
+        if self._reference is None or self._reference.shape != sampled.shape:
+            self._reference = np.empty_like(sampled)
+        np.copyto(self._reference, sampled)
+        self._detections = list(detections)
+        self._since_full = 0
+        self.full_frames += 1
+        self.region_pixels += frame.shape[0] * frame.shape[1]
+        return detections
+
+    # ========== 변화 영역 ==========
+
+    def _dirty_tiles(self, sampled: np.ndarray) -> np.ndarray:
+        """바뀐 타일 bool (tiles_y, tiles_x)"""
+        reference = self._reference
+        h, w = reference.shape[:2]
+        tile = self.tile_size // self.sample_step
+        tiles_y, tiles_x = -(-h // tile), -(-w // tile)
+        if not self._scratch or self._scratch[0].shape != (h, w):
+            self._scratch = (np.empty((h, w), dtype=np.uint8), np.empty((h, w), dtype=np.uint8),
+                             np.empty((h, w), dtype=bool), np.zeros((tiles_y * tile, tiles_x * tile), dtype=bool))
+        high, low, over, changed = self._scratch
+
+        # 채널별 uint8 절대 차이 > 임계값 (오버플로 없이, 버퍼 재사용)
+        changed[:h, :w] = False
+        for c in range(reference.shape[2]):
+            np.maximum(sampled[..., c], reference[..., c], out=high)
+            np.minimum(sampled[..., c], reference[..., c], out=low)
+            np.subtract(high, low, out=high)
+            np.greater(high, self.diff_threshold, out=over)
+            changed[:h, :w] |= over
+
+        return changed.reshape(tiles_y, tile, tiles_x, tile).any(axis=(1, 3))
+
+    def _regions(self, dirty: np.ndarray, height: int, width: int) -> List[Rect]:
+        """바뀐 타일의 연결 영역 → 여백을 더한 사각형 (겹치면 병합)"""
+        tiles_y, tiles_x = dirty.shape
+        seen = np.zeros_like(dirty)
+        rects = []
+        for ty, tx in zip(*np.nonzero(dirty)):
+            if seen[ty, tx]:
+                continue
+            seen[ty, tx] = True
+            stack = [(ty, tx)]
+            y0, x0, y1, x1 = ty, tx, ty, tx
+            while stack:
+                cy, cx = stack.pop()
+                y0, x0, y1, x1 = min(y0, cy), min(x0, cx), max(y1, cy), max(x1, cx)
+                for ny, nx in ((cy - 1, cx), (cy + 1, cx), (cy, cx - 1), (cy, cx + 1)):
+                    if 0 <= ny < tiles_y and 0 <= nx < tiles_x and dirty[ny, nx] and not seen[ny, nx]:
+                        seen[ny, nx] = True
+                        stack.append((ny, nx))
+
+            t = self.tile_size
+            rects.append((max(0, x0 * t - self.margin), max(0, y0 * t - self.margin),
+                          min(width, (x1 + 1) * t + self.margin), min(height, (y1 + 1) * t + self.margin)))
+
+        return _merge_rects(rects)
+
+    # ========== 통계 ==========
+
+    def get_stats(self) -> Dict[str, Any]:
+        """전체/영역/생략 프레임 수와 실제 탐지한 픽셀 비율"""
+        frames = self.full_frames + self.region_frames + self.skipped_frames
+        return {
+            'frames': frames,
+            'full_frames': self.full_frames,
+            'region_frames': self.region_frames,
+            'skipped_frames': self.skipped_frames,
+            'pixel_ratio': self.region_pixels / self.frame_pixels if self.frame_pixels else 0.0,
+        }
+
+
+def _merge_rects(rects: List[Rect]) -> List[Rect]:
+    """겹치는 사각형을 더 이상 겹치지 않을 때까지 병합"""
+    merged = True
+    while merged and len(rects) > 1:
+        merged = False
+        result: List[Rect] = []
+        for rect in rects:
+            for i, other in enumerate(result):
+                if rect[0] < other[2] and other[0] < rect[2] and rect[1] < other[3] and other[1] < rect[3]:
+                    result[i] = (min(rect[0], other[0]), min(rect[1], other[1]),
+                                 max(rect[2], other[2]), max(rect[3], other[3]))
+                    merged = True
+                    break
+            else:
+                result.append(rect)
+        rects = result
+    return rects
+
+
+def _contains(rect: Rect, bbox: Sequence[float]) -> bool:
+    """bbox가 rect 안에 완전히 들어가는지"""
+    return rect[0] <= bbox[0] and rect[1] <= bbox[1] and bbox[2] <= rect[2] and bbox[3] <= rect[3]
+
+
+def _touches_inner_edge(rect: Rect, bbox: Sequence[float], width: int, height: int, tolerance: float = 2.0) -> bool:
+    """
+    영역 경계(프레임 가장자리 제외)에 걸친 탐지인지 - 잘린 객체일 수 있음
+
+    이런 객체는 영역 안에 완전히 들어가지 않으므로 이전 결과가 재사용된다.
+    """
+    x1, y1, x2, y2 = rect
+    return ((x1 > 0 and bbox[0] <= x1 + tolerance) or (y1 > 0 and bbox[1] <= y1 + tolerance) or
+            (x2 < width and bbox[2] >= x2 - tolerance) or (y2 < height and bbox[3] >= y2 - tolerance))
@@ -0,0 +1,317 @@
+"""
+State Protocol - 델타 압축 게임 상태 프로토콜
+
+Game.get_state() 전체를 매 프레임 JSON으로 보내는 대신,
+주기적인 키프레임 + 변경분(델타)만 전송한다.
+
+메시지 형식 (PROTOCOL_VERSION = 1):
+    키프레임: {'v': 1, 'k': 1, 'seq': n,
+              'p': [x, y, vy, size, health],
+              'o': [[id, type, x, y, vx, vy, size], ...],
+              'l': [state, timer_ms, height, zone_x, zone_width],
+              's': {짧은 키: 값, ...}}
+    델타:     {'v': 1, 'k': 0, 'seq': n,
+              'p': 변경 시에만, 'l': 변경 시에만, 's': 변경된 스칼라만,
+              'add': [[id, type, x, y, vx, vy, size], ...],
+              'mv': [[id, x, y, vx, vy], ...],
+              'rm': [id, ...]}
+
+- 좌표/속도는 정수로 양자화, 시간은 밀리초 정수, 스칼라는 짧은 키 (SCALAR_KEYS)
+- 장애물은 id로 추적: 디코더는 매 델타마다 x += vx, y += vy 로 예측하고,
+  예측과 다른 객체(좌우 wrap, 속도 변경)만 'mv'로 보정한다
+- 디코더는 seq가 끊기면 'request_keyframe'을 보내고 다음 키프레임까지 대기
+- 대응하는 JS 디코더: templates/index.html 의 StateDeltaDecoder
+
+바이너리 형식 (BINARY_VERSION = 1, little-endian, Socket.IO 바이너리 첨부로 전송):
+    헤더      BINARY_HEADER   (version, flags, frame, score, time_ms,
+                               collected_states, collected_images, obstacle_count)
+    플레이어  BINARY_PLAYER   (x, y, vy, size, health)
+    용암      BINARY_LAVA     (state, timer_ms, height, zone_x, zone_width)
+    장애물    BINARY_OBSTACLE × obstacle_count (id, type, x, y, vx, vy, size)
+    flags: bit0 game_over, bit1 star_collected, bit2 mode == 'ai'
+- 대응하는 JS 디코더: templates/index.html 의 decodeBinaryState
+"""
+
+import struct
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+PROTOCOL_VERSION = 1
+
+# 장애물 타입 코드
+OBJECT_TYPE_CODES = {'meteor': 0, 'star': 1}
+
+# 용암 상태 코드
+LAVA_STATE_CODES = {'inactive': 0, 'warning': 1, 'active': 2}
+
+# 델타로 전송하는 스칼라 필드 → 짧은 키 (time은 밀리초 정수로 양자화)
+SCALAR_KEYS = {
+    'score': 'sc',
+    'time': 't',
+    'frame': 'f',
+    'mode': 'm',
+    'game_over': 'go',
+    'star_collected': 'st',
+    'collected_states_count': 'cs',
+    'collected_images_count': 'ci'
+}
+
+
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<BBIiIIIH')
+BINARY_PLAYER = struct.Struct('<hhhhh')
+BINARY_LAVA = struct.Struct('<BiHhH')
+BINARY_OBSTACLE = struct.Struct('<IBhhbbB')
+
+FLAG_GAME_OVER = 1
+FLAG_STAR_COLLECTED = 2
+FLAG_MODE_AI = 4
+
+
+def quantize(value: float) -> int:
+    """좌표/속도 정수 양자화"""
+    return round(value)
+
+
+def encode_player(player: Dict[str, Any]) -> List[int]:
+    """플레이어 → [x, y, vy, size, health]"""
+    return [
+        quantize(player['x']),
+        quantize(player['y']),
+        quantize(player['vy']),
+        quantize(player['size']),
+        quantize(player['health'])
+    ]
+
+
+def encode_obstacle(obs: Dict[str, Any]) -> List[int]:
+    """장애물 → [id, type, x, y, vx, vy, size]"""
+    return [
+        obs['id'],
+        OBJECT_TYPE_CODES.get(obs.get('type', 'meteor'), 0),
+        quantize(obs['x']),
+        quantize(obs['y']),
+        quantize(obs.get('vx', 0)),
+        quantize(obs.get('vy', 5)),
+        quantize(obs['size'])
+    ]
+
+
+def encode_lava(lava: Dict[str, Any]) -> List[int]:
+    """용암 → [state, timer_ms, height, zone_x, zone_width]"""
+    return [
+        LAVA_STATE_CODES.get(lava['state'], 0),
+        quantize(lava['timer'] * 1000),
+        quantize(lava['height']),
+        quantize(lava['zone_x']),
+        quantize(lava['zone_width'])
+    ]
+
+
+def encode_scalars(state: Dict[str, Any]) -> Dict[str, Any]:
+    """스칼라 필드 → 짧은 키 (time은 밀리초)"""
+    scalars = {short: state[key] for key, short in SCALAR_KEYS.items() if key in state}
+    scalars['t'] = quantize(state['time'] * 1000)
+    return scalars
+
+
+class StateDeltaEncoder:
+    """
+    세션별 델타 인코더
+
+    인코더는 클라이언트가 가지고 있어야 할 상태(마지막 전송 기준 + 예측)를
+    그대로 추적하므로, encode()는 반드시 틱당 한 번, 전송되는 순서대로 호출한다.
+    """
+
+    def __init__(self, keyframe_interval: int = 30):
+        """
+        Args:
+            keyframe_interval: 키프레임 주기 (틱 수)
+        """
+        if keyframe_interval < 1:
+            raise ValueError(f"Invalid keyframe_interval: {keyframe_interval}")
+
+        self.keyframe_interval = keyframe_interval
+        self.reset()
+
+    def reset(self):
+        """인코더 상태 초기화 (다음 메시지는 키프레임)"""
+        self.seq = 0
+        self._since_keyframe = 0
+        self._force_keyframe = True
+
+        # 클라이언트가 가지고 있는 상태 (예측 반영)
+        self._player: Optional[List[int]] = None
+        self._lava: Optional[List[int]] = None
+        self._scalars: Dict[str, Any] = {}
+        self._objects: Dict[int, List[int]] = {}  # id → [x, y, vx, vy]
+
+    def force_keyframe(self):
+        """다음 encode()를 키프레임으로 (클라이언트 재동기화 요청 시)"""
+        self._force_keyframe = True
+
+    def encode(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """게임 상태 → 키프레임 또는 델타 메시지"""
+        self.seq += 1
+
+        if self._force_keyframe or self._since_keyframe >= self.keyframe_interval:
+            message = self._encode_keyframe(state)
+        else:
+            message = self._encode_delta(state)
+
+        return message
+
+    def _encode_keyframe(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """전체 상태 전송 + 기준 상태 갱신"""
+        self._force_keyframe = False
+        self._since_keyframe = 0
+
+        obstacles = [encode_obstacle(obs) for obs in state['obstacles']]
+
+        self._player = encode_player(state['player'])
+        self._lava = encode_lava(state['lava'])
+        self._scalars = encode_scalars(state)
+        self._objects = {row[0]: [row[2], row[3], row[4], row[5]] for row in obstacles}
+
+        return {
+            'v': PROTOCOL_VERSION,
+            'k': 1,
+            'seq': self.seq,
+            'p': self._player,
+            'o': obstacles,
+            'l': self._lava,
+            's': self._scalars
+        }
+
+    def _encode_delta(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """이전 메시지 대비 변경분만 전송"""
+        self._since_keyframe += 1
+        message: Dict[str, Any] = {'v': PROTOCOL_VERSION, 'k': 0, 'seq': self.seq}
+
+        player = encode_player(state['player'])
+        if player != self._player:
+            message['p'] = self._player = player
+
+        lava = encode_lava(state['lava'])
+        if lava != self._lava:
+            message['l'] = self._lava = lava
+
+        scalars = encode_scalars(state)
+        changed = {key: value for key, value in scalars.items() if self._scalars.get(key) != value}
+        if changed:
+            message['s'] = changed
+            self._scalars.update(changed)
+
+        # 장애물: 디코더와 같은 규칙으로 예측한 뒤 어긋난 것만 보정
+        added, moved = [], []
+        current_ids = set()
+        for obs in state['obstacles']:
+            row = encode_obstacle(obs)
+            obj_id, x, y, vx, vy = row[0], row[2], row[3], row[4], row[5]
+            current_ids.add(obj_id)
+
+            known = self._objects.get(obj_id)
+            if known is None:
+                added.append(row)
+            else:
+                predicted_x = known[0] + known[2]
+                predicted_y = known[1] + known[3]
+                if (x, y, vx, vy) != (predicted_x, predicted_y, known[2], known[3]):
+                    moved.append([obj_id, x, y, vx, vy])
+            self._objects[obj_id] = [x, y, vx, vy]
+
+        removed = [obj_id for obj_id in self._objects if obj_id not in current_ids]
+        for obj_id in removed:
+            del self._objects[obj_id]
+
+        if added:
+            message['add'] = added
+        if moved:
+            message['mv'] = moved
+        if removed:
+            message['rm'] = removed
+
+        return message
+
+
+@lru_cache(maxsize=256)
+def _obstacle_array_struct(count: int) -> struct.Struct:
+    """장애물 count개를 한 번에 패킹하는 구조체 (개수별 캐시)"""
+    return struct.Struct('<' + BINARY_OBSTACLE.format.lstrip('<') * count)
+
+
+def encode_binary_state(state: Dict[str, Any]) -> bytes:
+    """게임 상태 → 고정 레이아웃 바이너리 버퍼 (BINARY_* 구조체 참고)"""
+    obstacles = state['obstacles']
+    flags = ((FLAG_GAME_OVER if state['game_over'] else 0)
+             | (FLAG_STAR_COLLECTED if state['star_collected'] else 0)
+             | (FLAG_MODE_AI if state['mode'] == 'ai' else 0))
+
+    buffer = bytearray(BINARY_HEADER.size + BINARY_PLAYER.size + BINARY_LAVA.size
+                       + BINARY_OBSTACLE.size * len(obstacles))
+    BINARY_HEADER.pack_into(
+        buffer, 0,
+        BINARY_VERSION, flags, state['frame'], state['score'],
+        quantize(state['time'] * 1000),
+        state['collected_states_count'], state['collected_images_count'],
+        len(obstacles)
+    )
+    offset = BINARY_HEADER.size
+    BINARY_PLAYER.pack_into(buffer, offset, *encode_player(state['player']))
+    offset += BINARY_PLAYER.size
+    BINARY_LAVA.pack_into(buffer, offset, *encode_lava(state['lava']))
+    offset += BINARY_LAVA.size
+
+    # 장애물 전체를 구조체 한 번으로 패킹 (객체별 pack 호출 없이)
+    if obstacles:
+        flat: List[int] = []
+        for obs in obstacles:
+            flat += encode_obstacle(obs)
+        _obstacle_array_struct(len(obstacles)).pack_into(buffer, offset, *flat)
+
+    return bytes(buffer)
+
+
+def decode_binary_state(buffer: bytes) -> Dict[str, Any]:
+    """바이너리 버퍼 → get_state() 형식 dict (검증/벤치마크용)"""
+    (version, flags, frame, score, time_ms,
+     collected_states, collected_images, obstacle_count) = BINARY_HEADER.unpack_from(buffer, 0)
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary state version: {version}")
+
+    offset = BINARY_HEADER.size
+    x, y, vy, size, health = BINARY_PLAYER.unpack_from(buffer, offset)
+    offset += BINARY_PLAYER.size
+    lava_state, timer_ms, height, zone_x, zone_width = BINARY_LAVA.unpack_from(buffer, offset)
+    offset += BINARY_LAVA.size
+
+    type_names = {code: name for name, code in OBJECT_TYPE_CODES.items()}
+    lava_names = {code: name for name, code in LAVA_STATE_CODES.items()}
+
+    obstacles = []
+    for obj_id, obj_type, ox, oy, ovx, ovy, osize in BINARY_OBSTACLE.iter_unpack(
+            buffer[offset:offset + BINARY_OBSTACLE.size * obstacle_count]):
+        obstacles.append({
+            'id': obj_id, 'type': type_names[obj_type],
+            'x': ox, 'y': oy, 'vx': ovx, 'vy': ovy, 'size': osize
+        })
+
+    return {
+        'player': {'x': x, 'y': y, 'vy': vy, 'size': size, 'health': health},
+        'obstacles': obstacles,
+        'score': score,
+        'time': time_ms / 1000,
+        'frame': frame,
+        'mode': 'ai' if flags & FLAG_MODE_AI else 'human',
+        'game_over': bool(flags & FLAG_GAME_OVER),
+        'star_collected': bool(flags & FLAG_STAR_COLLECTED),
+        'collected_states_count': collected_states,
+        'collected_images_count': collected_images,
+        'lava': {
+            'state': lava_names[lava_state],
+            'timer': timer_ms / 1000,
+            'height': height,
+            'zone_x': zone_x,
+            'zone_width': zone_width
+        }
+    }
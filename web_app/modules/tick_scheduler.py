@@ -0,0 +1,251 @@
+"""
+Tick Scheduler - 공유 고정 타임스텝 게임 루프
+
+세션마다 스레드를 띄우는 대신, 소수의 샤드 스레드가 모든 활성 게임을
+하나의 모노토닉 데드라인 시계에 맞춰 진행시킨다.
+
+- 고정 타임스텝 (기본 30 FPS)
+- 드리프트 보정: 데드라인을 누적(+dt)해서 sleep 오차가 쌓이지 않음
+- 밀린 틱은 max_catchup_ticks 까지만 따라잡고, 그 이상은 재동기화
+- 샤드별 틱 타이밍 통계 노출 (get_stats)
+- 선택적 batch_fn: 샤드의 모든 항목을 한 번에 처리하는 단계 (배치 물리 등)
+"""
+
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+
+class _Shard:
+    """스케줄러 샤드 - 게임 묶음 하나와 그 루프 스레드"""
+
+    def __init__(self, index: int, history_size: int):
+        self.index = index
+        self.items: Dict[Hashable, Any] = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+        # 틱 타이밍 통계
+        self.tick_count = 0
+        self.tick_times = deque(maxlen=history_size)  # 틱 처리 시간 (초)
+        self.lateness = deque(maxlen=history_size)    # 데드라인 대비 지연 (초)
+        self.last_tick_time = 0.0
+        self.max_tick_time = 0.0
+        self.overruns = 0        # 처리 시간이 dt를 넘긴 틱 수
+        self.skipped_ticks = 0   # 재동기화로 버린 틱 수
+
+
+class TickScheduler:
+    """
+    고정 타임스텝 공유 스케줄러
+
+    tick_fn(key, item)을 틱마다 활성 항목 전부에 대해 호출한다.
+    tick_fn이 False를 반환하거나 예외를 던지면 해당 항목은 스케줄러에서 제거된다.
+    batch_fn(shard_index, items)가 있으면 매 틱 tick_fn 호출 전에 샤드당 한 번 호출된다.
+    """
+
+    def __init__(self,
+                 tick_fn: Callable[[Hashable, Any], bool],
+                 batch_fn: Optional[Callable[[int, List[Tuple[Hashable, Any]]], None]] = None,
+                 fps: float = 30.0,
+                 num_shards: int = 1,
+                 max_catchup_ticks: int = 3,
+                 history_size: int = 300,
+                 name: str = "tick"):
+        """
+        Args:
+            tick_fn: 항목 하나를 한 틱 진행시키는 함수 (계속 진행하면 True)
+            batch_fn: 샤드의 (key, item) 목록 전체를 한 번에 처리하는 선행 단계 (선택)
+            fps: 목표 틱 레이트
+            num_shards: 샤드(스레드) 수 - 게임은 key 해시로 분배
+            max_catchup_ticks: 지연 시 연속으로 따라잡을 최대 틱 수
+            history_size: 통계용 최근 틱 기록 개수
+            name: 스레드 이름 접두사
+        """
+        if fps <= 0:
+            raise ValueError(f"Invalid fps: {fps}")
+        if num_shards < 1:
+            raise ValueError(f"Invalid num_shards: {num_shards}")
+
+        self.tick_fn = tick_fn
+        self.batch_fn = batch_fn
+        self.fps = fps
+        self.dt = 1.0 / fps
+        self.max_catchup_ticks = max_catchup_ticks
+        self.name = name
+
+        self._shards = [_Shard(i, history_size) for i in range(num_shards)]
+        self._running = False
+
+    # ========== 항목 관리 ==========
+
+    @property
+    def num_shards(self) -> int:
+        return len(self._shards)
+
+    def shard_index(self, key: Hashable) -> int:
+        """key가 배정되는 샤드 번호 (프로세스 간에도 안정적인 해시)"""
+        return zlib.crc32(str(key).encode('utf-8')) % len(self._shards)
+
+    def _shard_for(self, key: Hashable) -> _Shard:
+        """key → 샤드"""
+        return self._shards[self.shard_index(key)]
+
+    def add(self, key: Hashable, item: Any):
+        """항목 등록 (같은 key가 있으면 교체)"""
+        shard = self._shard_for(key)
+        with shard.lock:
+            shard.items[key] = item
+        shard.wakeup.set()
+
+    def remove(self, key: Hashable) -> Optional[Any]:
+        """항목 제거"""
+        shard = self._shard_for(key)
+        with shard.lock:
+            return shard.items.pop(key, None)
+
+    def __contains__(self, key: Hashable) -> bool:
+        shard = self._shard_for(key)
+        with shard.lock:
+            return key in shard.items
+
+    def __len__(self) -> int:
+        return sum(len(shard.items) for shard in self._shards)
+
+    # ========== 실행 ==========
+
+    def start(self):
+        """샤드 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._running:
+            return
+        self._running = True
+
+        for shard in self._shards:
+            shard.thread = threading.Thread(
+                target=self._run_shard,
+                args=(shard,),
+                name=f"{self.name}-shard-{shard.index}"
+            )
+            shard.thread.daemon = True
+            shard.thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """샤드 스레드 종료"""
+        self._running = False
+        for shard in self._shards:
+            shard.wakeup.set()
+        for shard in self._shards:
+            if shard.thread is not None:
+                shard.thread.join(timeout)
+                shard.thread = None
+
+    def _run_shard(self, shard: _Shard):
+        """샤드 루프 - 모노토닉 데드라인 기반 고정 타임스텝"""
+        next_deadline = time.monotonic()
+
+        while self._running:
+            with shard.lock:
+                active = bool(shard.items)
+
+            if not active:
+                # 게임이 없으면 대기 (busy loop 방지), 깨어나면 시계 재설정
+                shard.wakeup.wait()
+                shard.wakeup.clear()
+                next_deadline = time.monotonic()
+                continue
+
+            now = time.monotonic()
+            if now < next_deadline:
+                time.sleep(next_deadline - now)
+
+            tick_start = time.monotonic()
+            shard.lateness.append(max(0.0, tick_start - next_deadline))
+
+            self._tick_shard(shard)
+
+            tick_end = time.monotonic()
+            tick_time = tick_end - tick_start
+            shard.tick_count += 1
+            shard.tick_times.append(tick_time)
+            shard.last_tick_time = tick_time
+            shard.max_tick_time = max(shard.max_tick_time, tick_time)
+            if tick_time > self.dt:
+                shard.overruns += 1
+
+            # 드리프트 보정: 데드라인을 고정 간격으로 누적
+            next_deadline += self.dt
+
+            # 너무 밀렸으면 따라잡기를 포기하고 현재 시각으로 재동기화
+            behind = tick_end - next_deadline
+            if behind > self.max_catchup_ticks * self.dt:
+                skipped = int(behind / self.dt)
+                shard.skipped_ticks += skipped
+                next_deadline += skipped * self.dt
+
+    def _tick_shard(self, shard: _Shard):
+        """샤드의 모든 항목을 한 틱 진행"""
+        with shard.lock:
+            items = list(shard.items.items())
+
+        if self.batch_fn is not None:
+            try:
+                self.batch_fn(shard.index, items)
+            except Exception as e:
+                print(f"❌ [{self.name}] 배치 처리 오류 (shard {shard.index}): {e}")
+
+        finished = []
+        for key, item in items:
+            try:
+                keep = self.tick_fn(key, item)
+            except Exception as e:
+                print(f"❌ [{self.name}] 틱 처리 오류 ({key}): {e}")
+                keep = False
+            if not keep:
+                finished.append((key, item))
+
+        if finished:
+            with shard.lock:
+                for key, item in finished:
+                    # 틱 도중 같은 key로 새 항목이 등록됐으면 유지
+                    if shard.items.get(key) is item:
+                        del shard.items[key]
+
+    # ========== 통계 ==========
+
+    def get_stats(self) -> Dict[str, Any]:
+        """스케줄러 및 샤드별 틱 타이밍 통계"""
+        shards: List[Dict[str, Any]] = []
+        for shard in self._shards:
+            tick_times = np.array(shard.tick_times) * 1000
+            lateness = np.array(shard.lateness) * 1000
+            stats = {
+                'shard': shard.index,
+                'games': len(shard.items),
+                'ticks': shard.tick_count,
+                'last_tick_ms': shard.last_tick_time * 1000,
+                'max_tick_ms': shard.max_tick_time * 1000,
+                'overruns': shard.overruns,
+                'skipped_ticks': shard.skipped_ticks,
+            }
+            if len(tick_times):
+                stats.update({
+                    'avg_tick_ms': float(np.mean(tick_times)),
+                    'p95_tick_ms': float(np.percentile(tick_times, 95)),
+                    'avg_lateness_ms': float(np.mean(lateness)),
+                    'p95_lateness_ms': float(np.percentile(lateness, 95)),
+                })
+            shards.append(stats)
+
+        return {
+            'running': self._running,
+            'fps': self.fps,
+            'budget_ms': self.dt * 1000,
+            'num_shards': len(self._shards),
+            'games': len(self),
+            'shards': shards
+        }
@@ -0,0 +1,209 @@
+"""
+Model Warm-up - 서버 시작 시 모델 미리 로드 + 워밍업 추론
+
+첫 YOLO 호출과 첫 추론은 가중치 로드, 그래프 최적화, 메모리 arena 확장 같은
+일회성 비용을 치르는데, 워밍업이 없으면 이 비용이 첫 플레이어의 게임 틱에 얹힌다.
+
+- 탐지 모델을 공유 레지스트리에 로드하고, 워밍업이 끝나면 참조를 반환
+  (레지스트리 idle_timeout 동안 메모리에 남아 첫 세션이 그대로 쓰고,
+  그동안 아무 세션도 없으면 다른 모델처럼 유휴 해제)
+- ONNX 모델은 최적화 그래프를 디스크 캐시(optimized_model_filepath)에 저장/재사용
+- 탐지기/정책 모델에 설정한 횟수만큼 더미 입력으로 추론 (배치 크기별)
+- 단계별 소요 시간과 완료 여부를 get_status()로 노출 (readiness 엔드포인트용)
+
+그래프 캐시는 런타임 산출물이다. 이미지에는 .onnx 모델이 들어 있지 않으므로
+서버가 첫 시작 때 만들고 인스턴스가 교체될 때까지 재사용한다.
+모델 파일이 있는 환경에서 캐시만 미리 만들기:
+    python -m modules.warmup --compile-only path/to/model.onnx
+"""
+
+import argparse
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cv_module import ComputerVisionModule, run_yolo_batch
+from .yolo_onnx import ORT_AVAILABLE, optimized_model_cache_path, save_optimized_model
+
+
+class ModelWarmup:
+    """
+    백그라운드 모델 워밍업
+
+    사용 예:
+        warmup = ModelWarmup(yolo_model_path, policies={'level3': strategy.make_decision},
+                             sample_state=state)
+        warmup.start()
+        warmup.ready          # 완료 여부
+        warmup.get_status()   # 단계별 시간
+    """
+
+    def __init__(self,
+                 detector_model_path: Optional[str],
+                 policies: Optional[Dict[str, Callable[[Dict[str, Any]], Any]]] = None,
+                 sample_state: Optional[Dict[str, Any]] = None,
+                 iterations: int = 3,
+                 batch_sizes: Sequence[int] = (1,),
+                 frame_shape: Tuple[int, int, int] = (720, 960, 3)):
+        """
+        Args:
+            detector_model_path: YOLO 모델 경로 (None이면 탐지기 워밍업 생략)
+            policies: 이름 → 의사결정 함수 (sample_state로 호출)
+            sample_state: 정책 워밍업에 쓸 게임 상태
+            iterations: 단계별 워밍업 추론 횟수
+            batch_sizes: 탐지기 워밍업 배치 크기들 (마이크로 배치 크기 포함 권장)
+            frame_shape: 탐지기 더미 프레임 크기
+        """
+        self.detector_model_path = detector_model_path
+        self.policies = dict(policies or {})
+        self.sample_state = sample_state or {}
+        self.iterations = max(1, iterations)
+        self.batch_sizes = sorted(set(batch_sizes))
+        self.frame_shape = frame_shape
+
+        self.state = 'pending'  # pending → warming → ready
+        self.errors: List[str] = []
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cv_module: Optional[ComputerVisionModule] = None  # 워밍업 중에만 보유
+        self.detector_status: Optional[Dict[str, Any]] = None  # 반환 전에 기록한 탐지기 상태
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        """워밍업 완료 여부 (일부 단계가 실패해도 끝났으면 True)"""
+        return self._done.is_set()
+
+    def start(self):
+        """백그라운드 스레드로 워밍업 시작"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.run, name="model-warmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """완료까지 대기"""
+        return self._done.wait(timeout)
+
+    def run(self):
+        """워밍업 실행 (동기)"""
+        self.state = 'warming'
+        self.started_at = time.time()
+        print(f"🔥 모델 워밍업 시작 ({self.iterations}회, 배치 {self.batch_sizes})")
+
+        try:
+            if self.detector_model_path:
+                self._phase('detector_load', self._load_detector)
+                if self.cv_module is not None and self.cv_module.backend != 'simulation':
+                    for batch_size in self.batch_sizes:
+                        self._timed_iterations(f'detector_batch{batch_size}', self._detector_fn(batch_size))
+
+            for name, policy in self.policies.items():
+                self._timed_iterations(f'policy_{name}', lambda: policy(self.sample_state))
+        finally:
+            self.close()
+            self.finished_at = time.time()
+            self.state = 'ready'
+            self._done.set()
+
+        summary = ", ".join(f"{name} {phase['first_ms']:.0f}→{phase['last_ms']:.1f}ms"
+                            for name, phase in self.phases.items())
+        print(f"✅ 모델 워밍업 완료 ({self.finished_at - self.started_at:.1f}s): {summary}")
+
+    def close(self):
+        """탐지기 상태를 기록하고 모델 참조 반환 (run()이 끝날 때 호출)"""
+        cv_module = self.cv_module
+        if cv_module is None:
+            return
+        self.detector_status = {'backend': cv_module.backend}
+        model = cv_module.model
+        if hasattr(model, 'graph_cache'):
+            self.detector_status.update({
+                'graph_cache': model.graph_cache,
+                'optimized_model_path': model.optimized_model_path,
+                'session_load_ms': model.session_load_ms,
+            })
+        cv_module.close()
+        self.cv_module = None
+
+    # ========== 단계 ==========
+
+    def _load_detector(self):
+        # batch_size=1: 워밍업은 run_yolo_batch로 배치를 직접 만들어 호출
+        self.cv_module = ComputerVisionModule(model_path=self.detector_model_path, batch_size=1)
+
+    def _detector_fn(self, batch_size: int) -> Callable[[], Any]:
+        frames = [np.zeros(self.frame_shape, dtype=np.uint8) for _ in range(batch_size)]
+        handle = self.cv_module._model_handle
+        return lambda: run_yolo_batch(handle, frames)
+
+    def _phase(self, name: str, fn: Callable[[], Any]):
+        """한 번 실행하는 단계 (로드 등)"""
+        start = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:
+            self.errors.append(f"{name}: {e}")
+            print(f"⚠️ 워밍업 단계 실패 ({name}): {e}")
+        elapsed = (time.perf_counter() - start) * 1000
+        self.phases[name] = {'first_ms': elapsed, 'last_ms': elapsed, 'runs': 1}
+
+    def _timed_iterations(self, name: str, fn: Callable[[], Any]):
+        """iterations회 반복 실행 → 첫 호출 / 마지막 호출 시간"""
+        times = []
+        for _ in range(self.iterations):
+            start = time.perf_counter()
+            try:
+                fn()
+            except Exception as e:
+                self.errors.append(f"{name}: {e}")
+                print(f"⚠️ 워밍업 단계 실패 ({name}): {e}")
+                break
+            times.append((time.perf_counter() - start) * 1000)
+        if times:
+            self.phases[name] = {'first_ms': times[0], 'last_ms': times[-1], 'runs': len(times)}
+
+    # ========== 상태 ==========
+
+    def get_status(self) -> Dict[str, Any]:
+        """readiness 응답용 상태"""
+        status = {
+            'ready': self.ready,
+            'state': self.state,
+            'phases': self.phases,
+            'errors': self.errors,
+        }
+        if self.started_at is not None:
+            status['elapsed_s'] = (self.finished_at or time.time()) - self.started_at
+
+        if self.detector_status is not None:
+            status['detector'] = self.detector_status
+        return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompile ONNX Runtime optimized graphs")
+    parser.add_argument('models', nargs='*', help=".onnx models (default: YOLO_MODEL_PATH)")
+    parser.add_argument('--compile-only', action='store_true', help="Only write the optimized graph cache")
+    args = parser.parse_args()
+
+    models = args.models or [os.getenv('YOLO_MODEL_PATH', '')]
+    for model_path in models:
+        if not model_path.endswith('.onnx') or not os.path.exists(model_path) or not ORT_AVAILABLE:
+            print(f"⚠️ ONNX 모델 없음, 건너뜀: {model_path or '(YOLO_MODEL_PATH 미설정)'}")
+            continue
+        cache_path = optimized_model_cache_path(model_path)
+        if os.path.exists(cache_path) or save_optimized_model(model_path, cache_path):
+            print(f"💾 최적화 그래프 캐시: {cache_path}")
+
+        if not args.compile_only:
+            ModelWarmup(model_path).run()
+
+
+if __name__ == '__main__':
+    main()
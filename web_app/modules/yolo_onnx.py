@@ -0,0 +1,549 @@
+"""
+YOLOv8 ONNX Runtime Backend - torch/ultralytics 없이 게임 객체 탐지
+
+CPU 전용 Cloud Run에서 torch + ultralytics 스택 없이 추론하기 위한 경로.
+ultralytics 예측 파이프라인과 같은 결과가 나오도록 전/후처리를 NumPy로 구현한다.
+
+- 전처리: letterbox 리사이즈 (비율 유지, 114 패딩, 중앙 정렬) → RGB → CHW → 0~1
+  (FramePreprocessor: 버퍼 재사용 + IO binding으로 프레임당 할당 없음)
+- 후처리: (N, 4+nc, anchors) 출력 디코딩 → 신뢰도 필터 → 클래스별 NMS → 원본 좌표 복원
+  (vision_agent_shared.yolo_decoder.YOLOv8Decoder - src/deployment 파이프라인/평가와 공용)
+- 기본 임계값은 ultralytics predict 기본값과 동일 (conf 0.25, iou 0.7, max_det 300, max_nms 30000)
+
+onnxruntime 이 없으면 ONNXYOLODetector 생성 시 ImportError
+(cv_module은 이 경우 ultralytics 경로 또는 시뮬레이션 모드로 폴백)
+"""
+
+import ast
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 후처리 디코더는 src/deployment 파이프라인과 공용 (vision_agent_shared)
+from vision_agent_shared.yolo_decoder import (DEFAULT_CONF_THRESHOLD, DEFAULT_IOU_THRESHOLD, DEFAULT_MAX_DET,
+                                              DecoderConfig, YOLOv8Decoder)
+
+# OpenCV는 선택적 (없으면 NumPy bilinear 리사이즈)
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+try:
+    import onnxruntime as ort
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
+
+LETTERBOX_COLOR = 114
+
+
+class LetterboxInfo:
+    """letterbox 변환 정보 (원본 좌표 복원용)"""
+
+    __slots__ = ('ratio', 'pad_x', 'pad_y', 'orig_shape')
+
+    def __init__(self, ratio: float, pad_x: float, pad_y: float, orig_shape: Tuple[int, int]):
+        self.ratio = ratio
+        self.pad_x = pad_x
+        self.pad_y = pad_y
+        self.orig_shape = orig_shape  # (H, W)
+
+
+# ========== 전처리 ==========
+
+def resize_bilinear(image: np.ndarray, width: int, height: int) -> np.ndarray:
+    """cv2.resize(INTER_LINEAR)와 같은 좌표계의 bilinear 리사이즈 (NumPy)"""
+    if CV2_AVAILABLE:
+        return cv2.resize(image, (width, height), interpolation=cv2.INTER_LINEAR)
+
+    in_h, in_w = image.shape[:2]
+
+    # 픽셀 중심 정렬 (half-pixel)
+    ys = np.clip((np.arange(height) + 0.5) * (in_h / height) - 0.5, 0, in_h - 1)
+    xs = np.clip((np.arange(width) + 0.5) * (in_w / width) - 0.5, 0, in_w - 1)
+    y0 = ys.astype(np.int64)
+    x0 = xs.astype(np.int64)
+    y1 = np.minimum(y0 + 1, in_h - 1)
+    x1 = np.minimum(x0 + 1, in_w - 1)
+    wy = (ys - y0).astype(np.float32)[:, None, None]
+    wx = (xs - x0).astype(np.float32)[None, :, None]
+
+    src = image.astype(np.float32)
+    top = src[y0][:, x0] * (1 - wx) + src[y0][:, x1] * wx
+    bottom = src[y1][:, x0] * (1 - wx) + src[y1][:, x1] * wx
+    out = top * (1 - wy) + bottom * wy
+    return np.clip(np.rint(out), 0, 255).astype(image.dtype)
+
+
+def letterbox_geometry(shape: Tuple[int, int],
+                       new_shape: Tuple[int, int]) -> Tuple[int, int, int, int, float]:
+    """
+    letterbox 배치 계산 (ultralytics LetterBox(auto=False)와 동일)
+
+    Args:
+        shape: (H, W) 원본 크기
+        new_shape: (H, W) 모델 입력 크기
+
+    Returns:
+        (리사이즈 폭, 리사이즈 높이, 위쪽 패딩, 왼쪽 패딩, 배율)
+    """
+    h, w = shape
+    new_h, new_w = new_shape
+    ratio = min(new_h / h, new_w / w)
+
+    unpad_w, unpad_h = int(round(w * ratio)), int(round(h * ratio))
+    pad_w, pad_h = (new_w - unpad_w) / 2, (new_h - unpad_h) / 2
+    top, left = int(round(pad_h - 0.1)), int(round(pad_w - 0.1))
+    return unpad_w, unpad_h, top, left, ratio
+
+
+def letterbox(image: np.ndarray,
+              new_shape: Tuple[int, int] = (640, 640),
+              color: int = LETTERBOX_COLOR) -> Tuple[np.ndarray, LetterboxInfo]:
+    """
+    비율 유지 리사이즈 + 중앙 패딩 (ultralytics LetterBox(auto=False)와 동일)
+
+    Args:
+        image: (H, W, 3) uint8
+        new_shape: (H, W) 모델 입력 크기
+
+    Returns:
+        (패딩된 이미지, 변환 정보)
+    """
+    h, w = image.shape[:2]
+    unpad_w, unpad_h, top, left, ratio = letterbox_geometry((h, w), new_shape)
+
+    if (w, h) != (unpad_w, unpad_h):
+        image = resize_bilinear(image, unpad_w, unpad_h)
+
+    padded = np.full((new_shape[0], new_shape[1], image.shape[2]), color, dtype=image.dtype)
+    padded[top:top + unpad_h, left:left + unpad_w] = image
+    return padded, LetterboxInfo(ratio, left, top, (h, w))
+
+
+def preprocess(frames: Sequence[np.ndarray],
+               input_shape: Tuple[int, int],
+               bgr: bool = True) -> Tuple[np.ndarray, List[LetterboxInfo]]:
+    """
+    프레임 리스트 → 모델 입력 텐서 (N, 3, H, W) float32
+
+    Args:
+        frames: (H, W, 3) uint8 프레임들 (크기가 달라도 됨)
+        input_shape: (H, W) 모델 입력 크기
+        bgr: 입력이 BGR(OpenCV)이면 True → RGB로 변환
+    """
+    batch = np.empty((len(frames), 3, input_shape[0], input_shape[1]), dtype=np.float32)
+    infos = []
+    for i, frame in enumerate(frames):
+        padded, info = letterbox(frame, input_shape)
+        channels = padded[..., ::-1] if bgr else padded
+        np.multiply(channels.transpose(2, 0, 1), 1.0 / 255.0, out=batch[i], casting='unsafe')
+        infos.append(info)
+    return batch, infos
+
+
+class FramePreprocessor:
+    """
+    버퍼 재사용 전처리기 (정상 상태에서 프레임당 메모리 할당 없음)
+
+    preprocess()와 같은 결과를 내지만:
+    - 입력 텐서 (N, 3, H, W) float32 를 한 번 할당해 계속 재사용
+    - 리사이즈 결과는 원본 크기별로 미리 잡아 둔 버퍼에 in-place로 기록
+    - BGR→RGB, HWC→CHW, 0~1 정규화를 한 번의 패스로 입력 텐서에 직접 기록
+    - 패딩(114)은 letterbox 배치가 바뀔 때만 다시 채움
+
+    반환하는 텐서는 다음 호출에서 덮어쓰므로 스레드마다 하나씩 사용한다.
+    """
+
+    def __init__(self,
+                 input_shape: Tuple[int, int],
+                 max_batch_size: int = 1,
+                 bgr: bool = True,
+                 color: int = LETTERBOX_COLOR):
+        """
+        Args:
+            input_shape: (H, W) 모델 입력 크기
+            max_batch_size: 미리 할당할 배치 크기 (넘으면 버퍼를 키움)
+            bgr: 입력이 BGR(OpenCV)이면 True → RGB로 변환
+            color: 패딩 값
+        """
+        self.input_shape = tuple(input_shape)
+        self.bgr = bgr
+        self.pad_value = color / 255.0
+        self.batch = np.empty(0, dtype=np.float32)
+        self._slot_layouts: List[Optional[tuple]] = []
+        self._layouts: Dict[Tuple[int, int], tuple] = {}     # 원본 (H, W) → letterbox 배치
+        self._resizers: Dict[tuple, '_BilinearResizer'] = {}
+        self.reallocations = 0
+        self._ensure_capacity(max_batch_size)
+
+    def _ensure_capacity(self, batch_size: int):
+        if batch_size <= len(self.batch):
+            return
+        self.batch = np.empty((batch_size, 3) + self.input_shape, dtype=np.float32)
+        self._slot_layouts = [None] * batch_size
+        self.reallocations += 1
+
+    def _layout(self, shape: Tuple[int, int]) -> tuple:
+        layout = self._layouts.get(shape)
+        if layout is None:
+            unpad_w, unpad_h, top, left, ratio = letterbox_geometry(shape, self.input_shape)
+            layout = (unpad_w, unpad_h, top, left, LetterboxInfo(ratio, left, top, shape))
+            self._layouts[shape] = layout
+        return layout
+
+    def __call__(self, frames: Sequence[np.ndarray]) -> Tuple[np.ndarray, List[LetterboxInfo]]:
+        """
+        프레임 리스트 → (입력 텐서 뷰 (N, 3, H, W), 프레임별 LetterboxInfo)
+
+        텐서 뷰는 내부 버퍼이므로 다음 호출 전까지만 유효하다.
+        """
+        count = len(frames)
+        self._ensure_capacity(count)
+
+        infos = []
+        for i, frame in enumerate(frames):
+            shape = frame.shape[:2]
+            unpad_w, unpad_h, top, left, info = self._layout(shape)
+            target = self.batch[i]
+
+            # 패딩 영역은 배치가 바뀔 때만 다시 채움 (이미지 영역은 매 프레임 덮어씀)
+            if self._slot_layouts[i] != (shape, unpad_w, unpad_h):
+                target.fill(self.pad_value)
+                self._slot_layouts[i] = (shape, unpad_w, unpad_h)
+
+            if shape == (unpad_h, unpad_w):
+                source = frame
+            else:
+                key = (shape, unpad_h, unpad_w, frame.dtype.str)
+                resizer = self._resizers.get(key)
+                if resizer is None:
+                    resizer = self._resizers[key] = _BilinearResizer(frame, unpad_w, unpad_h)
+                source = resizer(frame)
+
+            # BGR→RGB + HWC→CHW + 정규화: 한 번의 패스로 입력 텐서에 기록
+            channels = source[..., ::-1] if self.bgr else source
+            np.multiply(channels.transpose(2, 0, 1), 1.0 / 255.0,
+                        out=target[:, top:top + unpad_h, left:left + unpad_w], casting='unsafe')
+            infos.append(info)
+
+        return self.batch[:count], infos
+
+
+class _BilinearResizer:
+    """
+    고정 크기 → 고정 크기 bilinear 리사이즈 (출력/중간 버퍼 재사용)
+
+    cv2가 있으면 미리 할당한 출력 버퍼에 cv2.resize(dst=)로 기록하고,
+    없으면 resize_bilinear와 같은 샘플링 좌표표를 한 번만 계산해 out= 연산으로 보간한다.
+    """
+
+    def __init__(self, image: np.ndarray, width: int, height: int):
+        in_h, in_w, channels = image.shape
+        self.size = (width, height)
+
+        if CV2_AVAILABLE:
+            self.output = np.empty((height, width, channels), dtype=image.dtype)
+            return
+
+        ys = np.clip((np.arange(height) + 0.5) * (in_h / height) - 0.5, 0, in_h - 1)
+        xs = np.clip((np.arange(width) + 0.5) * (in_w / width) - 0.5, 0, in_w - 1)
+        self.y0 = ys.astype(np.int64)
+        self.x0 = xs.astype(np.int64)
+        self.y1 = np.minimum(self.y0 + 1, in_h - 1)
+        self.x1 = np.minimum(self.x0 + 1, in_w - 1)
+        self.wy = (ys - self.y0).astype(np.float32)[:, None, None]
+        self.wx = (xs - self.x0).astype(np.float32)[None, :, None]
+
+        self._rows = np.empty((height, in_w, channels), dtype=image.dtype)
+        self._gather = np.empty((height, width, channels), dtype=image.dtype)
+        self._top = np.empty((height, width, channels), dtype=np.float32)
+        self._bottom = np.empty_like(self._top)
+        self._delta = np.empty_like(self._top)
+        self.output = self._top
+
+    def _lerp_rows(self, image: np.ndarray, rows: np.ndarray, out: np.ndarray):
+        """out = image[rows, x0] + (image[rows, x1] - image[rows, x0]) * wx"""
+        np.take(image, rows, axis=0, out=self._rows, mode='clip')
+        np.take(self._rows, self.x0, axis=1, out=self._gather, mode='clip')
+        np.copyto(out, self._gather)
+        np.take(self._rows, self.x1, axis=1, out=self._gather, mode='clip')
+        np.subtract(self._gather, out, out=self._delta)
+        self._delta *= self.wx
+        out += self._delta
+
+    def __call__(self, image: np.ndarray) -> np.ndarray:
+        """리사이즈 결과 버퍼 (다음 호출에서 덮어씀)"""
+        if CV2_AVAILABLE:
+            return cv2.resize(image, self.size, dst=self.output, interpolation=cv2.INTER_LINEAR)
+
+        self._lerp_rows(image, self.y0, self._top)
+        self._lerp_rows(image, self.y1, self._bottom)
+        self._bottom -= self._top
+        self._bottom *= self.wy
+        self._top += self._bottom
+        np.rint(self._top, out=self._top)  # resize_bilinear와 같은 정수 반올림
+        return self._top
+
+
+def scale_boxes(boxes: np.ndarray, info: LetterboxInfo) -> np.ndarray:
+    """letterbox 좌표 → 원본 프레임 픽셀 좌표 (클리핑 포함)"""
+    scaled = boxes.copy()
+    scaled[:, [0, 2]] -= info.pad_x
+    scaled[:, [1, 3]] -= info.pad_y
+    scaled /= info.ratio
+    h, w = info.orig_shape
+    scaled[:, [0, 2]] = scaled[:, [0, 2]].clip(0, w)
+    scaled[:, [1, 3]] = scaled[:, [1, 3]].clip(0, h)
+    return scaled
+
+
+# ========== 최적화 그래프 캐시 ==========
+
+def optimized_model_cache_path(model_path: str, cache_dir: Optional[str] = None) -> str:
+    """
+    onnxruntime 최적화 그래프 캐시 파일 경로
+
+    모델 내용 해시 + onnxruntime 버전으로 구분하므로 모델을 바꾸거나 런타임을 올리면 새로 만든다.
+    캐시 디렉터리: cache_dir → ORT_CACHE_DIR 환경 변수 → 모델 옆 .ort_cache/
+    """
+    cache_dir = cache_dir or os.getenv('ORT_CACHE_DIR') or os.path.join(
+        os.path.dirname(os.path.abspath(model_path)), '.ort_cache')
+
+    digest = hashlib.sha1()
+    with open(model_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    digest.update(ort.__version__.encode() if ORT_AVAILABLE else b'')
+
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    return os.path.join(cache_dir, f"{stem}.{digest.hexdigest()[:12]}.opt.onnx")
+
+
+def save_optimized_model(model_path: str, optimized_path: str) -> bool:
+    """
+    onnxruntime 오프라인 그래프 최적화 결과를 optimized_path에 저장
+
+    하드웨어 종속 레이아웃 변환(ORT_ENABLE_ALL의 NCHWc 등)은 로드하는 머신에서 다시
+    적용되도록 ORT_ENABLE_EXTENDED 수준까지만 저장한다. 임시 파일에 쓴 뒤 교체하므로
+    여러 프로세스가 동시에 만들어도 안전하다.
+
+    Returns:
+        저장 성공 여부 (디렉터리 쓰기 불가 등은 False)
+    """
+    try:
+        os.makedirs(os.path.dirname(optimized_path), exist_ok=True)
+        tmp_path = f"{optimized_path}.{os.getpid()}.tmp"
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+        options.optimized_model_filepath = tmp_path
+        ort.InferenceSession(model_path, sess_options=options, providers=['CPUExecutionProvider'])
+        os.replace(tmp_path, optimized_path)
+        return True
+    except Exception as e:
+        print(f"⚠️ 최적화 그래프 캐시 저장 실패 ({optimized_path}): {e}")
+        return False
+
+
+# ========== 탐지기 ==========
+
+class ONNXYOLODetector:
+    """
+    ONNX Runtime YOLOv8 탐지기
+
+    세션 run()은 스레드 안전하므로 공유 모델 레지스트리에 thread_safe=True로 등록 가능
+
+    전처리 버퍼와 출력 버퍼는 호출 스레드마다 하나씩 두고 재사용하며,
+    IO binding으로 onnxruntime이 그 버퍼를 직접 읽고 쓰게 한다 (정상 상태에서 할당 없음).
+    """
+
+    def __init__(self,
+                 model_path: str,
+                 conf_threshold: float = DEFAULT_CONF_THRESHOLD,
+                 iou_threshold: float = DEFAULT_IOU_THRESHOLD,
+                 max_det: int = DEFAULT_MAX_DET,
+                 providers: Optional[List[str]] = None,
+                 intra_op_num_threads: int = 0,
+                 io_binding: bool = True,
+                 optimized_model_path: Optional[str] = None,
+                 input_shape: Optional[Tuple[int, int]] = None):
+        """
+        Args:
+            model_path: .onnx 모델 경로 (ultralytics export 결과)
+            conf_threshold: 신뢰도 임계값
+            iou_threshold: NMS IoU 임계값
+            max_det: 프레임당 최대 탐지 수
+            providers: 실행 프로바이더 (None이면 CPU)
+            intra_op_num_threads: 연산 내부 스레드 수 (0이면 onnxruntime 기본값)
+            io_binding: 미리 할당한 입출력 버퍼를 IO binding으로 넘길지 여부
+            optimized_model_path: 최적화 그래프 캐시 경로 (없으면 만들어 두고, 있으면 그걸 로드)
+            input_shape: 기본 (H, W) 입력 크기 (dynamic 입력 모델만, 32의 배수 - 예: (352, 480))
+        """
+        if not ORT_AVAILABLE:
+            raise ImportError("onnxruntime 패키지가 필요합니다")
+
+        self.model_path = model_path
+        self.conf_threshold = conf_threshold
+        self.iou_threshold = iou_threshold
+        self.max_det = max_det
+        self.decoder = YOLOv8Decoder(DecoderConfig(conf_threshold=conf_threshold, iou_threshold=iou_threshold,
+                                                   max_detections=max_det))
+
+        # 최적화 그래프 캐시: 'hit' (캐시 로드), 'saved' (이번에 생성), 'failed', 'disabled'
+        start_time = time.perf_counter()
+        load_path = model_path
+        self.graph_cache = 'disabled'
+        if optimized_model_path:
+            if os.path.exists(optimized_model_path):
+                self.graph_cache = 'hit'
+            elif save_optimized_model(model_path, optimized_model_path):
+                self.graph_cache = 'saved'
+            else:
+                self.graph_cache = 'failed'
+            if self.graph_cache != 'failed':
+                load_path = optimized_model_path
+        self.optimized_model_path = optimized_model_path
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = intra_op_num_threads
+        self.session = ort.InferenceSession(
+            load_path, sess_options=options,
+            providers=providers or ['CPUExecutionProvider']
+        )
+        self.session_load_ms = (time.perf_counter() - start_time) * 1000
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.output_name = self.session.get_outputs()[0].name
+
+        # 입력 크기: 고정 shape → 메타데이터(imgsz) → 640
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        height, width = model_input.shape[2], model_input.shape[3]
+        if not isinstance(height, int) or not isinstance(width, int):
+            imgsz = self._parse_metadata(metadata.get('imgsz'), [640, 640])
+            height, width = imgsz if isinstance(imgsz, (list, tuple)) else (imgsz, imgsz)
+        self.input_shape = (int(height), int(width))
+        self.dynamic_batch = not isinstance(model_input.shape[0], int)
+        # dynamic=True export: 호출마다 입력 크기를 바꿀 수 있음 (영역 탐지용)
+        self.dynamic_shape = not isinstance(model_input.shape[2], int) or not isinstance(model_input.shape[3], int)
+        if input_shape is not None and tuple(input_shape) != self.input_shape:
+            if input_shape[0] % 32 or input_shape[1] % 32:
+                raise ValueError(f"입력 크기는 32의 배수여야 합니다: {tuple(input_shape)}")
+            if self.dynamic_shape:
+                self.input_shape = (int(input_shape[0]), int(input_shape[1]))
+            else:
+                print(f"⚠️ 고정 입력 크기 모델이라 요청한 입력 크기 {tuple(input_shape)}를 무시합니다: {self.input_shape}")
+
+        # 클래스 이름 (ultralytics export 메타데이터)
+        names = self._parse_metadata(metadata.get('names'), {})
+        self.class_names: Dict[int, str] = {int(k): v for k, v in names.items()} if isinstance(names, dict) else {}
+
+        # IO binding은 float32 입출력 모델에서만 (fp16 export는 일반 run 경로)
+        model_output = self.session.get_outputs()[0]
+        self.io_binding = (io_binding and model_input.type == 'tensor(float)'
+                           and model_output.type == 'tensor(float)')
+        sample_shape = tuple(model_output.shape[1:])
+        self._output_sample_shape = sample_shape if all(isinstance(d, int) for d in sample_shape) else None
+        self._local = threading.local()
+
+    @staticmethod
+    def _parse_metadata(value: Optional[str], default: Any) -> Any:
+        if not value:
+            return default
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return default
+
+    def forward(self, batch: np.ndarray) -> np.ndarray:
+        """전처리된 (N, 3, H, W) 텐서 → 원시 출력 (N, 4+nc, anchors)"""
+        if self.dynamic_batch or batch.shape[0] == 1:
+            return self.session.run([self.output_name], {self.input_name: batch})[0]
+        # 배치 크기가 1로 고정된 모델은 한 장씩
+        return np.concatenate([
+            self.session.run([self.output_name], {self.input_name: batch[i:i + 1]})[0]
+            for i in range(batch.shape[0])
+        ])
+
+    def preprocessor(self, input_shape: Optional[Tuple[int, int]] = None) -> FramePreprocessor:
+        """호출 스레드 전용 FramePreprocessor (입력 크기별, 버퍼 재사용)"""
+        input_shape = tuple(input_shape or self.input_shape)
+        preprocessors = getattr(self._local, 'preprocessors', None)
+        if preprocessors is None:
+            preprocessors = self._local.preprocessors = {}
+        preprocessor = preprocessors.get(input_shape)
+        if preprocessor is None:
+            preprocessor = preprocessors[input_shape] = FramePreprocessor(input_shape)
+        return preprocessor
+
+    def forward_bound(self, batch: np.ndarray) -> np.ndarray:
+        """
+        forward()의 IO binding 버전: 입력 버퍼를 그대로 넘기고 스레드별 출력 버퍼에 받음
+
+        반환값은 내부 출력 버퍼의 뷰이므로 같은 스레드의 다음 호출 전까지만 유효하다.
+        """
+        if batch.dtype != np.float32 or not batch.flags.c_contiguous:
+            raise ValueError("IO binding 입력은 C-contiguous float32 여야 합니다")
+
+        count = batch.shape[0]
+        if self._output_sample_shape is None:
+            # 출력 크기가 동적이면 첫 호출 한 번은 일반 run으로 크기를 확인
+            self._output_sample_shape = self.forward(batch[:1]).shape[1:]
+
+        local = self._local
+        output = getattr(local, 'output', None)
+        if output is None or output.shape[0] < count:
+            output = local.output = np.empty((count,) + self._output_sample_shape, dtype=np.float32)
+
+        # 버퍼가 바뀌면 이전 바인딩은 모두 무효
+        pointers = (batch.ctypes.data, output.ctypes.data)
+        if getattr(local, 'pointers', None) != pointers:
+            local.pointers = pointers
+            local.bindings = {}
+
+        # 배치 크기가 1로 고정된 모델은 한 장씩 (각 장의 버퍼 위치에 바인딩)
+        chunks = [(0, count)] if self.dynamic_batch or count == 1 else [(i, 1) for i in range(count)]
+        for offset, size in chunks:
+            binding = local.bindings.get((offset, size))
+            if binding is None:
+                binding = self.session.io_binding()
+                binding.bind_input(self.input_name, 'cpu', 0, np.float32,
+                                   (size,) + batch.shape[1:], batch[offset].ctypes.data)
+                binding.bind_output(self.output_name, 'cpu', 0, np.float32,
+                                    (size,) + tuple(self._output_sample_shape), output[offset].ctypes.data)
+                local.bindings[(offset, size)] = binding
+            self.session.run_with_iobinding(binding)
+
+        return output[:count]
+
+    def __call__(self,
+                 frames: Sequence[np.ndarray],
+                 input_shape: Optional[Tuple[int, int]] = None) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        프레임 리스트 → 프레임별 (boxes xyxy 원본 좌표, scores, class_ids)
+
+        Args:
+            frames: (H, W, 3) 프레임들
+            input_shape: 이번 호출의 (H, W) 입력 크기 (dynamic_shape 모델만, 32의 배수)
+        """
+        if input_shape is not None and tuple(input_shape) != self.input_shape:
+            if not self.dynamic_shape:
+                raise ValueError(f"고정 입력 크기 모델입니다: {self.input_shape}")
+            batch, infos = self.preprocessor(input_shape)(frames)
+            outputs = self.forward(batch)
+        else:
+            batch, infos = self.preprocessor()(frames)
+            outputs = self.forward_bound(batch) if self.io_binding else self.forward(batch)
+
+        results = []
+        for prediction, info in zip(outputs, infos):
+            boxes, scores, class_ids = self.decoder.decode(prediction)
+            results.append((scale_boxes(boxes, info), scores, class_ids))
+        return results
@@ -0,0 +1,23 @@
+"""
+Vision Agent Shared - 웹 앱과 src/deployment 파이프라인이 같이 쓰는 코드
+
+NumPy만 의존하고 웹 앱 modules 패키지(Flask / CV / AI 모듈)를 import 하지 않으므로
+학습/평가 쪽에서 이름으로 바로 import 할 수 있다.
+
+- yolo_decoder: YOLOv8 원시 출력 디코더 (신뢰도 필터 + 클래스별 NMS)
+- state_encoder: 게임 상태 → 정책 입력 벡터 (단일 기준 인코더)
+"""
+
+from .state_encoder import STATE_DIM, STATE_FEATURES, encode_state, encode_states
+from .yolo_decoder import YOLOV8_CLASS_NAMES, DecoderConfig, YOLOv8Decoder, decode_predictions
+
+__all__ = [
+    'STATE_DIM',
+    'STATE_FEATURES',
+    'encode_state',
+    'encode_states',
+    'YOLOV8_CLASS_NAMES',
+    'DecoderConfig',
+    'YOLOv8Decoder',
+    'decode_predictions',
+]
@@ -0,0 +1,156 @@
+"""
+State Encoder - 게임 상태 → 정책 입력 벡터 (단일 기준 인코더)
+
+학습 데이터 내보내기, 실시간 정책 추론(PolicyServer), AIModule, src 배포
+파이프라인이 모두 이 인코더 하나로 같은 10차원 벡터를 만든다.
+
+상태 벡터 (STATE_FEATURES 순서):
+- player_x, player_y: 플레이어 좌상단 / 화면 크기 (0~1)
+- player_vy: 세로 속도 / 20 (-1~1)
+- meteor_dx, meteor_dy, meteor_dist: 가장 가까운 메테오 (없으면 0)
+- star_dx, star_dy, star_dist: 가장 가까운 별 (없으면 0)
+- on_ground: 바닥에 닿아 있으면 1
+
+dx = (물체 중심 x - 플레이어 중심 x) / 너비 (-1~1), dy = (물체 중심 y - 플레이어
+위쪽 y) / 높이 (0~1로 자름), dist = hypot(dx, dy). 거리가 1 이상인 물체는
+무시하고, 거리가 같으면 먼저 생성된 물체를 고른다.
+
+장애물은 컬럼 배열 (중심 x/y, 타입, 소유 게임)로 받아 거리를 한 번에 계산하고,
+게임별 최근접은 (게임, 거리) 정렬 한 번으로 찾는다 - 여러 게임을 한 호출로
+인코딩할 수 있다 (BatchPhysicsEngine.encode_states).
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+# 타입 코드 (obstacle_store.TYPE_CODES 와 동일 - src 배포 파이프라인도 import 하므로
+# 웹 앱 modules 패키지에 의존하지 않고 NumPy만 사용)
+TYPE_METEOR = 0
+TYPE_STAR = 1
+TYPE_CODES = {'meteor': TYPE_METEOR, 'star': TYPE_STAR}
+
+STATE_FEATURES = (
+    'player_x', 'player_y', 'player_vy',
+    'meteor_dx', 'meteor_dy', 'meteor_dist',
+    'star_dx', 'star_dy', 'star_dist',
+    'on_ground',
+)
+STATE_DIM = len(STATE_FEATURES)
+
+# 게임 기본값 (app.py의 WIDTH / HEIGHT / PLAYER_SIZE / OBSTACLE_SIZE)
+SCREEN_WIDTH = 960
+SCREEN_HEIGHT = 720
+PLAYER_SIZE = 50
+OBSTACLE_SIZE = 50
+MAX_FALL_SPEED = 20.0
+
+# 최근접 물체 피처 시작 열
+_NEAREST_COLUMNS = ((TYPE_METEOR, 3), (TYPE_STAR, 6))
+
+
+def encode_states(player_x: np.ndarray,
+                  player_y: np.ndarray,
+                  player_vy: np.ndarray,
+                  obstacle_cx: np.ndarray,
+                  obstacle_cy: np.ndarray,
+                  obstacle_type: np.ndarray,
+                  obstacle_owner: Optional[np.ndarray] = None,
+                  width: float = SCREEN_WIDTH,
+                  height: float = SCREEN_HEIGHT,
+                  player_size: float = PLAYER_SIZE,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    여러 게임의 상태를 한 번에 인코딩
+
+    Args:
+        player_x, player_y, player_vy: 게임별 플레이어 좌상단 / 세로 속도 (N,)
+        obstacle_cx, obstacle_cy: 장애물 중심 (M,), 게임 구분 없이 생성 순서대로
+        obstacle_type: 타입 코드 (M,) - TYPE_METEOR / TYPE_STAR
+        obstacle_owner: 장애물이 속한 게임의 행 번호 (M,) in [0, N); None이면 전부 0
+        width, height, player_size: 화면 / 플레이어 크기
+        out: 결과를 쓸 (N, STATE_DIM) float32 버퍼 (선택)
+
+    Returns:
+        (N, STATE_DIM) float32
+    """
+    player_x = np.asarray(player_x, dtype=np.float64).reshape(-1)
+    player_y = np.asarray(player_y, dtype=np.float64).reshape(-1)
+    player_vy = np.asarray(player_vy, dtype=np.float64).reshape(-1)
+    num_games = len(player_x)
+
+    if out is None:
+        out = np.zeros((num_games, STATE_DIM), dtype=np.float32)
+    else:
+        out.fill(0.0)
+    out[:, 0] = player_x / width
+    out[:, 1] = player_y / height
+    out[:, 2] = np.clip(player_vy / MAX_FALL_SPEED, -1, 1)
+    out[:, 9] = player_y >= height - player_size - 5
+
+    if len(obstacle_type) == 0:
+        return out
+
+    owner = (np.zeros(len(obstacle_type), dtype=np.intp) if obstacle_owner is None
+             else np.asarray(obstacle_owner, dtype=np.intp))
+    dx = (np.asarray(obstacle_cx, dtype=np.float64) - (player_x + player_size / 2)[owner]) / width
+    dy = (np.asarray(obstacle_cy, dtype=np.float64) - player_y[owner]) / height
+    dist = np.hypot(dx, dy)
+    obstacle_type = np.asarray(obstacle_type)
+
+    for type_code, column in _NEAREST_COLUMNS:
+        candidates = np.flatnonzero((obstacle_type == type_code) & (dist < 1.0))
+        if not len(candidates):
+            continue
+        # 게임 → 거리 → 생성 순서로 정렬하고 게임별 첫 행을 고름
+        order = candidates[np.lexsort((candidates, dist[candidates], owner[candidates]))]
+        sorted_owner = owner[order]
+        nearest = order[np.r_[True, sorted_owner[1:] != sorted_owner[:-1]]]
+        games = owner[nearest]
+        out[games, column] = np.clip(dx[nearest], -1, 1)
+        out[games, column + 1] = np.clip(dy[nearest], 0, 1)
+        out[games, column + 2] = dist[nearest]
+
+    return out
+
+
+def encode_state(player_x: float, player_y: float, player_vy: float,
+                 obstacle_cx: np.ndarray, obstacle_cy: np.ndarray, obstacle_type: np.ndarray,
+                 **kwargs) -> np.ndarray:
+    """게임 하나 인코딩 → (STATE_DIM,) float32 (인자는 encode_states와 같음)"""
+    return encode_states([player_x], [player_y], [player_vy],
+                         obstacle_cx, obstacle_cy, obstacle_type, **kwargs)[0]
+
+
+def encode_state_dicts(states: Sequence[Dict[str, Any]],
+                       width: float = SCREEN_WIDTH,
+                       height: float = SCREEN_HEIGHT) -> np.ndarray:
+    """
+    상태 dict 여러 개 → (N, STATE_DIM) (장애물을 펼쳐 encode_states 한 번으로)
+
+    - get_state() 형식: {'player': {'x', 'y', 'vy', 'size'}, 'obstacles': [...]}
+    - 학습 기록 (_pre_state) 형식: {'player_x', 'player_y', 'player_vy', 'obstacles': [...]}
+    """
+    players = []
+    for state in states:
+        player = state.get('player')
+        if player is not None:
+            players.append((player.get('x', 0), player.get('y', 0), player.get('vy', 0)))
+        else:
+            players.append((state.get('player_x', 0), state.get('player_y', 0), state.get('player_vy', 0)))
+    players = np.array(players, dtype=np.float64).reshape(-1, 3)
+    player_size = next((state['player'].get('size', PLAYER_SIZE) for state in states if 'player' in state),
+                       PLAYER_SIZE)
+
+    rows = [(game, obs['x'], obs['y'], obs.get('size', OBSTACLE_SIZE), TYPE_CODES.get(obs.get('type', 'meteor'), -1))
+            for game, state in enumerate(states) for obs in state.get('obstacles', ())]
+    obstacles = np.array(rows, dtype=np.float64).reshape(-1, 5)
+    owner, x, y, size, obstacle_type = obstacles.T
+    return encode_states(players[:, 0], players[:, 1], players[:, 2],
+                         x + size / 2, y + size / 2, obstacle_type, owner.astype(np.intp),
+                         width=width, height=height, player_size=player_size)
+
+
+def encode_state_dict(state: Dict[str, Any], **kwargs) -> np.ndarray:
+    """상태 dict 하나 → (STATE_DIM,) (형식은 encode_state_dicts 참고)"""
+    return encode_state_dicts([state], **kwargs)[0]
@@ -0,0 +1,251 @@
+"""
+YOLOv8 Decoder - (batch, 4+nc, anchors) 원시 출력 → 박스 / 점수 / 클래스
+
+웹 앱 ONNX 백엔드(modules.yolo_onnx.ONNXYOLODetector)와 src/deployment
+파이프라인/평가가 같은 디코더로 탐지 결과를 만든다.
+
+- 신뢰도 필터 (클래스별 임계값) → NMS 전 top-k → 클래스별 greedy NMS
+- 기본 임계값은 ultralytics predict 기본값과 동일 (conf 0.25, iou 0.7, max_det 300, max_nms 30000)
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# ultralytics 기본값
+DEFAULT_CONF_THRESHOLD = 0.25
+DEFAULT_IOU_THRESHOLD = 0.7
+DEFAULT_MAX_DET = 300
+DEFAULT_MAX_NMS = 30000
+MAX_WH = 7680  # 클래스별 NMS용 좌표 오프셋 (ultralytics와 동일)
+
+# 게임 탐지 데이터셋 클래스 순서 (game_dataset/data.yaml)
+YOLOV8_CLASS_NAMES = ('player', 'meteor', 'star', 'lava_warning', 'lava_active')
+
+
+@dataclass
+class DecoderConfig:
+    """YOLOv8 출력 디코딩 임계값 (기본값은 ultralytics predict와 동일)"""
+
+    conf_threshold: float = DEFAULT_CONF_THRESHOLD
+    iou_threshold: float = DEFAULT_IOU_THRESHOLD
+    class_conf_thresholds: Optional[Dict[int, float]] = None  # 클래스별 conf_threshold 덮어쓰기
+    pre_nms_topk: int = DEFAULT_MAX_NMS  # NMS 전에 남길 최대 후보 수
+    max_detections: int = DEFAULT_MAX_DET
+    class_agnostic: bool = False
+
+
+def suppression_pairs(boxes: np.ndarray,
+                      class_ids: np.ndarray,
+                      iou_threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    같은 클래스에서 IoU > iou_threshold 인 박스 쌍 (앞 번호, 뒤 번호)
+
+    K×K IoU 행렬 대신 x 구간이 겹치는 쌍만 계산한다: (클래스, x1)로 정렬하면
+    박스 i와 겹칠 수 있는 박스는 정렬 순서상 i 뒤에서 x1 < x2_i 인 연속 구간뿐이다.
+    비용은 겹칠 수 있는 쌍 수에 비례 (탐지가 흩어진 프레임에서 K²보다 훨씬 작음).
+
+    Args:
+        boxes: (K, 4) xyxy
+        class_ids: (K,) 클래스 (클래스 무관 NMS면 전부 0)
+
+    Returns:
+        (first, second): first < second 인 인덱스 배열
+    """
+    count = len(boxes)
+    offset = class_ids.astype(np.float64) * MAX_WH  # 클래스마다 x축을 떨어뜨려 한 번에 정렬
+    starts = boxes[:, 0] + offset
+    order = np.argsort(starts, kind='stable')
+    starts = starts[order]
+    stops = np.searchsorted(starts, (boxes[:, 2] + offset)[order], side='left')
+
+    # 정렬 위치 p마다 p+1 .. stops[p]-1 과 짝지음
+    counts = np.maximum(stops - np.arange(count) - 1, 0)
+    left = np.repeat(np.arange(count), counts)
+    right = left + 1 + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    first, second = order[left], order[right]
+
+    # MAX_WH보다 넓은 박스는 다른 클래스와 짝지어질 수 있음
+    same_class = class_ids[first] == class_ids[second]
+    first, second = first[same_class], second[same_class]
+
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    inter = np.minimum(x2[first], x2[second])
+    inter -= np.maximum(x1[first], x1[second])
+    np.clip(inter, 0, None, out=inter)
+    inter_h = np.minimum(y2[first], y2[second])
+    inter_h -= np.maximum(y1[first], y1[second])
+    np.clip(inter_h, 0, None, out=inter_h)
+    inter *= inter_h
+
+    union = areas[first] + areas[second]
+    union -= inter
+    union += 1e-9
+    overlapping = inter / union > iou_threshold
+    first, second = first[overlapping], second[overlapping]
+    return np.minimum(first, second), np.maximum(first, second)
+
+
+def batched_nms(boxes: np.ndarray,
+                scores: np.ndarray,
+                class_ids: np.ndarray,
+                iou_threshold: float,
+                max_detections: int = DEFAULT_MAX_DET,
+                class_agnostic: bool = False) -> np.ndarray:
+    """
+    클래스별 greedy NMS (다른 클래스끼리는 서로 제거하지 않음)
+
+    Cluster-NMS 고정점 반복: "살아남은 더 높은 점수 박스와 겹치지 않으면 남는다"를
+    전체 제거 관계에 반복 적용하면 greedy NMS 결과와 정확히 같아진다 - 박스마다
+    파이썬 한 단계 대신 보통 몇 번의 배열 연산으로 끝난다.
+
+    Returns:
+        남은 박스 인덱스 (점수 내림차순, 최대 max_detections개)
+    """
+    if len(scores) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    order = np.argsort(-scores, kind='stable')
+    classes = np.zeros(len(order), dtype=np.int64) if class_agnostic else class_ids[order]
+    first, second = suppression_pairs(boxes[order], classes, iou_threshold)
+
+    keep = np.ones(len(order), dtype=bool)
+    while True:
+        suppressed = np.zeros(len(order), dtype=bool)
+        suppressed[second[keep[first]]] = True
+        if np.array_equal(~suppressed, keep):
+            break
+        keep = ~suppressed
+
+    return order[np.flatnonzero(keep)[:max_detections]]
+
+
+class YOLOv8Decoder:
+    """
+    (batch, 4+nc, anchors) YOLOv8 원시 출력 디코더
+
+    웹 앱 ONNX 백엔드(ONNXYOLODetector)와 src/deployment 파이프라인/평가가 같이 쓴다.
+
+    사용 예:
+        decoder = YOLOv8Decoder(DecoderConfig(conf_threshold=0.3))
+        boxes, scores, class_ids = decoder.decode(outputs[0])
+    """
+
+    def __init__(self,
+                 config: Optional[DecoderConfig] = None,
+                 class_names: Sequence[str] = YOLOV8_CLASS_NAMES):
+        """
+        Args:
+            config: 디코딩 임계값 (None이면 기본값)
+            class_names: 클래스 id → 이름 (to_detections용)
+        """
+        self.config = config or DecoderConfig()
+        self.class_names = tuple(class_names)
+        self._thresholds = self._build_thresholds(len(self.class_names))
+        self._min_threshold = float(self._thresholds.min())
+
+    def _build_thresholds(self, num_classes: int) -> np.ndarray:
+        """클래스별 신뢰도 임계값 표"""
+        thresholds = np.full(num_classes, self.config.conf_threshold, dtype=np.float32)
+        for class_id, threshold in (self.config.class_conf_thresholds or {}).items():
+            if class_id >= num_classes:
+                thresholds = np.pad(thresholds, (0, class_id + 1 - num_classes),
+                                    constant_values=self.config.conf_threshold)
+                num_classes = class_id + 1
+            thresholds[class_id] = threshold
+        return thresholds
+
+    def decode(self, output: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        이미지 한 장의 출력 디코딩
+
+        Args:
+            output: (4+nc, anchors) 또는 (1, 4+nc, anchors)
+
+        Returns:
+            (boxes xyxy (N, 4), scores (N,), class_ids (N,)) - 모델 입력(letterbox) 좌표
+        """
+        if output.ndim == 3:
+            output = output[0]
+
+        num_classes = output.shape[0] - 4
+        if len(self._thresholds) < num_classes:
+            self._thresholds = self._build_thresholds(num_classes)
+            self._min_threshold = float(self._thresholds.min())
+
+        # 점수 = 최고 클래스 점수 (행 max를 먼저, argmax는 남은 후보만)
+        class_scores = output[4:]
+        scores = class_scores.max(axis=0)
+        candidates = np.flatnonzero(scores > self._min_threshold)
+        class_ids = class_scores[:, candidates].argmax(axis=0)
+
+        # 클래스별 신뢰도 임계값
+        passed = scores[candidates] > self._thresholds[class_ids]
+        candidates = candidates[passed]
+        class_ids = class_ids[passed]
+
+        # NMS 전 top-k (argpartition)
+        topk = self.config.pre_nms_topk
+        if len(candidates) > topk:
+            best = np.argpartition(-scores[candidates], topk - 1)[:topk]
+            candidates = candidates[best]
+            class_ids = class_ids[best]
+
+        if len(candidates) == 0:
+            return (np.zeros((0, 4), dtype=np.float32),
+                    np.zeros(0, dtype=np.float32),
+                    np.zeros(0, dtype=np.int64))
+
+        cx, cy, w, h = output[:4, candidates]
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+        scores = scores[candidates]
+
+        keep = batched_nms(boxes, scores, class_ids,
+                           self.config.iou_threshold,
+                           self.config.max_detections,
+                           self.config.class_agnostic)
+        return boxes[keep], scores[keep], class_ids[keep]
+
+    def to_detections(self,
+                      boxes: np.ndarray,
+                      scores: np.ndarray,
+                      class_ids: np.ndarray,
+                      scale: Tuple[float, float] = (1.0, 1.0)) -> List[Dict]:
+        """
+        디코딩 결과 → 탐지 dict 리스트 ({'bbox', 'confidence', 'class_id', 'class_name'})
+
+        Args:
+            scale: 모델 입력 → 원본 프레임 픽셀 배율 (sx, sy)
+        """
+        sx, sy = scale
+        boxes = boxes * np.array([sx, sy, sx, sy], dtype=boxes.dtype)
+        return [
+            {
+                'bbox': box,
+                'confidence': score,
+                'class_id': class_id,
+                'class_name': self.class_names[class_id] if class_id < len(self.class_names) else f'class_{class_id}'
+            }
+            for box, score, class_id in zip(boxes.tolist(), scores.tolist(), class_ids.tolist())
+        ]
+
+
+def decode_predictions(prediction: np.ndarray,
+                       conf_threshold: float = DEFAULT_CONF_THRESHOLD,
+                       iou_threshold: float = DEFAULT_IOU_THRESHOLD,
+                       max_det: int = DEFAULT_MAX_DET) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    YOLOv8 출력 한 장 (4+nc, anchors) → (boxes xyxy, scores, class_ids)
+
+    좌표는 모델 입력(letterbox) 좌표계 (YOLOv8Decoder.decode와 같음)
+    """
+    return _decoder(conf_threshold, iou_threshold, max_det).decode(prediction)
+
+
+@lru_cache(maxsize=16)
+def _decoder(conf_threshold: float, iou_threshold: float, max_det: int) -> YOLOv8Decoder:
+    return YOLOv8Decoder(DecoderConfig(conf_threshold=conf_threshold, iou_threshold=iou_threshold,
+                                       max_detections=max_det))